@@ -2,6 +2,9 @@ from __future__ import annotations
 
 from PySide6.QtCore import QSettings
 
+DEFAULT_LOG_MAX_LINES = 10_000
+DEFAULT_LOG_FILE_MAX_MB = 256
+
 
 class SettingsManager:
     ORGANIZATION = "cli-orchestrator"
@@ -25,3 +28,51 @@ class SettingsManager:
     def save_auto_mode(self, value: bool) -> None:
         self._settings.setValue("auto_mode", value)
 
+
+    def load_pipelined(self) -> bool:
+        return self._settings.value("pipelined", False, type=bool)
+
+    def save_pipelined(self, value: bool) -> None:
+        self._settings.setValue("pipelined", value)
+
+    def load_max_parallel(self) -> int:
+        """Global concurrency cap, ``0`` meaning computed from the machine resources."""
+        return self._settings.value("max_parallel", 0, type=int)
+
+    def save_max_parallel(self, value: int) -> None:
+        self._settings.setValue("max_parallel", value)
+
+    def load_log_max_lines(self) -> int:
+        """Lines kept in each task tab; older lines are dropped from the view."""
+        return max(100, self._settings.value("log_max_lines", DEFAULT_LOG_MAX_LINES, type=int))
+
+    def save_log_max_lines(self, value: int) -> None:
+        self._settings.setValue("log_max_lines", value)
+
+    def load_log_file_max_mb(self) -> int:
+        """Size of a task log file before rotation, ``0`` disabling rotation."""
+        return max(0, self._settings.value("log_file_max_mb", DEFAULT_LOG_FILE_MAX_MB, type=int))
+
+    def save_log_file_max_mb(self, value: int) -> None:
+        self._settings.setValue("log_file_max_mb", value)
+
+    def load_compress_logs(self) -> bool:
+        return self._settings.value("compress_logs", False, type=bool)
+
+    def save_compress_logs(self, value: bool) -> None:
+        self._settings.setValue("compress_logs", value)
+
+    def load_event_journal(self) -> bool:
+        """Record the orchestrator events of each run next to its task logs."""
+        return self._settings.value("event_journal", True, type=bool)
+
+    def save_event_journal(self, value: bool) -> None:
+        self._settings.setValue("event_journal", value)
+
+    def load_metrics_port(self) -> int:
+        """Port of the local metrics endpoint, ``0`` disabling it."""
+        return max(0, self._settings.value("metrics_port", 0, type=int))
+
+    def load_metrics_textfile(self) -> str:
+        """File rewritten with the metrics for a textfile collector, empty to disable it."""
+        return self._settings.value("metrics_textfile", "", type=str)
@@ -5,9 +5,11 @@ from typing import Iterable, List
 
 import yaml
 
+from core.diagnostics import timed
 from core.models import CommandArguments, LotConfig
 
 
+@timed
 def load_lots_from_yaml(path: str) -> List[LotConfig]:
     file_path = Path(path)
     if not file_path.exists():
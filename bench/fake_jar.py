@@ -0,0 +1,100 @@
+"""Stand-in for the migration jar, used by the benchmarks: ``python -S fake_jar.py -D... -jar app.jar``.
+
+The behaviour of a task is read from its "database": the file named by
+``-Dspring.datasource.url=jdbc:sqlite:<fichier>`` holds a JSON object whose
+keys are those of :data:`DEFAULTS`.  Every line carries ``seq=<n>`` and
+``sent=<time.time()>`` so that the harness can measure how long a line takes
+to reach the orchestrator or the interface.
+
+Only the standard library is used, for a fast start with ``-S``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+
+DEFAULTS = {
+    # Attente avant la première ligne (démarrage de la JVM, connexion...).
+    "startup": 0.0,
+    # Lignes écrites, au rythme de ``rate`` lignes par seconde (0 : sans attente).
+    "lines": 5,
+    "rate": 0.0,
+    # Une ligne sur ``stderr_every`` est un avertissement écrit sur stderr (0 : aucune).
+    "stderr_every": 0,
+    # Une ligne d'avancement « rows migrated: n / total » toutes les ``progress_every`` lignes.
+    "progress_every": 0,
+    # Attente après la dernière ligne.
+    "linger": 0.0,
+    "exit_code": 0,
+    # Pile d'appels Java écrite avant une sortie en erreur.
+    "exception": False,
+}
+
+DATASOURCE_PREFIX = "-Dspring.datasource.url=jdbc:sqlite:"
+_PID = os.getpid()
+
+
+def load_spec(argv: list) -> dict:
+    spec = dict(DEFAULTS)
+    database = next((arg[len(DATASOURCE_PREFIX):] for arg in argv if arg.startswith(DATASOURCE_PREFIX)), "")
+    if database:
+        try:
+            with open(database, encoding="utf-8") as handle:
+                spec.update(json.load(handle))
+        except (OSError, ValueError):
+            # Base sans description : comportement par défaut.
+            pass
+    spec["database"] = database
+    return spec
+
+
+def _line(level: str, logger: str, message: str, seq: int) -> str:
+    now = time.time()
+    stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return f"{stamp}.{int(now * 1000) % 1000:03d}  {level:>5} {_PID} --- [main] {logger} : {message} seq={seq} sent={now:.6f}\n"
+
+
+def run(spec: dict) -> int:
+    out = sys.stdout
+    err = sys.stderr
+    if spec["startup"] > 0:
+        time.sleep(spec["startup"])
+    total = int(spec["lines"])
+    rate = float(spec["rate"])
+    stderr_every = int(spec["stderr_every"])
+    progress_every = int(spec["progress_every"])
+    out.write(_line("INFO", "c.e.Application", f"Starting migration of {spec['database']}", 0))
+    out.flush()
+    started = time.monotonic()
+    written = 0
+    while written < total:
+        # Lignes dues depuis le début, pour tenir le rythme malgré les écritures groupées.
+        due = total if rate <= 0 else min(total, int((time.monotonic() - started) * rate) + 1)
+        while written < due:
+            written += 1
+            if stderr_every and written % stderr_every == 0:
+                err.write(_line("WARN", "c.e.m.RowWriter", "Slow batch, retrying", written))
+            elif progress_every and written % progress_every == 0:
+                out.write(_line("INFO", "c.e.m.Progress", f"rows migrated: {written} / {total}", written))
+            else:
+                out.write(_line("INFO", "c.e.m.RowWriter", f"Migrated row {written}", written))
+        out.flush()
+        err.flush()
+        if written < total:
+            time.sleep(max(0.0, min(0.01, (written + 1) / rate - (time.monotonic() - started))))
+    if spec["linger"] > 0:
+        time.sleep(spec["linger"])
+    exit_code = int(spec["exit_code"])
+    if exit_code and spec["exception"]:
+        out.write(_line("ERROR", "c.e.Application", "Migration failed", written + 1))
+        out.write("java.lang.IllegalStateException: simulated failure\n")
+        out.write("\tat com.example.migration.Migrator.run(Migrator.java:42)\n")
+    out.write(_line("INFO", "c.e.Application", f"Migration finished with code {exit_code}", written + 1))
+    out.flush()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(run(load_spec(sys.argv[1:])))
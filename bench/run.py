@@ -0,0 +1,424 @@
+"""Throughput benchmarks of the orchestration chain: ``python -m bench.run tiny chatty --mode both``.
+
+Each scenario generates lots of stand-in databases for :mod:`bench.fake_jar`
+and runs them through the real :class:`Orchestrator`, headless (as
+``cli_orchestrator``) or in the :class:`MainWindow`.  The result is a JSON
+object per scenario and mode: dispatch latency, output latency up to the
+consumer, event-loop lag, peak RSS and wall time.  ``--output`` appends
+them to a JSON Lines file to follow them from one version to the next.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MODES = ("headless", "gui")
+DEFAULT_TIMEOUT_S = 600.0
+# Période de la sonde de la boucle d'événements.
+LAG_PROBE_INTERVAL_MS = 20
+# Mémoire réservée par tâche : le budget mémoire ne doit pas limiter le parallélisme des substituts.
+TASK_MEMORY_MB = 16
+
+FAKE_JAR = Path(__file__).resolve().with_name("fake_jar.py")
+_SENT = re.compile(r" sent=(\d+\.\d+)")
+
+
+@dataclass
+class LotSpec:
+    name: str
+    tasks: int
+    # Comportement des bases, voir ``bench.fake_jar.DEFAULTS``.
+    behaviour: Dict[str, object] = field(default_factory=dict)
+    max_parallel: Optional[int] = None
+    # Une base sur ``failure_every`` sort en erreur (0 : aucune).
+    failure_every: int = 0
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    lots: List[LotSpec]
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario(
+            "tiny",
+            "1000 tâches très courtes : coût de la distribution et du démarrage des processus",
+            [LotSpec("tiny", 1000, {"lines": 3})],
+        ),
+        Scenario(
+            "chatty",
+            "50 tâches bavardes : 2000 lignes/s pendant 5 s chacune, avertissements sur stderr",
+            [LotSpec("chatty", 50, {"lines": 10000, "rate": 2000, "stderr_every": 25, "progress_every": 100})],
+        ),
+        Scenario(
+            "mixed",
+            "Plusieurs lots de profils différents, avec des échecs",
+            [
+                LotSpec("courtes", 200, {"lines": 20}, failure_every=20),
+                LotSpec(
+                    "bavardes",
+                    20,
+                    {"startup": 0.3, "lines": 3000, "rate": 1000, "stderr_every": 50, "progress_every": 100},
+                    max_parallel=4,
+                    failure_every=5,
+                ),
+                LotSpec("longues", 8, {"startup": 1.0, "lines": 40, "rate": 10, "linger": 1.0}),
+            ],
+        ),
+    )
+}
+
+
+def prepare_lots(scenario: Scenario, root: Path, scale: float = 1.0) -> List:
+    """Write the stand-in databases of ``scenario`` under ``root`` and return their lots."""
+
+    from core.models import LotConfig
+
+    lots = []
+    for spec in scenario.lots:
+        directory = root / spec.name
+        directory.mkdir(parents=True, exist_ok=True)
+        count = max(1, round(spec.tasks * scale))
+        for index in range(1, count + 1):
+            behaviour = dict(spec.behaviour)
+            if spec.failure_every and index % spec.failure_every == 0:
+                behaviour.update(exit_code=1, exception=True)
+            (directory / f"base{index:05d}.db").write_text(json.dumps(behaviour), encoding="utf-8")
+        lots.append(LotConfig(name=spec.name, databases_path=str(directory), max_parallel=spec.max_parallel))
+    return lots
+
+
+def fake_java_command() -> str:
+    # Guillemets doubles : compris par le découpage POSIX comme par celui de Windows.
+    return f'"{sys.executable}" -S "{FAKE_JAR}"'
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """Count, mean and percentiles of ``values`` (seconds), in milliseconds."""
+
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def percentile(rank: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(rank * len(ordered)))] * 1000, 3)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "p99": percentile(0.99),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb(largest_task_bytes: int = 0) -> Dict[str, float]:
+    """Peak resident memory of this process and of the largest task seen by the process sampler.
+
+    ``RUSAGE_CHILDREN`` is not used for the tasks: under Linux its peak
+    includes the image of the parent inherited at fork, before the exec.
+    """
+
+    result: Dict[str, float] = {}
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        # Kio sous Linux, octets sous macOS.
+        unit = 1 if sys.platform == "darwin" else 1024
+        result["orchestrator"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit / 2**20, 1)
+    else:
+        try:
+            import psutil  # type: ignore[import-not-found]
+        except ImportError:
+            psutil = None
+        if psutil is not None:
+            memory = psutil.Process().memory_info()
+            result["orchestrator"] = round(getattr(memory, "peak_wset", memory.rss) / 2**20, 1)
+    if largest_task_bytes:
+        result["largest_task"] = round(largest_task_bytes / 2**20, 1)
+    return result
+
+
+def environment() -> Dict[str, object]:
+    import PySide6
+
+    return {
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+class _Probe:
+    """Measurements taken on the signals of a running :class:`Orchestrator`."""
+
+    def __init__(self, orchestrator):
+        from PySide6.QtCore import Qt, QTimer
+
+        self._orchestrator = orchestrator
+        self._pool = orchestrator.worker_pool()
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.first_task_at = 0.0
+        self.lines = 0
+        self.statuses: Dict[str, int] = {}
+        self.dispatch: List[float] = []
+        self.output: List[float] = []
+        self.lag: List[float] = []
+        # Pic de mémoire résidente de la plus grosse tâche, relevé par l'échantillonneur de processus.
+        self.largest_task_rss = 0
+        # Créneaux libérés alors que des tâches attendaient, dans l'ordre.
+        self._free_slots: List[float] = []
+        self._last_tick = 0.0
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(LAG_PROBE_INTERVAL_MS)
+        self._timer.timeout.connect(self._on_tick)
+        orchestrator.task_started.connect(self._on_task_started)
+        orchestrator.task_finished.connect(self._on_task_finished)
+        orchestrator.task_usage.connect(self._on_task_usage)
+        self._pool.runner_completed.connect(self._on_runner_completed)
+
+    def start(self) -> None:
+        self.started_at = self._last_tick = time.monotonic()
+        self._timer.start()
+
+    def stop(self) -> None:
+        self.finished_at = time.monotonic()
+        self._timer.stop()
+
+    def on_lines(self, lines: List[str]) -> None:
+        """Output lines reaching their consumer; the first one of a batch waited the longest."""
+
+        now = time.time()
+        self.lines += len(lines)
+        match = _SENT.search(lines[0]) if lines else None
+        if match:
+            self.output.append(max(0.0, now - float(match.group(1))))
+
+    def _on_tick(self) -> None:
+        now = time.monotonic()
+        self.lag.append(max(0.0, now - self._last_tick - LAG_PROBE_INTERVAL_MS / 1000))
+        self._last_tick = now
+
+    def _on_task_started(self, _task, _command: str) -> None:
+        now = time.monotonic()
+        if not self.first_task_at:
+            self.first_task_at = now
+        if self._free_slots:
+            self.dispatch.append(now - self._free_slots.pop(0))
+
+    def _on_task_finished(self, _task, status, _exit_code: int) -> None:
+        self.statuses[status.name] = self.statuses.get(status.name, 0) + 1
+
+    def _on_task_usage(self, usages) -> None:
+        for usage in usages:
+            if usage.peak_rss_bytes > self.largest_task_rss:
+                self.largest_task_rss = usage.peak_rss_bytes
+
+    def _on_runner_completed(self, _runner) -> None:
+        # Émis avant la distribution suivante : la file contient encore la tâche qui prendra le créneau.
+        if self._pool.queued_task_count():
+            self._free_slots.append(time.monotonic())
+
+    def report(self) -> Dict[str, object]:
+        wall = max(1e-9, self.finished_at - self.started_at)
+        tasks = sum(self.statuses.values())
+        return {
+            "tasks": tasks,
+            "statuses": dict(sorted(self.statuses.items())),
+            "wall_time_s": round(wall, 3),
+            "first_task_s": round(self.first_task_at - self.started_at, 3) if self.first_task_at else None,
+            "tasks_per_s": round(tasks / wall, 2),
+            "lines": self.lines,
+            "lines_per_s": round(self.lines / wall, 1),
+            "dispatch_latency_ms": summarize(self.dispatch),
+            "output_latency_ms": summarize(self.output),
+            "event_loop_lag_ms": summarize(self.lag),
+        }
+
+
+def run_scenario(
+    name: str,
+    mode: str = "headless",
+    scale: float = 1.0,
+    max_parallel: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT_S,
+) -> Dict[str, object]:
+    """Run one scenario in this process and return its measurements."""
+
+    scenario = SCENARIOS[name]
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+    # État local (historique, caches, réglages) isolé de celui de l'utilisateur.
+    os.environ["CLI_ORCHESTRATOR_HOME"] = str(workdir / "home")
+
+    from PySide6.QtCore import QSettings, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from core.models import AppSettings
+
+    QSettings.setPath(QSettings.NativeFormat, QSettings.UserScope, str(workdir / "settings"))
+    app = QApplication.instance() or QApplication([sys.argv[0]])
+    lots = prepare_lots(scenario, workdir / "bases", scale)
+    jar = workdir / "app.jar"
+    jar.write_bytes(b"")
+    settings = AppSettings(
+        jar_path=str(jar),
+        lots=lots,
+        auto_mode=True,
+        max_parallel=max_parallel or os.cpu_count() or 4,
+        force_rerun=True,
+        class_data_sharing=False,
+        task_memory_mb=TASK_MEMORY_MB,
+        java_command=fake_java_command(),
+    )
+    result: Dict[str, object] = {
+        "scenario": name,
+        "mode": mode,
+        "scale": scale,
+        "max_parallel": settings.max_parallel,
+        "date": datetime.now().isoformat(timespec="seconds"),
+    }
+    errors: List[str] = []
+
+    if mode == "gui":
+        from ui.main_window import MainWindow
+
+        window = MainWindow()
+        window.show()
+        orchestrator = window.orchestrator()
+        probe = _Probe(orchestrator)
+        # Mesurée après l'affichage : l'analyseur livre les lignes à la fenêtre avant la sonde.
+        window.log_parser().parsed.connect(lambda parsed: probe.on_lines(parsed.lines))
+        orchestrator.all_finished.connect(lambda: (probe.stop(), QTimer.singleShot(0, app.quit)))
+        orchestrator.startup_error.connect(lambda message: (errors.append(message), app.quit()))
+        begin = lambda: window.start_run(settings)
+    else:
+        from core.headless import HeadlessRunner
+
+        console = open(os.devnull, "w", encoding="utf-8")
+        runner = HeadlessRunner(workdir / "logs", console=console)
+        orchestrator = runner.orchestrator()
+        probe = _Probe(orchestrator)
+        orchestrator.task_output.connect(lambda _task, lines, _is_error: probe.on_lines(lines))
+        orchestrator.startup_error.connect(errors.append)
+        runner.finished.connect(lambda _code: (probe.stop(), app.quit()))
+        begin = lambda: runner.start(settings)
+
+    def on_timeout() -> None:
+        result["timed_out"] = True
+        orchestrator.stop_all()
+        # Processus récalcitrants : abandon après un délai de grâce.
+        QTimer.singleShot(10_000, app.quit)
+
+    QTimer.singleShot(int(timeout * 1000), on_timeout)
+    QTimer.singleShot(0, lambda: (probe.start(), begin()))
+    app.exec()
+    if not probe.finished_at:
+        probe.stop()
+    if mode == "gui":
+        window.close()
+    else:
+        console.close()
+    result.update(probe.report())
+    result["timed_out"] = bool(result.get("timed_out"))
+    if errors:
+        result["errors"] = errors
+    result["peak_rss_mb"] = peak_rss_mb(probe.largest_task_rss)
+    result["environment"] = environment()
+    return result
+
+
+def _run_in_subprocess(name: str, mode: str, args: argparse.Namespace) -> Dict[str, object]:
+    """One scenario per process: peak RSS and Qt state are not shared between measurements."""
+
+    command = [
+        sys.executable,
+        "-m",
+        "bench.run",
+        name,
+        "--mode",
+        mode,
+        "--scale",
+        str(args.scale),
+        "--max-parallel",
+        str(args.max_parallel),
+        "--timeout",
+        str(args.timeout),
+    ]
+    completed = subprocess.run(
+        command,
+        cwd=Path(__file__).resolve().parent.parent,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    lines = completed.stdout.strip().splitlines()
+    try:
+        return json.loads(lines[-1])
+    except (IndexError, ValueError):
+        return {"scenario": name, "mode": mode, "errors": [f"code retour {completed.returncode}, aucun résultat"]}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="bench.run", description="Mesures de débit de l'orchestrateur")
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="SCENARIO",
+        help=f"Scénarios à exécuter parmi {', '.join(SCENARIOS)} (par défaut : tous)",
+    )
+    parser.add_argument("--mode", choices=(*MODES, "both"), default="headless", help="Sans interface, avec la fenêtre principale ou les deux")
+    parser.add_argument("--scale", type=float, default=1.0, help="Facteur appliqué au nombre de tâches des scénarios")
+    parser.add_argument("--max-parallel", type=int, default=0, help="Processus simultanés (0 : nombre de CPU)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT_S, help="Durée maximale d'un scénario en secondes")
+    parser.add_argument("--output", help="Fichier JSON Lines auquel ajouter les résultats")
+    parser.add_argument("--list", action="store_true", help="Lister les scénarios")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for scenario in SCENARIOS.values():
+            print(f"{scenario.name:8} {scenario.description}")
+        return 0
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"scénario inconnu : {', '.join(unknown)}")
+    modes = list(MODES) if args.mode == "both" else [args.mode]
+    if len(names) == 1 and len(modes) == 1:
+        results = [run_scenario(names[0], modes[0], args.scale, args.max_parallel or None, args.timeout)]
+    else:
+        results = [_run_in_subprocess(name, mode, args) for name in names for mode in modes]
+    if args.output:
+        with open(args.output, "a", encoding="utf-8") as handle:
+            for result in results:
+                handle.write(json.dumps(result, ensure_ascii=False) + "\n")
+    if len(results) == 1:
+        # Une ligne : lue par le processus parent.
+        print(json.dumps(results[0], ensure_ascii=False), flush=True)
+    else:
+        print(json.dumps(results, ensure_ascii=False, indent=2), flush=True)
+    failed = any(result.get("errors") or result.get("timed_out") for result in results)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
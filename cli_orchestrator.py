@@ -0,0 +1,271 @@
+"""Command-line entry point: ``python -m cli_orchestrator run config.yaml --jar app.jar``.
+
+Runs the orchestration on a ``QCoreApplication`` so that no widget (and no
+display) is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from app_io.yaml_io import load_lots_from_yaml
+from core.cds import CdsArchiveCache
+from core.checkpoint import CheckpointJournal
+from core.diagnostics import EventLoopLagProbe, UiProfiler, profile_requested, write_report
+from core.event_journal import JOURNAL_FILE_NAME, EventJournal
+from core.fingerprint import FingerprintCache
+from core.headless import EXIT_STARTUP_ERROR, HeadlessRunner
+from core.log_spool import DEFAULT_LOG_BACKUPS, DEFAULT_MAX_LOG_BYTES, LogSpool
+from core.metrics import DEFAULT_METRICS_HOST, MetricsRegistry, MetricsServer, MetricsTextfileWriter
+from core.models import AppSettings, CommandArguments, LotConfig
+from core.run_history import RunHistoryStore
+from core.scheduling import SchedulingPolicy
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli_orchestrator", description="Orchestrateur FSADA sans interface graphique")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Exécuter les lots d'une configuration YAML")
+    run_parser.add_argument("config", help="Fichier YAML décrivant les lots")
+    run_parser.add_argument("--jar", required=True, help="Jar Java à exécuter")
+    run_parser.add_argument(
+        "--auto",
+        action="store_true",
+        help="Enchaîner les lots sans confirmation (sinon confirmation sur le terminal)",
+    )
+    run_parser.add_argument(
+        "--max-parallel",
+        type=int,
+        default=0,
+        help="Nombre maximal de processus simultanés (0 : selon les CPU et la mémoire)",
+    )
+    run_parser.add_argument(
+        "--java",
+        default="java",
+        metavar="COMMANDE",
+        help="Commande lançant la JVM, avec ses éventuels arguments (par défaut : java)",
+    )
+    run_parser.add_argument(
+        "--jvm-option",
+        action="append",
+        default=[],
+        metavar="OPTION",
+        help="Option passée à chaque JVM, ex : --jvm-option=-Xmx2g (répétable)",
+    )
+    run_parser.add_argument(
+        "--task-memory",
+        type=int,
+        default=0,
+        metavar="MO",
+        help="Mémoire réservée par tâche en Mo (0 : pic observé, -Xmx ou 512 Mo)",
+    )
+    run_parser.add_argument(
+        "--memory-budget",
+        type=int,
+        default=0,
+        metavar="MO",
+        help="Mémoire totale réservable par les tâches simultanées en Mo (0 : mémoire disponible)",
+    )
+    run_parser.add_argument(
+        "--pipelined",
+        action="store_true",
+        help="Démarrer le lot suivant dès que le lot courant a lancé toutes ses bases (avec --auto)",
+    )
+    run_parser.add_argument(
+        "--launch-thread",
+        action="store_true",
+        help="Démarrer les processus depuis un thread dédié",
+    )
+    run_parser.add_argument(
+        "--schedule",
+        choices=[policy.value for policy in SchedulingPolicy],
+        default=SchedulingPolicy.LONGEST_FIRST.value,
+        help="Ordre de lancement des bases : par nom ou les plus longues d'abord",
+    )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reprendre la dernière exécution en ignorant les bases déjà réussies",
+    )
+    run_parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Relancer aussi les bases inchangées depuis leur dernière exécution réussie",
+    )
+    run_parser.add_argument(
+        "--hash-content",
+        action="store_true",
+        help="Comparer le contenu des bases (hachage) en plus de leur taille et de leur date",
+    )
+    run_parser.add_argument(
+        "--no-cds",
+        action="store_true",
+        help="Ne pas utiliser d'archive de partage de classes (AppCDS) pour démarrer les JVM",
+    )
+    run_parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="Ne pas enregistrer l'exécution dans l'historique local",
+    )
+    run_parser.add_argument(
+        "--output-dir",
+        help="Dossier des journaux par tâche (par défaut ./logs/<horodatage>)",
+    )
+    run_parser.add_argument(
+        "--log-max-mb",
+        type=int,
+        default=DEFAULT_MAX_LOG_BYTES // (1024 * 1024),
+        metavar="MO",
+        help="Taille d'un journal de tâche avant rotation en Mo (0 : pas de rotation)",
+    )
+    run_parser.add_argument(
+        "--log-backups",
+        type=int,
+        default=DEFAULT_LOG_BACKUPS,
+        metavar="N",
+        help="Nombre de segments de journal conservés après rotation",
+    )
+    run_parser.add_argument(
+        "--compress-logs",
+        action="store_true",
+        help="Compresser (gzip) les segments de journal après rotation",
+    )
+    run_parser.add_argument(
+        "--no-event-journal",
+        action="store_true",
+        help=f"Ne pas enregistrer les événements de l'exécution dans <dossier de sortie>/{JOURNAL_FILE_NAME}",
+    )
+    run_parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=0,
+        metavar="PORT",
+        help=f"Exposer les métriques (format OpenMetrics) sur http://{DEFAULT_METRICS_HOST}:PORT/metrics",
+    )
+    run_parser.add_argument(
+        "--metrics-textfile",
+        metavar="FICHIER",
+        help="Écrire les métriques dans ce fichier (collecteur textfile de node_exporter), toutes les 15 s",
+    )
+    return parser
+
+
+def _confirm_on_terminal(lot: LotConfig) -> bool:
+    if not sys.stdin or not sys.stdin.isatty():
+        print("Mode manuel sans terminal interactif : arrêt après le lot", lot.name, flush=True)
+        return False
+    answer = input(f"Passer au lot suivant après {lot.name} ? [o/N] ")
+    return answer.strip().lower() in ("o", "oui", "y", "yes")
+
+
+def _run(args: argparse.Namespace) -> int:
+    try:
+        lots = load_lots_from_yaml(args.config)
+    except Exception as exc:
+        print(f"Impossible de charger le fichier : {exc}", file=sys.stderr)
+        return EXIT_STARTUP_ERROR
+
+    app = QCoreApplication.instance() or QCoreApplication(sys.argv[:1])
+    if args.output_dir:
+        output_dir = Path(args.output_dir).expanduser()
+    else:
+        output_dir = Path("logs") / datetime.now().strftime("%Y%m%d-%H%M%S")
+    history = None if args.no_history else RunHistoryStore()
+    metrics: Optional[MetricsRegistry] = None
+    metrics_server: Optional[MetricsServer] = None
+    metrics_writer: Optional[MetricsTextfileWriter] = None
+    if args.metrics_port or args.metrics_textfile:
+        metrics = MetricsRegistry()
+    if args.metrics_port:
+        try:
+            metrics_server = MetricsServer(metrics, args.metrics_port)
+        except OSError as exc:
+            print(f"Impossible d'exposer les métriques sur le port {args.metrics_port} : {exc}", file=sys.stderr)
+            return EXIT_STARTUP_ERROR
+    if args.metrics_textfile:
+        metrics_writer = MetricsTextfileWriter(metrics, Path(args.metrics_textfile).expanduser())
+    runner = HeadlessRunner(
+        output_dir,
+        confirm=_confirm_on_terminal,
+        history=history,
+        journal=CheckpointJournal(),
+        fingerprints=FingerprintCache(),
+        cds=CdsArchiveCache(),
+        spool=LogSpool(
+            output_dir,
+            max_bytes=max(0, args.log_max_mb) * 1024 * 1024,
+            backups=max(0, args.log_backups),
+            compress=args.compress_logs,
+        ),
+        metrics=metrics,
+    )
+    runner.finished.connect(app.exit)
+    journal: Optional[EventJournal] = None
+    if not args.no_event_journal:
+        journal = EventJournal(output_dir / JOURNAL_FILE_NAME, lots, args.jar)
+        journal.attach(runner.orchestrator())
+
+    # Laisse l'interpréteur traiter Ctrl+C pendant la boucle d'événements Qt.
+    signal.signal(signal.SIGINT, lambda *_: runner.interrupt())
+    keep_alive = QTimer()
+    keep_alive.start(200)
+    keep_alive.timeout.connect(lambda: None)
+
+    settings = AppSettings(
+        jar_path=args.jar,
+        lots=lots,
+        command_args=CommandArguments(jvm_options=list(args.jvm_option)),
+        auto_mode=args.auto,
+        max_parallel=args.max_parallel or None,
+        pipelined=args.pipelined,
+        launch_thread=args.launch_thread,
+        scheduling=SchedulingPolicy(args.schedule),
+        fingerprint_content=args.hash_content,
+        force_rerun=args.force,
+        class_data_sharing=not args.no_cds,
+        task_memory_mb=args.task_memory or None,
+        memory_budget_mb=args.memory_budget or None,
+        java_command=args.java,
+    )
+    # CLI_ORCHESTRATOR_PROFILE : profil et durées écrits à la fin dans le dossier des journaux.
+    profiler = UiProfiler()
+    lag_probe: Optional[EventLoopLagProbe] = None
+    if profile_requested():
+        lag_probe = EventLoopLagProbe()
+        lag_probe.start()
+        profiler.start()
+    QTimer.singleShot(0, lambda: runner.start(settings, resume=args.resume))
+    try:
+        return app.exec()
+    finally:
+        if profiler.is_running():
+            try:
+                write_report(lag_probe, profiler.stop(output_dir), output_dir)
+            except OSError:
+                pass
+        if history:
+            history.close()
+        if journal:
+            journal.close()
+        if metrics_server:
+            metrics_server.close()
+        if metrics_writer:
+            metrics_writer.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    if args.command == "run":
+        return _run(args)
+    return EXIT_STARTUP_ERROR
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject
+
+from .models import BatchConfig, DatabaseTask, ExecutionStatus
+from .process_runner import ProcessRunner
+
+
+class BatchProcessRunner(ProcessRunner):
+    """Run several databases in one invocation of the jar.
+
+    The output is split back to the individual tasks with the start and end
+    markers of the :class:`BatchConfig`: lines between the markers of a
+    database belong to it, other lines (JVM startup, shutdown) go to every
+    task still running.  Databases without an end marker take the exit status
+    of the invocation.
+    """
+
+    def __init__(
+        self,
+        tasks: List[DatabaseTask],
+        command: List[str],
+        batch: BatchConfig,
+        argfile: Optional[Path] = None,
+        working_directory: Optional[str] = None,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(tasks[0], command, working_directory, parent)
+        self.tasks = list(tasks)
+        self._argfile = argfile
+        self._start_marker = re.compile(batch.start_marker)
+        self._end_marker = re.compile(batch.end_marker)
+        self._by_key: Dict[str, DatabaseTask] = {}
+        for task in self.tasks:
+            self._by_key[str(task.database)] = task
+            self._by_key.setdefault(task.database.name, task)
+        self._unfinished: List[DatabaseTask] = list(self.tasks)
+        self._current: Optional[DatabaseTask] = None
+
+    def _report_started(self) -> None:
+        command = self.command_as_string()
+        for task in self.tasks:
+            self.started.emit(task, command)
+
+    def _handle_output(self, lines: List[str], is_error: bool) -> None:
+        routed: Dict[str, List[str]] = {}
+        order: List[DatabaseTask] = []
+
+        def flush() -> None:
+            for task in order:
+                self.output_received.emit(task, routed[task.id()], is_error)
+            routed.clear()
+            order.clear()
+
+        for line in lines:
+            start = self._start_marker.match(line)
+            if start:
+                self._current = self._lookup(start.groupdict().get("database"))
+            targets = [self._current] if self._current in self._unfinished else list(self._unfinished)
+            for task in targets:
+                if task.id() not in routed:
+                    routed[task.id()] = []
+                    order.append(task)
+                routed[task.id()].append(line)
+            end = self._end_marker.match(line)
+            if end:
+                task = self._lookup(end.groupdict().get("database"))
+                if task in self._unfinished:
+                    # Délivrer la sortie de la base avant d'annoncer sa fin.
+                    flush()
+                    self._finish_task(task, _parse_exit_code(end.groupdict().get("exit_code")))
+                self._current = None
+        flush()
+
+    def _lookup(self, database: Optional[str]) -> Optional[DatabaseTask]:
+        # Groupe absent ou non capturé : ligne commune à toutes les bases.
+        if not database:
+            return None
+        key = database.strip()
+        return self._by_key.get(key) or self._by_key.get(Path(key).name)
+
+    def _finish_task(self, task: DatabaseTask, exit_code: int) -> None:
+        self._unfinished.remove(task)
+        status = ExecutionStatus.SUCCEEDED if exit_code == 0 else ExecutionStatus.FAILED
+        self.finished.emit(task, status, exit_code)
+
+    def _report_finished(self, status: ExecutionStatus, exit_code: int) -> None:
+        for task in list(self._unfinished):
+            self._unfinished.remove(task)
+            self.finished.emit(task, status, exit_code)
+        if self._argfile is not None:
+            try:
+                self._argfile.unlink()
+            except OSError:
+                pass
+
+
+def _parse_exit_code(value: Optional[str]) -> int:
+    try:
+        return int(value) if value is not None else 0
+    except ValueError:
+        return -1
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from .paths import app_data_dir
+
+# Présent dans les avertissements de la JVM lorsqu'elle ne peut pas utiliser l'archive.
+REJECTION_HINT = "shared archive"
+
+
+class CdsArchiveCache:
+    """Dynamic AppCDS archives of the orchestrated jar, one per jar hash.
+
+    The first task of a run without archive is the training run: it is
+    launched with ``-XX:ArchiveClassesAtExit`` and its archive is published
+    once its process has exited.  The following tasks map the archive with
+    ``-Xshare:auto``, so a JVM that cannot use it (other JDK build, corrupted
+    file) still starts normally; :meth:`reject` then drops the archive and
+    disables CDS for the rest of the run.
+    """
+
+    def __init__(self, directory: Optional[Path] = None):
+        self._directory = directory or app_data_dir() / "cds"
+        self._training: set[str] = set()
+        # Archives rejetées ou impossibles à produire pendant cette exécution.
+        self._disabled: set[str] = set()
+
+    def archive_path(self, jar_hash: str) -> Path:
+        return self._directory / f"{jar_hash[:16]}.jsa"
+
+    def reset_session(self) -> None:
+        self._disabled.clear()
+
+    def archive_args(self, jar_hash: str) -> List[str]:
+        """JVM options mapping the archive of ``jar_hash``, empty when there is none yet."""
+
+        if not jar_hash or jar_hash in self._disabled:
+            return []
+        archive = self.archive_path(jar_hash)
+        if not archive.is_file():
+            return []
+        return [f"-XX:SharedArchiveFile={archive}", "-Xshare:auto"]
+
+    def begin_training(self, jar_hash: str) -> List[str]:
+        """JVM options of the training run, empty when one is already in progress."""
+
+        if not jar_hash or jar_hash in self._disabled or jar_hash in self._training:
+            return []
+        self._directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self._temp_path(jar_hash)
+        try:
+            temp_path.unlink()
+        except OSError:
+            pass
+        self._training.add(jar_hash)
+        # Les JVM antérieures au JDK 13 ignorent l'option au lieu de refuser de démarrer.
+        return ["-XX:+IgnoreUnrecognizedVMOptions", f"-XX:ArchiveClassesAtExit={temp_path}"]
+
+    def finish_training(self, jar_hash: str) -> bool:
+        """Publish the archive dumped by the training run; ``False`` if there is none."""
+
+        self._training.discard(jar_hash)
+        temp_path = self._temp_path(jar_hash)
+        try:
+            if temp_path.stat().st_size > 0:
+                os.replace(temp_path, self.archive_path(jar_hash))
+                return True
+        except OSError:
+            pass
+        # JVM trop ancienne ou arrêtée avant l'écriture : pas de nouvel essai avant la prochaine exécution.
+        self._disabled.add(jar_hash)
+        return False
+
+    def reject(self, jar_hash: str) -> None:
+        """Drop the archive of ``jar_hash``; it is rebuilt on the next run."""
+
+        self._disabled.add(jar_hash)
+        try:
+            self.archive_path(jar_hash).unlink()
+        except OSError:
+            pass
+
+    def _temp_path(self, jar_hash: str) -> Path:
+        return self._directory / f"{jar_hash[:16]}.jsa.tmp"
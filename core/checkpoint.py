@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, IO, Optional, Tuple
+
+from .paths import app_data_dir
+
+CheckpointKey = Tuple[str, str]
+
+
+@dataclass
+class CheckpointEntry:
+    lot: str
+    database: str
+    status: str
+    exit_code: int
+    signature: str
+
+
+class CheckpointJournal:
+    """Append-only journal of the task completions of the current run.
+
+    Each completion is one compact JSON line, flushed and fsync'd before
+    :meth:`append` returns, so that a crash never loses a finished task.  A
+    torn last line (power loss during the write) is ignored when loading.
+    :meth:`compact` rewrites the journal with only the latest state of each
+    database.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path or app_data_dir() / "checkpoint.jsonl"
+        self._handle: Optional[IO[str]] = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def reset(self) -> None:
+        self.close()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = self._path.open("w", encoding="utf-8")
+        self._sync()
+
+    def append(self, entry: CheckpointEntry) -> None:
+        if self._handle is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self._path.open("a", encoding="utf-8")
+        self._handle.write(_encode(entry))
+        self._sync()
+
+    def load(self) -> Dict[CheckpointKey, CheckpointEntry]:
+        entries: Dict[CheckpointKey, CheckpointEntry] = {}
+        if not self._path.exists():
+            return entries
+        with self._path.open("r", encoding="utf-8") as handle:
+            for line in handle:
+                entry = _decode(line)
+                if entry is not None:
+                    entries[(entry.lot, entry.database)] = entry
+        return entries
+
+    def compact(self) -> Dict[CheckpointKey, CheckpointEntry]:
+        """Rewrite the journal atomically with the last entry of each database."""
+
+        entries = self.load()
+        self.close()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_name(self._path.name + ".tmp")
+        with temp_path.open("w", encoding="utf-8") as handle:
+            for entry in entries.values():
+                handle.write(_encode(entry))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, self._path)
+        return entries
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _sync(self) -> None:
+        assert self._handle is not None
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+
+def _encode(entry: CheckpointEntry) -> str:
+    record = {"l": entry.lot, "d": entry.database, "s": entry.status, "c": entry.exit_code, "k": entry.signature}
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+def _decode(line: str) -> Optional[CheckpointEntry]:
+    if not line.endswith("\n"):
+        return None
+    try:
+        record = json.loads(line)
+        return CheckpointEntry(
+            lot=str(record["l"]),
+            database=str(record["d"]),
+            status=str(record["s"]),
+            exit_code=int(record["c"]),
+            signature=str(record["k"]),
+        )
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,286 @@
+"""Instrumentation of the hot paths: call timings, event-loop lag and optional cProfile capture.
+
+The functions and slots decorated with :func:`timed` feed the process-wide
+:data:`TIMINGS` registry (a lock and two clock reads per call).  An
+:class:`EventLoopLagProbe` measures how late a short timer fires, which is
+the stutter the user sees, and a :class:`UiProfiler` captures the GUI thread
+with cProfile on demand or when ``CLI_ORCHESTRATOR_PROFILE`` is set.
+:func:`write_report` dumps all of them to a JSON file.
+"""
+from __future__ import annotations
+
+import cProfile
+import functools
+import json
+import os
+import platform
+import pstats
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, TypeVar
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+from .paths import app_data_dir
+
+PROFILE_ENV_VAR = "CLI_ORCHESTRATOR_PROFILE"
+LAG_PROBE_INTERVAL_MS = 50
+# Retard au-delà duquel l'interface paraît figée ; un appel plus long est compté comme lent.
+STALL_THRESHOLD_S = 0.1
+# Une minute d'échantillons de la sonde.
+LAG_HISTORY = 1200
+PROFILE_TOP_FUNCTIONS = 40
+
+_Function = TypeVar("_Function", bound=Callable)
+
+
+@dataclass
+class TimingStats:
+    name: str
+    calls: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    slow_calls: int = 0
+
+    def mean(self) -> float:
+        return self.total / self.calls if self.calls else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "total_ms": round(self.total * 1000, 3),
+            "mean_ms": round(self.mean() * 1000, 4),
+            "max_ms": round(self.max * 1000, 3),
+            "slow_calls": self.slow_calls,
+        }
+
+
+class TimingRegistry:
+    """Call count, total and maximum duration per instrumented function, from any thread."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, TimingStats] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = TimingStats(name)
+            stats.calls += 1
+            stats.total += seconds
+            if seconds > stats.max:
+                stats.max = seconds
+            if seconds >= STALL_THRESHOLD_S:
+                stats.slow_calls += 1
+
+    def snapshot(self) -> List[TimingStats]:
+        """Copies of the counters, the most expensive first."""
+
+        with self._lock:
+            copies = [
+                TimingStats(stats.name, stats.calls, stats.total, stats.max, stats.slow_calls)
+                for stats in self._stats.values()
+            ]
+        return sorted(copies, key=lambda stats: stats.total, reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+TIMINGS = TimingRegistry()
+
+
+def timed(function: Optional[_Function] = None, *, name: str = "") -> _Function:
+    """Count the calls and the duration of ``function`` in :data:`TIMINGS`.
+
+    Used bare (``@timed``, named after the qualified name of the function)
+    or with a name (``@timed(name="discovery.scan")``).  Under ``@Slot()``
+    the decorated function keeps the signature seen by Qt.
+    """
+
+    def decorate(func: _Function) -> _Function:
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                TIMINGS.record(label, time.perf_counter() - started)
+
+        return wrapper  # type: ignore[return-value]
+
+    if function is not None:
+        return decorate(function)
+    return decorate  # type: ignore[return-value]
+
+
+@dataclass
+class LagSummary:
+    """Lateness of the probe timer, in seconds, over the recent samples (``stalls``: since the reset)."""
+
+    current: float = 0.0
+    p50: float = 0.0
+    p95: float = 0.0
+    max: float = 0.0
+    stalls: int = 0
+    stalled_seconds: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "current_ms": round(self.current * 1000, 3),
+            "p50_ms": round(self.p50 * 1000, 3),
+            "p95_ms": round(self.p95 * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "stalls": self.stalls,
+            "stalled_s": round(self.stalled_seconds, 3),
+        }
+
+
+class EventLoopLagProbe(QObject):
+    """Timer of the event loop measuring how late it fires: the time the loop spent elsewhere."""
+
+    def __init__(self, interval_ms: int = LAG_PROBE_INTERVAL_MS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._interval = interval_ms / 1000
+        self._samples: Deque[float] = deque(maxlen=LAG_HISTORY)
+        self._max = 0.0
+        self._stalls = 0
+        self._stalled_seconds = 0.0
+        self._last_tick = 0.0
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._on_tick)
+
+    def start(self) -> None:
+        self._last_tick = time.monotonic()
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def reset(self) -> None:
+        self._samples.clear()
+        self._max = 0.0
+        self._stalls = 0
+        self._stalled_seconds = 0.0
+
+    def summary(self) -> LagSummary:
+        if not self._samples:
+            return LagSummary(stalls=self._stalls, stalled_seconds=self._stalled_seconds)
+        ordered = sorted(self._samples)
+        return LagSummary(
+            current=self._samples[-1],
+            p50=ordered[len(ordered) // 2],
+            p95=ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+            max=self._max,
+            stalls=self._stalls,
+            stalled_seconds=self._stalled_seconds,
+        )
+
+    def _on_tick(self) -> None:
+        now = time.monotonic()
+        lag = max(0.0, now - self._last_tick - self._interval)
+        self._last_tick = now
+        self._samples.append(lag)
+        if lag > self._max:
+            self._max = lag
+        if lag >= STALL_THRESHOLD_S:
+            self._stalls += 1
+            self._stalled_seconds += lag
+
+
+def diagnostics_dir() -> Path:
+    return app_data_dir() / "diagnostics"
+
+
+def profile_requested() -> bool:
+    """``CLI_ORCHESTRATOR_PROFILE`` asks for a cProfile capture from the start of the process."""
+
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() not in ("", "0", "false", "no")
+
+
+def _new_path(directory: Path, prefix: str, suffix: str) -> Path:
+    """``<prefix>-<horodatage><suffix>`` in ``directory``, numbered when several are written in the same second."""
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = directory / f"{prefix}-{stamp}{suffix}"
+    number = 1
+    while path.exists():
+        number += 1
+        path = directory / f"{prefix}-{stamp}-{number}{suffix}"
+    return path
+
+
+class UiProfiler:
+    """cProfile capture of the calling thread (the GUI thread), written on :meth:`stop`.
+
+    Only the functions run by that thread are seen: the launcher, parser and
+    discovery threads appear in :data:`TIMINGS` instead.
+    """
+
+    def __init__(self) -> None:
+        self._profile: Optional[cProfile.Profile] = None
+        self._started = 0.0
+
+    def is_running(self) -> bool:
+        return self._profile is not None
+
+    def start(self) -> None:
+        if self._profile is not None:
+            return
+        self._profile = cProfile.Profile()
+        self._started = time.monotonic()
+        self._profile.enable()
+
+    def stop(self, directory: Optional[Path] = None) -> Optional[Path]:
+        """Stop the capture and write ``profile-<horodatage>.prof`` plus a text summary; returns the ``.prof``."""
+
+        if self._profile is None:
+            return None
+        profile, self._profile = self._profile, None
+        profile.disable()
+        directory = directory or diagnostics_dir()
+        directory.mkdir(parents=True, exist_ok=True)
+        path = _new_path(directory, "profile", ".prof")
+        profile.dump_stats(str(path))
+        # Résumé lisible sans outil : fonctions les plus coûteuses, temps cumulé puis propre.
+        with path.with_suffix(".txt").open("w", encoding="utf-8") as handle:
+            handle.write(f"Capture de {time.monotonic() - self._started:.1f} s du thread de l'interface\n\n")
+            stats = pstats.Stats(profile, stream=handle)
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PROFILE_TOP_FUNCTIONS)
+            stats.sort_stats(pstats.SortKey.TIME).print_stats(PROFILE_TOP_FUNCTIONS)
+        return path
+
+
+def write_report(
+    probe: Optional[EventLoopLagProbe] = None,
+    profile_path: Optional[Path] = None,
+    directory: Optional[Path] = None,
+    registry: TimingRegistry = TIMINGS,
+) -> Path:
+    """Dump the timings and the event-loop lag to ``diagnostics-<horodatage>.json``."""
+
+    directory = directory or diagnostics_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    report = {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "event_loop_lag": probe.summary().to_dict() if probe else None,
+        "timings": [stats.to_dict() for stats in registry.snapshot()],
+        "profile": str(profile_path) if profile_path else None,
+    }
+    path = _new_path(directory, "diagnostics", ".json")
+    path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    return path
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QCoreApplication, QFileSystemWatcher, QObject, QTimer, Signal
+
+from .diagnostics import timed
+from .file_walker import FileFilter, walk
+from .models import LotConfig
+
+# Lots explorés en parallèle (les partages réseau répondent lentement, pas le CPU).
+DISCOVERY_WORKERS = 8
+# Délai de regroupement des notifications du système de fichiers avant une nouvelle recherche.
+WATCH_DEBOUNCE_MS = 500
+# Pendant une recherche, les bases trouvées sont transmises par paquets : au plus tous les N fichiers
+# ou toutes les N secondes, pour que la distribution commence avant la fin du parcours.
+FILES_PER_CHUNK = 256
+SECONDS_PER_CHUNK = 0.2
+
+# Ce qui détermine le résultat d'une recherche : dossier, fichiers explicites et filtre.
+DiscoveryKey = Tuple[str, Tuple[str, ...], FileFilter]
+
+
+def discovery_key(lot: LotConfig) -> DiscoveryKey:
+    return (lot.databases_path, tuple(lot.files), lot.file_filter())
+
+
+@dataclass(frozen=True)
+class DiscoveredFile:
+    path: str
+    size: int
+    mtime_ns: int
+
+
+@dataclass
+class LotSnapshot:
+    """Databases found for a lot configuration, with their size and date."""
+
+    key: DiscoveryKey
+    files: List[DiscoveredFile] = field(default_factory=list)
+    # Date de modification (ns, -1 si absent) des dossiers lus : le résultat reste valable tant qu'elles sont inchangées.
+    directories: Dict[str, int] = field(default_factory=dict)
+    scanned_at: float = 0.0
+    error: str = ""
+
+    def paths(self) -> List[Path]:
+        return [Path(entry.path) for entry in self.files]
+
+    def sizes(self) -> Dict[str, int]:
+        return {entry.path: entry.size for entry in self.files}
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _stat_entry(path: Path) -> DiscoveredFile:
+    try:
+        stat = path.stat()
+    except OSError:
+        return DiscoveredFile(str(path), 0, -1)
+    return DiscoveredFile(str(path), stat.st_size, stat.st_mtime_ns)
+
+
+@timed(name="discovery.scan")
+def scan(
+    key: DiscoveryKey, on_files: Optional[Callable[[List[DiscoveredFile]], None]] = None
+) -> LotSnapshot:
+    """List the databases of a lot configuration, as ``LotConfig.iter_databases`` does.
+
+    ``on_files`` receives the databases in chunks while the tree is walked.
+    """
+
+    databases_path, files, file_filter = key
+    snapshot = LotSnapshot(key=key, scanned_at=time.time())
+    if files:
+        paths = [Path(name).expanduser() for name in files]
+        snapshot.directories = {str(directory): _mtime_ns(directory) for directory in {path.parent for path in paths}}
+        snapshot.files = [_stat_entry(path) for path in paths]
+        return snapshot
+
+    base_path = Path(databases_path).expanduser()
+    # Un dossier absent est surveillé par sa date (-1) : sa création invalide le résultat.
+    snapshot.directories[str(base_path)] = -1
+
+    def on_directory(directory: str, mtime_ns: int) -> None:
+        snapshot.directories[directory] = mtime_ns
+
+    chunk: List[DiscoveredFile] = []
+    chunk_started = time.monotonic()
+    try:
+        for path, stat in walk(base_path, file_filter, on_directory):
+            entry = DiscoveredFile(path, stat.st_size, stat.st_mtime_ns)
+            snapshot.files.append(entry)
+            if on_files is None:
+                continue
+            chunk.append(entry)
+            if len(chunk) >= FILES_PER_CHUNK or time.monotonic() - chunk_started >= SECONDS_PER_CHUNK:
+                on_files(chunk)
+                chunk = []
+                chunk_started = time.monotonic()
+    except OSError as exc:
+        snapshot.error = str(exc)
+    if chunk and on_files is not None:
+        on_files(chunk)
+    return snapshot
+
+
+def is_current(snapshot: LotSnapshot) -> bool:
+    """``True`` while none of the directories read by the scan has changed."""
+
+    return not snapshot.error and all(
+        _mtime_ns(Path(directory)) == mtime for directory, mtime in snapshot.directories.items()
+    )
+
+
+class DiscoveryService(QObject):
+    """Finds the databases of the lots on a thread pool and caches the result.
+
+    One snapshot is kept per lot configuration (directory, file filter, explicit
+    files) and shared by the dashboard and the orchestrator.  A snapshot is
+    invalidated when ``QFileSystemWatcher`` reports a change in one of its
+    directories; since the watcher is unreliable on network shares,
+    :meth:`refresh` also checks the modification dates of the directories
+    (one ``stat`` each) before reusing a snapshot.  While a scan runs, the
+    databases already found are available through :meth:`partial` and
+    ``files_found``.
+    """
+
+    # LotSnapshot, émis dans le thread de l'objet après chaque recherche ou vérification.
+    lot_discovered = Signal(object)
+    # Bases trouvées par une recherche en cours (DiscoveryKey, liste de DiscoveredFile).
+    files_found = Signal(object, list)
+    _scanned = Signal(object, int)
+    _found = Signal(object, int, list)
+
+    def __init__(self, max_workers: int = DISCOVERY_WORKERS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="discovery")
+        self._snapshots: Dict[DiscoveryKey, LotSnapshot] = {}
+        # Recherche en cours par configuration : numéro de la dernière demandée.
+        self._pending: Dict[DiscoveryKey, int] = {}
+        # Bases déjà trouvées par la recherche en cours de chaque configuration.
+        self._partial: Dict[DiscoveryKey, List[DiscoveredFile]] = {}
+        self._stale: Set[DiscoveryKey] = set()
+        self._tracked: Set[DiscoveryKey] = set()
+        self._generations = itertools.count(1)
+        self._scanned.connect(self._on_scanned)
+        self._found.connect(self._on_found)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._rescan_timer.timeout.connect(self._rescan_stale)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def snapshot(self, lot: LotConfig) -> Optional[LotSnapshot]:
+        """Up-to-date snapshot of ``lot``; ``None`` while it is being (re)scanned or was invalidated."""
+
+        key = discovery_key(lot)
+        if key in self._pending or key in self._stale:
+            return None
+        return self._snapshots.get(key)
+
+    def cached(self, lot: LotConfig) -> Optional[LotSnapshot]:
+        """Last known snapshot of ``lot``, even if a newer scan is in progress."""
+
+        return self._snapshots.get(discovery_key(lot))
+
+    def is_pending(self, lot: LotConfig) -> bool:
+        return discovery_key(lot) in self._pending
+
+    def partial(self, lot: LotConfig) -> List[DiscoveredFile]:
+        """Databases already found by the scan of ``lot`` in progress; the next ones come through ``files_found``."""
+
+        return list(self._partial.get(discovery_key(lot), []))
+
+    def refresh(self, lots: Iterable[LotConfig], force: bool = False) -> None:
+        """Check (or scan) the lots in the background; ``lot_discovered`` reports each result."""
+
+        for lot in lots:
+            key = discovery_key(lot)
+            if key in self._pending:
+                continue
+            previous = None if force or key in self._stale else self._snapshots.get(key)
+            self._schedule(key, previous)
+
+    def track(self, lots: List[LotConfig]) -> None:
+        """Keep only the snapshots of ``lots``, watch their directories and refresh them."""
+
+        self._tracked = {discovery_key(lot) for lot in lots}
+        for key in list(self._snapshots):
+            if key not in self._tracked:
+                del self._snapshots[key]
+                self._stale.discard(key)
+        self._update_watches()
+        self.refresh(lots)
+
+    def shutdown(self) -> None:
+        self._rescan_timer.stop()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule(self, key: DiscoveryKey, previous: Optional[LotSnapshot]) -> None:
+        generation = next(self._generations)
+        self._pending[key] = generation
+        self._partial[key] = []
+        self._stale.discard(key)
+
+        def job() -> None:
+            if previous is not None and is_current(previous):
+                result = previous
+            else:
+                result = scan(key, lambda files: self._found.emit(key, generation, files))
+            self._scanned.emit(result, generation)
+
+        try:
+            self._pool.submit(job)
+        except RuntimeError:  # Pool arrêté : l'application se ferme.
+            self._pending.pop(key, None)
+            self._partial.pop(key, None)
+
+    def _on_found(self, key: DiscoveryKey, generation: int, files: List[DiscoveredFile]) -> None:
+        if self._pending.get(key) != generation:
+            return
+        self._partial[key].extend(files)
+        self.files_found.emit(key, files)
+
+    def _on_scanned(self, snapshot: LotSnapshot, generation: int) -> None:
+        key = snapshot.key
+        if self._pending.get(key) != generation:
+            return
+        del self._pending[key]
+        del self._partial[key]
+        self._snapshots[key] = snapshot
+        if key in self._tracked:
+            self._update_watches()
+        self.lot_discovered.emit(snapshot)
+
+    def _update_watches(self) -> None:
+        wanted = {
+            directory
+            for key in self._tracked
+            if key in self._snapshots
+            for directory, mtime in self._snapshots[key].directories.items()
+            if mtime != -1
+        }
+        watched = set(self._watcher.directories())
+        if watched - wanted:
+            self._watcher.removePaths(list(watched - wanted))
+        if wanted - watched:
+            self._watcher.addPaths(list(wanted - watched))
+
+    def _on_directory_changed(self, directory: str) -> None:
+        for key, snapshot in self._snapshots.items():
+            if directory in snapshot.directories:
+                self._stale.add(key)
+        if self._stale:
+            self._rescan_timer.start()
+
+    def _rescan_stale(self) -> None:
+        for key in list(self._stale):
+            if key in self._pending:
+                # Une recherche est déjà en cours : la relancer après elle pour voir ce changement.
+                self._rescan_timer.start()
+            elif key in self._tracked:
+                self._schedule(key, None)
@@ -0,0 +1,340 @@
+from __future__ import annotations
+
+import gzip
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .models import DatabaseTask, ExecutionStatus, LotConfig
+from .process_sampler import ProcessSample, TaskUsage
+
+JOURNAL_FILE_NAME = "events.jsonl"
+JOURNAL_VERSION = 1
+# Le thread d'écriture vide son tampon au plus tard après ce délai.
+FLUSH_INTERVAL_S = 1.0
+# Pendant une relecture sans attente (vitesse 0), événements rejoués entre deux passages de la boucle Qt.
+EVENTS_PER_REPLAY_SLICE = 500
+
+_Record = Tuple[float, str, Dict[str, Any]]
+
+
+def _task(task: DatabaseTask) -> Dict[str, Any]:
+    return {"lot": task.lot.name, "db": str(task.database)}
+
+
+def _usage(usage: TaskUsage) -> Dict[str, Any]:
+    data = _task(usage.task)
+    data["peak_cpu"] = round(usage.peak_cpu_percent, 1)
+    data["peak_rss"] = usage.peak_rss_bytes
+    sample = usage.current
+    if sample is not None:
+        data["cpu"] = round(sample.cpu_percent, 1)
+        data["rss"] = sample.rss_bytes
+        data["read"] = sample.read_bytes
+        data["write"] = sample.write_bytes
+    return data
+
+
+class EventJournal:
+    """Append-only JSONL journal of the orchestrator signals.
+
+    One line per event: ``t`` (seconds since the journal was opened, from
+    the monotonic clock), ``e`` (name of the signal) and its arguments; the
+    first line describes the run (lots, jar, wall-clock start).  Callers only
+    enqueue a tuple: serialisation and writes happen on a background thread
+    that flushes at least every ``FLUSH_INTERVAL_S``.  :class:`EventReplayer`
+    reads the journal back.
+    """
+
+    def __init__(self, path: Path, lots: List[LotConfig], jar_path: str = ""):
+        self._path = path
+        self._started = time.monotonic()
+        # ``None`` arrête le thread d'écriture.
+        self._queue: "queue.Queue[Optional[_Record]]" = queue.Queue()
+        self._connections: List[Tuple[Any, Callable]] = []
+        self._writer = threading.Thread(target=self._write_loop, name="event-journal-writer", daemon=True)
+        self._queue.put(
+            (0.0, "journal", {
+                "version": JOURNAL_VERSION,
+                "started_at": time.time(),
+                "jar": jar_path,
+                "lots": [lot.to_dict() for lot in lots],
+            })
+        )
+        self._writer.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, event: str, **data: Any) -> None:
+        self._queue.put((time.monotonic() - self._started, event, data))
+
+    def attach(self, orchestrator) -> None:
+        """Record every signal of ``orchestrator`` (and the memory budget of its worker pool)."""
+
+        pool = orchestrator.worker_pool()
+        self._connect(orchestrator.lot_started, lambda lot: self.record("lot_started", lot=lot.name))
+        self._connect(orchestrator.lot_finished, lambda lot: self.record("lot_finished", lot=lot.name))
+        self._connect(orchestrator.lot_skipped, lambda lot, reason: self.record("lot_skipped", lot=lot.name, reason=reason))
+        self._connect(
+            orchestrator.request_lot_confirmation, lambda lot: self.record("request_lot_confirmation", lot=lot.name)
+        )
+        self._connect(orchestrator.task_started, lambda task, command: self.record("task_started", **_task(task), command=command))
+        self._connect(
+            orchestrator.task_output,
+            lambda task, lines, is_error: self.record("task_output", **_task(task), lines=lines, stderr=is_error),
+        )
+        self._connect(
+            orchestrator.task_finished,
+            lambda task, status, code: self.record("task_finished", **_task(task), status=status.name, exit_code=code),
+        )
+        self._connect(orchestrator.task_error, lambda task, message: self.record("task_error", **_task(task), message=message))
+        self._connect(orchestrator.task_skipped, lambda task, reason: self.record("task_skipped", **_task(task), reason=reason))
+        self._connect(orchestrator.task_usage, lambda usages: self.record("task_usage", usages=[_usage(u) for u in usages]))
+        self._connect(orchestrator.startup_error, lambda message: self.record("startup_error", message=message))
+        self._connect(orchestrator.all_finished, lambda: self.record("all_finished"))
+        self._connect(
+            pool.budget_changed, lambda reserved, budget: self.record("memory_budget", reserved_mb=reserved, budget_mb=budget)
+        )
+
+    def detach(self) -> None:
+        for signal, slot in self._connections:
+            signal.disconnect(slot)
+        self._connections.clear()
+
+    def close(self) -> None:
+        self.detach()
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    def _connect(self, signal, slot: Callable) -> None:
+        signal.connect(slot)
+        self._connections.append((signal, slot))
+
+    # --- Thread d'écriture ---
+    def _write_loop(self) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            handle: Optional[IO[str]] = self._path.open("w", encoding="utf-8", newline="\n")
+        except OSError:
+            handle = None
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = self._queue.get(timeout=FLUSH_INTERVAL_S)
+            except queue.Empty:
+                record = ()
+            if record is None:
+                break
+            if handle is None:
+                continue
+            try:
+                if record:
+                    elapsed, event, data = record
+                    payload = {"t": round(elapsed, 6), "e": event, **data}
+                    handle.write(json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n")
+                if time.monotonic() - last_flush >= FLUSH_INTERVAL_S:
+                    handle.flush()
+                    last_flush = time.monotonic()
+            except OSError:
+                # Disque plein ou retiré : les événements suivants sont perdus, pas l'exécution.
+                pass
+        if handle is not None:
+            handle.close()
+
+
+@dataclass
+class JournalEvent:
+    time: float
+    name: str
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+def read_events(path: Path) -> Iterator[JournalEvent]:
+    """Events of a journal in order; a truncated last line (journal of a crashed run) is ignored."""
+
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as handle:  # type: ignore[operator]
+        for line in handle:
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            yield JournalEvent(float(data.pop("t", 0.0)), str(data.pop("e", "")), data)
+
+
+class EventReplayer(QObject):
+    """Plays a journal back through the same signals as :class:`Orchestrator`.
+
+    Events are emitted on the Qt event loop with their original spacing
+    divided by ``speed``; a ``speed`` of 0 replays them as fast as the
+    receivers allow, a slice at a time.  Lots and tasks are rebuilt from the
+    journal so that receivers get the usual ``LotConfig`` and
+    ``DatabaseTask`` objects.
+    """
+
+    lot_started = Signal(LotConfig)
+    lot_finished = Signal(LotConfig)
+    lot_skipped = Signal(LotConfig, str)
+    all_finished = Signal()
+    task_started = Signal(DatabaseTask, str)
+    task_output = Signal(DatabaseTask, list, bool)
+    task_finished = Signal(DatabaseTask, ExecutionStatus, int)
+    task_error = Signal(DatabaseTask, str)
+    task_skipped = Signal(DatabaseTask, str)
+    request_lot_confirmation = Signal(LotConfig)
+    startup_error = Signal(str)
+    task_usage = Signal(list)
+    budget_changed = Signal(int, int)
+    # Lots décrits par l'en-tête du journal, émis avant le premier événement.
+    lots_loaded = Signal(list)
+    # Temps du journal atteint (secondes).
+    position_changed = Signal(float)
+    # Fin du journal.
+    finished = Signal()
+
+    def __init__(self, path: Path, speed: float = 1.0, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._path = path
+        self._speed = max(0.0, speed)
+        self._events: Optional[Iterator[JournalEvent]] = None
+        self._next: Optional[JournalEvent] = None
+        self._lots: Dict[str, LotConfig] = {}
+        self._tasks: Dict[Tuple[str, str], DatabaseTask] = {}
+        self._usages: Dict[Tuple[str, str], TaskUsage] = {}
+        # Origine de la relecture : (horloge monotone, temps du journal) à la dernière reprise.
+        self._origin: Tuple[float, float] = (0.0, 0.0)
+        self._position = 0.0
+        self._paused = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._play)
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            "journal": self._on_header,
+            "lot_started": lambda data: self.lot_started.emit(self._lot(data["lot"])),
+            "lot_finished": lambda data: self.lot_finished.emit(self._lot(data["lot"])),
+            "lot_skipped": lambda data: self.lot_skipped.emit(self._lot(data["lot"]), data.get("reason", "")),
+            "request_lot_confirmation": lambda data: self.request_lot_confirmation.emit(self._lot(data["lot"])),
+            "task_started": lambda data: self.task_started.emit(self._task(data), data.get("command", "")),
+            "task_output": lambda data: self.task_output.emit(self._task(data), data.get("lines", []), data.get("stderr", False)),
+            "task_finished": self._on_task_finished,
+            "task_error": lambda data: self.task_error.emit(self._task(data), data.get("message", "")),
+            "task_skipped": lambda data: self.task_skipped.emit(self._task(data), data.get("reason", "")),
+            "task_usage": lambda data: self.task_usage.emit([self._usage(item) for item in data.get("usages", [])]),
+            "startup_error": lambda data: self.startup_error.emit(data.get("message", "")),
+            "all_finished": lambda data: self.all_finished.emit(),
+            "memory_budget": lambda data: self.budget_changed.emit(data.get("reserved_mb", 0), data.get("budget_mb", 0)),
+        }
+
+    def speed(self) -> float:
+        return self._speed
+
+    def set_speed(self, speed: float) -> None:
+        self._speed = max(0.0, speed)
+        self._origin = (time.monotonic(), self._position)
+        if self._events is not None and not self._paused:
+            self._timer.start(0)
+
+    def position(self) -> float:
+        return self._position
+
+    def start(self) -> None:
+        self._events = read_events(self._path)
+        self._next = next(self._events, None)
+        self._origin = (time.monotonic(), self._next.time if self._next else 0.0)
+        self._paused = False
+        self._timer.start(0)
+
+    def set_paused(self, paused: bool) -> None:
+        self._paused = paused
+        if paused:
+            self._timer.stop()
+        elif self._events is not None:
+            self._origin = (time.monotonic(), self._position)
+            self._timer.start(0)
+
+    def _play(self) -> None:
+        if self._paused:
+            return
+        if self._speed > 0:
+            started_at, journal_time = self._origin
+            target = journal_time + (time.monotonic() - started_at) * self._speed
+            while self._next is not None and self._next.time <= target:
+                self._emit(self._next)
+                self._next = next(self._events, None) if self._events is not None else None
+        else:
+            for _ in range(EVENTS_PER_REPLAY_SLICE):
+                if self._next is None:
+                    break
+                self._emit(self._next)
+                self._next = next(self._events, None) if self._events is not None else None
+        self.position_changed.emit(self._position)
+        if self._next is None:
+            self._events = None
+            self.finished.emit()
+            return
+        if self._speed > 0:
+            started_at, journal_time = self._origin
+            due = started_at + (self._next.time - journal_time) / self._speed
+            self._timer.start(max(0, int((due - time.monotonic()) * 1000)))
+        else:
+            self._timer.start(0)
+
+    def _emit(self, event: JournalEvent) -> None:
+        self._position = max(self._position, event.time)
+        handler = self._handlers.get(event.name)
+        if handler is None:
+            return
+        try:
+            handler(event.data)
+        except (KeyError, TypeError, ValueError):
+            # Événement incomplet (journal d'une autre version) : ignoré.
+            return
+
+    def _on_header(self, data: Dict[str, Any]) -> None:
+        lots = [LotConfig.from_dict(item) for item in data.get("lots", [])]
+        self._lots = {lot.name: lot for lot in lots}
+        self._tasks.clear()
+        self._usages.clear()
+        self.lots_loaded.emit(lots)
+
+    def _on_task_finished(self, data: Dict[str, Any]) -> None:
+        self._usages.pop((data["lot"], data["db"]), None)
+        self.task_finished.emit(self._task(data), ExecutionStatus[data["status"]], int(data.get("exit_code", -1)))
+
+    def _lot(self, name: str) -> LotConfig:
+        lot = self._lots.get(name)
+        if lot is None:
+            lot = self._lots[name] = LotConfig(name, "")
+        return lot
+
+    def _task(self, data: Dict[str, Any]) -> DatabaseTask:
+        key = (data["lot"], data["db"])
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = DatabaseTask(self._lot(data["lot"]), Path(data["db"]))
+        return task
+
+    def _usage(self, data: Dict[str, Any]) -> TaskUsage:
+        task = self._task(data)
+        key = (data["lot"], data["db"])
+        usage = self._usages.get(key)
+        if usage is None:
+            usage = self._usages[key] = TaskUsage(task)
+        if "rss" in data:
+            usage.add(
+                ProcessSample(
+                    time.time(), float(data.get("cpu", 0.0)), int(data["rss"]), int(data.get("read", 0)), int(data.get("write", 0))
+                )
+            )
+        usage.peak_cpu_percent = max(usage.peak_cpu_percent, float(data.get("peak_cpu", 0.0)))
+        usage.peak_rss_bytes = max(usage.peak_rss_bytes, int(data.get("peak_rss", 0)))
+        return usage
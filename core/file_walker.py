@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+# Segment ``**`` : zéro, un ou plusieurs dossiers.
+_ANY_DIRECTORIES = None
+_CASE_INSENSITIVE = os.name == "nt"
+
+_Segments = Tuple[Optional[Pattern[str]], ...]
+
+
+def _segment_source(segment: str) -> str:
+    """Regex of one path segment: ``*``, ``?`` and ``[...]`` never match a separator."""
+
+    parts: List[str] = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        index += 1
+        if char == "*":
+            parts.append("[^/]*")
+        elif char == "?":
+            parts.append("[^/]")
+        elif char == "[":
+            end = index
+            if end < len(segment) and segment[end] in "!^":
+                end += 1
+            if end < len(segment) and segment[end] == "]":
+                end += 1
+            end = segment.find("]", end)
+            if end == -1:
+                parts.append("\\[")
+                continue
+            body = segment[index:end].replace("\\", "\\\\")
+            if body[:1] in ("!", "^"):
+                body = "^" + body[1:]
+            parts.append(f"[{body}]")
+            index = end + 1
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+def _compile(source: str) -> Pattern[str]:
+    return re.compile(source, re.IGNORECASE if _CASE_INSENSITIVE else 0)
+
+
+def _split_glob(pattern: str) -> List[str]:
+    return [segment for segment in pattern.replace("\\", "/").split("/") if segment not in ("", ".")]
+
+
+def compile_glob(pattern: str) -> _Segments:
+    """Segment by segment form of a glob, to tell whether a directory can contain matches."""
+
+    return tuple(_ANY_DIRECTORIES if segment == "**" else _compile(_segment_source(segment)) for segment in _split_glob(pattern))
+
+
+def glob_regex(pattern: str) -> Pattern[str]:
+    """Single regex matching the relative paths (separated by ``/``) that ``pattern`` selects."""
+
+    segments = _split_glob(pattern)
+    sources = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            sources.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            sources.append(_segment_source(segment) + ("" if last else "/"))
+    return _compile("".join(sources))
+
+
+def _matches(segments: _Segments, parts: Sequence[str], prefix: bool = False, i: int = 0, j: int = 0) -> bool:
+    """Whether ``parts`` matches ``segments``; with ``prefix``, whether a path below ``parts`` could."""
+
+    while i < len(segments):
+        segment = segments[i]
+        if segment is _ANY_DIRECTORIES:
+            if prefix:
+                return True
+            return any(_matches(segments, parts, prefix, i + 1, k) for k in range(j, len(parts) + 1))
+        if j == len(parts):
+            return prefix
+        if not segment.fullmatch(parts[j]):
+            return False
+        i += 1
+        j += 1
+    return j == len(parts) and not prefix
+
+
+@dataclass(frozen=True)
+class FileFilter:
+    """Which files of a directory tree are databases.
+
+    ``include`` globs are relative to the root; ``**`` spans any number of
+    directories (``**/*.db``, ``site_*/**/*.db``).  An ``exclude`` glob
+    without separator is matched against the name of each file and
+    directory (``*-journal``, ``archives``), otherwise against the relative
+    path; an excluded directory is not explored.  Sizes are in bytes.
+    """
+
+    include: Tuple[str, ...] = ("*.db",)
+    exclude: Tuple[str, ...] = ()
+    min_size: Optional[int] = None
+    max_size: Optional[int] = None
+
+    def compile(self) -> "_CompiledFilter":
+        return _CompiledFilter(self)
+
+
+class _CompiledFilter:
+    def __init__(self, file_filter: FileFilter):
+        self.file_filter = file_filter
+        includes = [pattern for pattern in file_filter.include if pattern.strip()]
+        excludes = [pattern.replace("\\", "/") for pattern in file_filter.exclude if pattern.strip()]
+        self.include = [glob_regex(pattern) for pattern in includes]
+        self.include_segments = [compile_glob(pattern) for pattern in includes]
+        self.exclude_names = [_compile(_segment_source(pattern)) for pattern in excludes if "/" not in pattern]
+        self.exclude_paths = [glob_regex(pattern) for pattern in excludes if "/" in pattern]
+        # Sans ``**`` ni dossier dans les motifs, inutile de descendre dans les sous-dossiers.
+        self.recursive = any(
+            len(segments) > 1 or _ANY_DIRECTORIES in segments for segments in self.include_segments
+        )
+
+    def excluded(self, relative: str, name: str) -> bool:
+        if any(regex.fullmatch(name) for regex in self.exclude_names):
+            return True
+        return any(regex.fullmatch(relative) for regex in self.exclude_paths)
+
+    def wants_file(self, relative: str, name: str, size: int) -> bool:
+        if not any(regex.fullmatch(relative) for regex in self.include) or self.excluded(relative, name):
+            return False
+        if self.file_filter.min_size is not None and size < self.file_filter.min_size:
+            return False
+        return self.file_filter.max_size is None or size <= self.file_filter.max_size
+
+    def wants_directory(self, relative: str, name: str) -> bool:
+        if not self.recursive or self.excluded(relative, name):
+            return False
+        parts = relative.split("/")
+        return any(_matches(segments, parts, prefix=True) for segments in self.include_segments)
+
+
+def walk(
+    root: Path,
+    file_filter: FileFilter,
+    on_directory: Optional[Callable[[str, int], None]] = None,
+) -> Iterator[Tuple[str, os.stat_result]]:
+    """Yield ``(path, stat)`` for each database under ``root``, as soon as it is found.
+
+    The tree is read with ``os.scandir`` (no ``stat`` on Windows, where the
+    directory listing already carries it), directory by directory, in name
+    order; a directory's files come before its subdirectories.  Only the
+    directories that an include glob can reach are opened.  ``on_directory``
+    receives every directory read with its modification date (ns).  Paths
+    are strings: building a ``Path`` per file would double the cost of the walk.
+    """
+
+    compiled = file_filter.compile()
+    if not compiled.include:
+        return
+    try:
+        root_stat = root.stat()
+    except OSError:
+        return
+    visited: Set[Tuple[int, int]] = {(root_stat.st_dev, root_stat.st_ino)}
+    # (dossier, chemin relatif suivi de « / », date de modification)
+    stack: List[Tuple[str, str, int]] = [(str(root), "", root_stat.st_mtime_ns)]
+    wants_file = compiled.wants_file
+    while stack:
+        directory, prefix, mtime_ns = stack.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = sorted(iterator, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        if on_directory is not None:
+            on_directory(directory, mtime_ns)
+        subdirectories: List[Tuple[str, str, int]] = []
+        for entry in entries:
+            name = entry.name
+            relative = prefix + name
+            try:
+                if entry.is_dir():
+                    if compiled.wants_directory(relative, name):
+                        stat = entry.stat()
+                        # Les liens symboliques peuvent former une boucle : chaque dossier est lu une fois
+                        # (sous Windows, ``DirEntry.stat`` ne fournit pas d'inode : pas de détection).
+                        identity = (stat.st_dev, stat.st_ino)
+                        if not stat.st_ino or identity not in visited:
+                            visited.add(identity)
+                            subdirectories.append((entry.path, relative + "/", stat.st_mtime_ns))
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            if wants_file(relative, name, stat.st_size):
+                yield entry.path, stat
+        stack.extend(reversed(subdirectories))
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from .paths import app_data_dir
+
+_CHUNK_SIZE = 1024 * 1024
+# Chemins par requête de lecture groupée (limite de paramètres des anciennes versions de SQLite : 999).
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    size: int
+    mtime_ns: int
+    # Vide lorsque le hachage du contenu n'est pas demandé.
+    content_hash: str = ""
+
+    def same_stat(self, other: "Fingerprint") -> bool:
+        return self.size == other.size and self.mtime_ns == other.mtime_ns
+
+
+def stat_fingerprint(path: Path) -> Optional[Fingerprint]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return Fingerprint(stat.st_size, stat.st_mtime_ns)
+
+
+def content_fingerprint(path: Path) -> Optional[Fingerprint]:
+    """Stat fingerprint plus a BLAKE2b digest of the whole file (slow on big files)."""
+
+    fingerprint = stat_fingerprint(path)
+    if fingerprint is None:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return Fingerprint(fingerprint.size, fingerprint.mtime_ns, digest.hexdigest())
+
+
+class FingerprintCache:
+    """Fingerprints of the databases after their last successful run.
+
+    Each entry also stores the signature (jar hash and command arguments) of
+    that run: a database is up to date only when both still match.  The cache
+    is shared by the GUI thread and the hashing threads.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path or app_data_dir() / "fingerprints.sqlite3"
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self._path), timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_SCHEMA)
+        self._connection.commit()
+
+    def lookup(self, database: Path) -> Optional[Tuple[Fingerprint, str]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size, mtime_ns, content_hash, signature FROM fingerprints WHERE path = ?",
+                (str(database),),
+            ).fetchone()
+        if row is None:
+            return None
+        return Fingerprint(row[0], row[1], row[2]), row[3]
+
+    def lookup_many(self, databases: Sequence[Path]) -> Dict[str, Tuple[Fingerprint, str]]:
+        """Entries of many databases at once, by path; the ones without an entry are absent."""
+
+        keys = list(dict.fromkeys(str(database) for database in databases))
+        entries: Dict[str, Tuple[Fingerprint, str]] = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                cursor = self._connection.execute(
+                    "SELECT path, size, mtime_ns, content_hash, signature FROM fingerprints"
+                    f" WHERE path IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for row in cursor:
+                    entries[row[0]] = (Fingerprint(row[1], row[2], row[3]), row[4])
+        return entries
+
+    def store(self, database: Path, fingerprint: Fingerprint, signature: str) -> None:
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO fingerprints (path, size, mtime_ns, content_hash, signature, recorded_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (str(database), fingerprint.size, fingerprint.mtime_ns, fingerprint.content_hash, signature, time.time()),
+            )
+            self._connection.commit()
+
+    def invalidate(self, database: Path) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM fingerprints WHERE path = ?", (str(database),))
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+_CHUNK_SIZE = 1024 * 1024
+
+_cache: Dict[Tuple[str, int, int], str] = {}
+_cache_lock = threading.Lock()
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of ``path``, memoized on (path, size, mtime).
+
+    Returns an empty string when the file cannot be read.
+    """
+
+    try:
+        stat = path.stat()
+    except OSError:
+        return ""
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None:
+        return cached
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    value = digest.hexdigest()
+    with _cache_lock:
+        _cache[key] = value
+    return value
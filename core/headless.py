@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional, TextIO
+
+from PySide6.QtCore import QObject, Signal
+
+from .cds import CdsArchiveCache
+from .checkpoint import CheckpointJournal
+from .fingerprint import FingerprintCache
+from .log_spool import LogSpool
+from .metrics import MetricsRegistry
+from .models import AppSettings, DatabaseTask, ExecutionStatus, LotConfig
+from .orchestrator import Orchestrator
+from .run_history import RunHistoryStore
+
+EXIT_SUCCESS = 0
+EXIT_TASK_FAILURES = 1
+EXIT_STARTUP_ERROR = 2
+EXIT_INTERRUPTED = 130
+
+
+class HeadlessRunner(QObject):
+    """Drive an :class:`Orchestrator` without any widget.
+
+    Each task output is spooled to ``<output_dir>/<lot>/<base>.log`` by a
+    :class:`LogSpool` and a one-line progress report is written to
+    ``console``.  ``finished`` carries the process exit code, once the logs
+    are flushed.
+    """
+
+    finished = Signal(int)
+
+    def __init__(
+        self,
+        output_dir: Path,
+        console: TextIO = sys.stdout,
+        confirm: Optional[Callable[[LotConfig], bool]] = None,
+        history: Optional[RunHistoryStore] = None,
+        journal: Optional[CheckpointJournal] = None,
+        fingerprints: Optional[FingerprintCache] = None,
+        cds: Optional[CdsArchiveCache] = None,
+        spool: Optional[LogSpool] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._output_dir = output_dir
+        self._console = console
+        self._confirm = confirm
+        self._spool = spool or LogSpool(output_dir)
+        self._failures = 0
+        self._interrupted = False
+        self._exit_code: Optional[int] = None
+        self._orchestrator = Orchestrator(self)
+        self._orchestrator.set_run_history(history)
+        self._orchestrator.set_checkpoint_journal(journal)
+        self._orchestrator.set_fingerprint_cache(fingerprints)
+        self._orchestrator.set_cds_cache(cds)
+        self._orchestrator.set_metrics(metrics)
+        self._orchestrator.lot_started.connect(self._on_lot_started)
+        self._orchestrator.lot_finished.connect(self._on_lot_finished)
+        self._orchestrator.lot_skipped.connect(self._on_lot_skipped)
+        self._orchestrator.task_started.connect(self._on_task_started)
+        self._orchestrator.task_output.connect(self._on_task_output)
+        self._orchestrator.task_finished.connect(self._on_task_finished)
+        self._orchestrator.task_error.connect(self._on_task_error)
+        self._orchestrator.task_skipped.connect(self._on_task_skipped)
+        self._orchestrator.all_finished.connect(self._on_all_finished)
+        self._orchestrator.request_lot_confirmation.connect(self._on_request_confirmation)
+        self._orchestrator.startup_error.connect(self._on_startup_error)
+        self._orchestrator.worker_pool().queue_changed.connect(self._on_queue_changed)
+
+    def orchestrator(self) -> Orchestrator:
+        return self._orchestrator
+
+    def start(self, settings: AppSettings, resume: bool = False) -> None:
+        self._orchestrator.start(settings, resume=resume)
+
+    def interrupt(self) -> None:
+        if not self._orchestrator.is_running():
+            return
+        self._interrupted = True
+        self._print("Interruption demandée, arrêt des processus...")
+        self._orchestrator.stop_all()
+
+    def log_path(self, task: DatabaseTask) -> Path:
+        return self._spool.log_path(task)
+
+    def _print(self, message: str) -> None:
+        print(message, file=self._console, flush=True)
+
+    def _on_lot_started(self, lot: LotConfig) -> None:
+        self._print(f"[{lot.name}] lot démarré")
+
+    def _on_lot_finished(self, lot: LotConfig) -> None:
+        self._print(f"[{lot.name}] lot terminé")
+
+    def _on_lot_skipped(self, lot: LotConfig, reason: str) -> None:
+        self._print(f"[{lot.name}] lot ignoré : {reason}")
+
+    def _on_task_started(self, task: DatabaseTask, command: str) -> None:
+        self._spool.start_task(task, command)
+        self._print(f"[{task.lot.name}] {task.display_name()} : démarré")
+
+    def _on_task_output(self, task: DatabaseTask, lines: List[str], is_error: bool) -> None:
+        self._spool.append(task, lines)
+
+    def _on_task_finished(self, task: DatabaseTask, status: ExecutionStatus, exit_code: int) -> None:
+        self._spool.finish_task(task)
+        if status != ExecutionStatus.SUCCEEDED:
+            self._failures += 1
+        self._print(f"[{task.lot.name}] {task.display_name()} : {status.name} (code {exit_code})")
+
+    def _on_task_skipped(self, task: DatabaseTask, reason: str) -> None:
+        self._print(f"[{task.lot.name}] {task.display_name()} : {reason}")
+
+    def _on_task_error(self, task: DatabaseTask, message: str) -> None:
+        self._print(f"[{task.lot.name}] {task.display_name()} : {message}")
+
+    def _on_request_confirmation(self, lot: LotConfig) -> None:
+        if self._confirm and self._confirm(lot):
+            self._orchestrator.continue_to_next_lot()
+        else:
+            self._interrupted = True
+            self._orchestrator.stop_all()
+
+    def _on_startup_error(self, message: str) -> None:
+        self._print(f"Erreur : {message}")
+        self._finish(EXIT_STARTUP_ERROR)
+
+    def _on_all_finished(self) -> None:
+        if self._interrupted:
+            code = EXIT_INTERRUPTED
+        elif self._failures:
+            code = EXIT_TASK_FAILURES
+        else:
+            code = EXIT_SUCCESS
+        self._print(f"Orchestration terminée : {self._failures} échec(s), journaux dans {self._output_dir}")
+        # Après un arrêt, attendre que les processus interrompus soient sortis.
+        if self._orchestrator.worker_pool().running_count() == 0:
+            self._finish(code)
+        else:
+            self._exit_code = code
+
+    def _on_queue_changed(self, running: int, _queued: int) -> None:
+        if running == 0 and self._exit_code is not None:
+            code, self._exit_code = self._exit_code, None
+            self._finish(code)
+
+    def _finish(self, code: int) -> None:
+        self._spool.close()
+        self.finished.emit(code)
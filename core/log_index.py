@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import queue
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from .models import DatabaseTask
+from .paths import app_data_dir
+
+# Exécutions conservées dans l'index ; les plus anciennes sont purgées.
+DEFAULT_INDEXED_RUNS = 10
+DEFAULT_SEARCH_LIMIT = 500
+DEFAULT_CONTEXT_LINES = 2
+# Taille minimale d'un littéral exploitable par l'index trigramme.
+_TRIGRAM = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_logs (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    lot TEXT NOT NULL,
+    database TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    log_path TEXT
+);
+CREATE TABLE IF NOT EXISTS log_lines (
+    id INTEGER PRIMARY KEY,
+    task_id INTEGER NOT NULL REFERENCES task_logs(id),
+    line INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_log_lines_task ON log_lines(task_id, line);
+CREATE INDEX IF NOT EXISTS idx_task_logs_run ON task_logs(run_id);
+"""
+
+# Index plein texte adossé à log_lines (les lignes ne sont stockées qu'une fois).  Sans
+# positions (detail=none), il est deux fois plus petit et plus rapide à remplir ; les
+# candidats qu'il renvoie sont vérifiés ligne à ligne.
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS log_lines_fts USING fts5(
+    text, content='log_lines', content_rowid='id', tokenize='trigram', detail=none, columnsize=0
+);
+CREATE TRIGGER IF NOT EXISTS log_lines_ad AFTER DELETE ON log_lines BEGIN
+    INSERT INTO log_lines_fts(log_lines_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+
+@dataclass
+class LogMatch:
+    run_id: str
+    started_at: float
+    lot: str
+    database: str
+    line: int
+    text: str
+    log_path: Optional[Path] = None
+    before: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+
+
+def _trigram_supported(connection: sqlite3.Connection) -> bool:
+    """Whether this SQLite build has FTS5 and its trigram tokenizer (SQLite 3.34+)."""
+
+    try:
+        connection.execute("CREATE VIRTUAL TABLE temp.fts_probe USING fts5(text, tokenize='trigram')")
+        connection.execute("DROP TABLE temp.fts_probe")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def _trigram_query(literal: str) -> str:
+    """FTS5 query selecting the lines containing every trigram of ``literal``."""
+
+    trigrams = dict.fromkeys(literal[index : index + _TRIGRAM] for index in range(len(literal) - _TRIGRAM + 1))
+    return " AND ".join('"' + trigram.replace('"', '""') + '"' for trigram in trigrams)
+
+
+def required_literal(pattern: str) -> Optional[str]:
+    """Longest literal that every match of the regular expression ``pattern`` contains.
+
+    Deliberately conservative: alternations and anything unusual give
+    ``None`` and the search falls back to scanning every line.
+    """
+
+    pattern = re.sub(r"^\(\?[aiLmsux]+\)", "", pattern)
+    if "|" in pattern or "(?" in pattern:
+        return None
+    runs: List[str] = []
+    current: List[str] = []
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        index += 1
+        if char == "\\" and index < len(pattern):
+            escaped = pattern[index]
+            index += 1
+            if escaped.isalnum() or depth:
+                # Classe (\d, \w...), référence ou contenu d'un groupe : fin du littéral.
+                runs.append("".join(current))
+                current = []
+            else:
+                current.append(escaped)
+        elif char in "*?{":
+            # Le caractère précédent est facultatif ou répété : il ne fait pas partie du littéral.
+            if current:
+                current.pop()
+            runs.append("".join(current))
+            current = []
+            if char == "{":
+                closing = pattern.find("}", index)
+                index = len(pattern) if closing == -1 else closing + 1
+        elif char == "[":
+            runs.append("".join(current))
+            current = []
+            # Un « ] » en tête de classe ou échappé en fait partie.
+            if pattern.startswith("^", index):
+                index += 1
+            if pattern.startswith("]", index):
+                index += 1
+            while index < len(pattern) and pattern[index] != "]":
+                index += 2 if pattern[index] == "\\" else 1
+            index += 1
+        elif char in "()":
+            # Un groupe peut être facultatif : seuls les littéraux hors groupe sont sûrs.
+            depth += 1 if char == "(" else -1
+            runs.append("".join(current))
+            current = []
+        elif char in ".^$+]" or depth:
+            runs.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    runs.append("".join(current))
+    best = max(runs, key=len)
+    return best or None
+
+
+class LogIndex:
+    """Searchable index of the task logs of the current and recent runs.
+
+    Lines are queued by the caller and inserted by a background thread into
+    SQLite, with an FTS5 trigram index so that substring searches over
+    millions of lines only read the matching rows.  Regular expressions are
+    pre-filtered on their longest required literal then checked in Python.
+    Without FTS5 the search scans the stored lines.
+    """
+
+    def __init__(self, path: Optional[Path] = None, keep_runs: int = DEFAULT_INDEXED_RUNS):
+        self._path = path or app_data_dir() / "log_index.sqlite3"
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._keep_runs = keep_runs
+        self._queue: "queue.Queue[Optional[Callable[[sqlite3.Connection], None]]]" = queue.Queue()
+        self._local = threading.local()
+        # Utilisé uniquement par le thread d'écriture : (exécution, tâche) -> (identifiant, prochaine ligne).
+        self._tasks: Dict[Tuple[str, str], List[int]] = {}
+        self._last_run = ""
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        self._full_text = _trigram_supported(connection)
+        if self._full_text:
+            connection.executescript(_FTS_SCHEMA)
+        connection.commit()
+        self._writer = threading.Thread(target=self._write_loop, name="log-index-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def full_text(self) -> bool:
+        return self._full_text
+
+    # --- Écriture (asynchrone) ---
+    def start_task(self, run_id: str, task: DatabaseTask, command: str, log_path: Optional[Path] = None) -> None:
+        """Register ``task``; its command is line 1, as in the spooled log file."""
+
+        key = (run_id, task.id())
+        row = (run_id, task.lot.name, str(task.database), time.time(), str(log_path) if log_path else None)
+
+        def write(connection: sqlite3.Connection) -> None:
+            if run_id != self._last_run:
+                self._last_run = run_id
+                self._prune(connection)
+            cursor = connection.execute(
+                "INSERT INTO task_logs (run_id, lot, database, started_at, log_path) VALUES (?, ?, ?, ?, ?)",
+                row,
+            )
+            task_id = int(cursor.lastrowid)
+            self._insert_lines(connection, [(task_id, 1, f"$ {command}")])
+            self._tasks[key] = [task_id, 2]
+
+        self._queue.put(write)
+
+    def append(self, run_id: str, task: DatabaseTask, lines: List[str]) -> None:
+        if not lines:
+            return
+        key = (run_id, task.id())
+
+        def write(connection: sqlite3.Connection) -> None:
+            state = self._tasks.get(key)
+            if state is None:
+                return
+            task_id, first = state
+            self._insert_lines(connection, [(task_id, first + offset, line) for offset, line in enumerate(lines)])
+            state[1] = first + len(lines)
+
+        self._queue.put(write)
+
+    def finish_task(self, run_id: str, task: DatabaseTask) -> None:
+        key = (run_id, task.id())
+        self._queue.put(lambda _connection: self._tasks.pop(key, None))
+
+    def flush(self) -> None:
+        """Block until every queued line is searchable."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    # --- Lecture ---
+    def search(
+        self,
+        query: str,
+        regex: bool = False,
+        run_id: Optional[str] = None,
+        limit: int = DEFAULT_SEARCH_LIMIT,
+        context: int = DEFAULT_CONTEXT_LINES,
+    ) -> List[LogMatch]:
+        """The ``limit`` most recent lines matching ``query`` (case-insensitive).
+
+        Results are grouped by task, most recent tasks first.
+
+        Raises :class:`re.error` for an invalid regular expression.
+        """
+
+        if not query:
+            return []
+        if regex:
+            matcher = re.compile(query, re.IGNORECASE)
+            literal = required_literal(query)
+        else:
+            lowered = query.lower()
+            matcher = None
+            literal = query
+        connection = self._connect()
+        sql = (
+            "SELECT l.task_id, l.line, l.text, t.run_id, t.started_at, t.lot, t.database, t.log_path"
+            " FROM log_lines AS l JOIN task_logs AS t ON t.id = l.task_id"
+        )
+        conditions: List[str] = []
+        parameters: List[object] = []
+        if literal and self._full_text and len(literal) >= _TRIGRAM:
+            sql = sql.replace("FROM log_lines AS l", "FROM log_lines_fts AS f JOIN log_lines AS l ON l.id = f.rowid")
+            conditions.append("log_lines_fts MATCH ?")
+            parameters.append(_trigram_query(literal))
+            order = " ORDER BY f.rowid DESC"
+        else:
+            order = " ORDER BY l.id DESC"
+            if literal and literal.isascii():
+                # lower() de SQLite ne connaît que l'ASCII : sinon, seul le filtre Python s'applique.
+                conditions.append("instr(lower(l.text), ?) > 0")
+                parameters.append(literal.lower())
+        if run_id:
+            conditions.append("t.run_id = ?")
+            parameters.append(run_id)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        # Parcours des lignes les plus récentes d'abord, sans tri : la recherche s'arrête à ``limit``.
+        sql += order
+
+        matches: List[LogMatch] = []
+        for row in connection.execute(sql, parameters):
+            text = row["text"]
+            if matcher is not None:
+                if not matcher.search(text):
+                    continue
+            elif lowered not in text.lower():
+                continue
+            matches.append(
+                LogMatch(
+                    run_id=row["run_id"],
+                    started_at=row["started_at"],
+                    lot=row["lot"],
+                    database=row["database"],
+                    line=row["line"],
+                    text=text,
+                    log_path=Path(row["log_path"]) if row["log_path"] else None,
+                )
+            )
+            if context:
+                matches[-1].before, matches[-1].after = self._context(connection, row["task_id"], row["line"], context)
+            if len(matches) >= limit:
+                break
+        matches.sort(key=lambda match: (-match.started_at, match.lot, match.database, match.line))
+        return matches
+
+    def _context(
+        self, connection: sqlite3.Connection, task_id: int, line: int, context: int
+    ) -> Tuple[List[str], List[str]]:
+        cursor = connection.execute(
+            "SELECT line, text FROM log_lines WHERE task_id = ? AND line BETWEEN ? AND ? ORDER BY line",
+            (task_id, line - context, line + context),
+        )
+        before: List[str] = []
+        after: List[str] = []
+        for number, text in cursor.fetchall():
+            if number < line:
+                before.append(text)
+            elif number > line:
+                after.append(text)
+        return before, after
+
+    # --- Interne ---
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self._path), timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _insert_lines(self, connection: sqlite3.Connection, rows: List[Tuple[int, int, str]]) -> None:
+        last_id = connection.execute("SELECT COALESCE(MAX(id), 0) FROM log_lines").fetchone()[0]
+        connection.executemany("INSERT INTO log_lines (task_id, line, text) VALUES (?, ?, ?)", rows)
+        if self._full_text:
+            # Indexer le lot en une requête plutôt que par un déclencheur ligne à ligne.
+            connection.execute(
+                "INSERT INTO log_lines_fts (rowid, text) SELECT id, text FROM log_lines WHERE id > ?", (last_id,)
+            )
+
+    def _prune(self, connection: sqlite3.Connection) -> None:
+        """Drop the runs beyond the ``keep_runs`` most recent ones (a new run is about to start)."""
+
+        stale = [
+            row[0]
+            for row in connection.execute(
+                "SELECT run_id FROM task_logs GROUP BY run_id ORDER BY MAX(started_at) DESC LIMIT -1 OFFSET ?",
+                (max(0, self._keep_runs - 1),),
+            )
+        ]
+        for run_id in stale:
+            connection.execute(
+                "DELETE FROM log_lines WHERE task_id IN (SELECT id FROM task_logs WHERE run_id = ?)", (run_id,)
+            )
+            connection.execute("DELETE FROM task_logs WHERE run_id = ?", (run_id,))
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Regrouper les écritures déjà en attente dans la même transaction.
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for operation in batch:
+                if operation is None:
+                    stopping = True
+                    continue
+                try:
+                    operation(connection)
+                except (sqlite3.Error, OSError):
+                    pass
+            try:
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+            for _ in batch:
+                self._queue.task_done()
+        connection.close()
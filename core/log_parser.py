@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Pattern, Protocol, Tuple
+
+from PySide6.QtCore import QCoreApplication, QObject, QThread, Signal, Slot
+
+from .diagnostics import timed
+from .models import DatabaseTask
+
+LEVELS = ("TRACE", "DEBUG", "INFO", "WARN", "ERROR", "FATAL")
+# Niveaux mis en évidence dans l'interface.
+ALERT_LEVELS = ("WARN", "ERROR", "FATAL")
+# Repérage de l'avancement lorsque le lot n'a pas de motif propre : groupes ``done`` et ``total``.
+DEFAULT_PROGRESS_PATTERNS = (
+    r"(?i)rows migrated:\s*(?P<done>\d+)\s*/\s*(?P<total>\d+)",
+    r"(?i)\bprogress(?:ion)?\s*:?\s*(?P<done>\d+)\s*/\s*(?P<total>\d+)",
+)
+# Exceptions conservées par tâche (première ligne de chacune).
+MAX_EXCEPTIONS = 20
+
+# Format console par défaut de Spring Boot 2 et 3 (logback ou log4j2) :
+# 2024-05-02 10:15:30.123  INFO 4242 --- [main] c.e.Application : Started Application
+# 2024-05-02T10:15:30.123+02:00  WARN 4242 --- [app] [main] c.e.Application : message
+_SPRING_LINE = re.compile(
+    r"^(?P<timestamp>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d{1,9})?(?:Z|[+-]\d{2}:?\d{2})?)\s+"
+    r"(?P<level>TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL)\s+"
+    r"(?:\d+\s+---\s+)?(?:\[[^\]]*\]\s+)*"
+    r"(?P<logger>\S+?)\s*:\s(?P<message>.*)$"
+)
+# Lignes sans horodatage : « WARN message », « [ERROR] message ».
+_BARE_LEVEL = re.compile(r"^\[?(?P<level>TRACE|DEBUG|INFO|WARN|WARNING|ERROR|FATAL)\]?[\s:]\s*(?P<message>.*)$")
+_EXCEPTION_START = re.compile(
+    r"^(?:Caused by: |Exception in thread \"[^\"]*\" )?"
+    r"(?P<exception>(?:[A-Za-z_$][\w$]*\.)+[\w$]*(?:Exception|Error|Throwable))(?::\s?.*)?$"
+)
+
+
+@dataclass
+class LogRecord:
+    """Header of a log event: a line that carries its own level."""
+
+    level: str
+    message: str
+    logger: str = ""
+    timestamp: str = ""
+
+
+class LogLineParser(Protocol):
+    def parse(self, line: str) -> Optional[LogRecord]:
+        """Structured header of ``line``, ``None`` for a continuation or free text line."""
+
+
+class SpringBootLineParser:
+    """Recognises the default console layout of Spring Boot applications."""
+
+    def parse(self, line: str) -> Optional[LogRecord]:
+        # Les en-têtes commencent par un chiffre ou un niveau : écarter le reste sans regex.
+        if not line or not (line[0].isdigit() or line[0] in "TDIWEF["):
+            return None
+        match = _SPRING_LINE.match(line)
+        if match:
+            return LogRecord(
+                level=_normalise_level(match.group("level")),
+                message=match.group("message"),
+                logger=match.group("logger"),
+                timestamp=match.group("timestamp"),
+            )
+        match = _BARE_LEVEL.match(line)
+        if match:
+            return LogRecord(level=_normalise_level(match.group("level")), message=match.group("message"))
+        return None
+
+
+def _normalise_level(level: str) -> str:
+    return "WARN" if level == "WARNING" else level
+
+
+def compile_progress_patterns(patterns: List[str]) -> List[Pattern[str]]:
+    """Compile the valid patterns having ``done`` and ``total`` groups; the others are ignored."""
+
+    compiled: List[Pattern[str]] = []
+    for pattern in patterns:
+        try:
+            regex = re.compile(pattern)
+        except re.error:
+            continue
+        if {"done", "total"} <= set(regex.groupindex):
+            compiled.append(regex)
+    return compiled
+
+
+@dataclass
+class ParsedOutput:
+    """Lines of one output batch of a task, with what the parser found in them."""
+
+    task: DatabaseTask
+    lines: List[str]
+    is_error: bool
+    # Niveau de chaque ligne ; les lignes de suite (pile d'appels) héritent de celui de leur en-tête.
+    levels: List[Optional[str]]
+    # Nombre d'événements par niveau dans ce lot de lignes, et depuis le début de la tâche.
+    counts: Dict[str, int] = field(default_factory=dict)
+    totals: Dict[str, int] = field(default_factory=dict)
+    # Dernier avancement lu (fait, total), ``None`` si aucun dans ce lot.
+    progress: Optional[Tuple[int, int]] = None
+    exceptions: List[str] = field(default_factory=list)
+    last_timestamp: str = ""
+
+
+@dataclass
+class _TaskState:
+    level: Optional[str] = None
+    totals: Dict[str, int] = field(default_factory=dict)
+    exceptions: int = 0
+
+
+class LogParserWorker(QObject):
+    """Parses the output batches of the tasks; lives in the parser thread."""
+
+    parsed = Signal(object)
+
+    def __init__(self, line_parser: LogLineParser):
+        super().__init__()
+        self._line_parser = line_parser
+        self._states: Dict[str, _TaskState] = {}
+        self._progress_patterns: Dict[str, List[Pattern[str]]] = {}
+
+    @Slot(object, list, bool)
+    @timed
+    def parse(self, task: DatabaseTask, lines: List[str], is_error: bool) -> None:
+        state = self._states.setdefault(task.id(), _TaskState())
+        patterns = self._patterns_for(task)
+        result = ParsedOutput(task, lines, is_error, [])
+        parse_line = self._line_parser.parse
+        for line in lines:
+            record = parse_line(line)
+            if record is not None:
+                state.level = record.level
+                result.counts[record.level] = result.counts.get(record.level, 0) + 1
+                if record.timestamp:
+                    result.last_timestamp = record.timestamp
+                text = record.message
+            else:
+                text = line
+            result.levels.append(state.level)
+            for pattern in patterns:
+                match = pattern.search(text)
+                if match:
+                    result.progress = (int(match.group("done")), int(match.group("total")))
+                    break
+            if ("Exception" in line or "Error" in line or "Throwable" in line) and state.exceptions < MAX_EXCEPTIONS:
+                match = _EXCEPTION_START.match(line)
+                if match:
+                    state.exceptions += 1
+                    result.exceptions.append(line)
+        for level, count in result.counts.items():
+            state.totals[level] = state.totals.get(level, 0) + count
+        result.totals = dict(state.totals)
+        self.parsed.emit(result)
+
+    @Slot(object)
+    def forget(self, task: DatabaseTask) -> None:
+        self._states.pop(task.id(), None)
+
+    @Slot()
+    def reset(self) -> None:
+        self._states.clear()
+        self._progress_patterns.clear()
+
+    def _patterns_for(self, task: DatabaseTask) -> List[Pattern[str]]:
+        patterns = self._progress_patterns.get(task.lot.name)
+        if patterns is None:
+            patterns = compile_progress_patterns(task.lot.progress_patterns or list(DEFAULT_PROGRESS_PATTERNS))
+            self._progress_patterns[task.lot.name] = patterns
+        return patterns
+
+
+class LogParsingService(QObject):
+    """Streaming parser stage between the process output and the views.
+
+    Batches submitted from the GUI thread are parsed in a dedicated thread
+    with precompiled patterns and come back, in order, through ``parsed``
+    (:class:`ParsedOutput`).  The line parser is pluggable: any object with
+    a ``parse(line) -> Optional[LogRecord]`` method.
+    """
+
+    parsed = Signal(object)
+    _submitted = Signal(object, list, bool)
+    _forgotten = Signal(object)
+    _reset_requested = Signal()
+
+    def __init__(
+        self,
+        line_parser_factory: Callable[[], LogLineParser] = SpringBootLineParser,
+        parent: Optional[QObject] = None,
+    ):
+        super().__init__(parent)
+        self._thread = QThread()
+        self._thread.setObjectName("log-parser")
+        self._worker = LogParserWorker(line_parser_factory())
+        self._worker.moveToThread(self._thread)
+        self._submitted.connect(self._worker.parse)
+        self._forgotten.connect(self._worker.forget)
+        self._reset_requested.connect(self._worker.reset)
+        self._worker.parsed.connect(self.parsed)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def submit(self, task: DatabaseTask, lines: List[str], is_error: bool) -> None:
+        if lines:
+            self._submitted.emit(task, lines, is_error)
+
+    def forget(self, task: DatabaseTask) -> None:
+        """Drop the state of a finished task (after its pending batches)."""
+        self._forgotten.emit(task)
+
+    def reset(self) -> None:
+        """New run: forget every task and recompile the progress patterns of the lots."""
+        self._reset_requested.emit()
+
+    def stop(self) -> None:
+        if self._thread.isRunning():
+            self._thread.quit()
+            self._thread.wait()
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+import queue
+import re
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, IO, List, Optional
+
+from .models import DatabaseTask
+from .paths import app_data_dir
+
+DEFAULT_MAX_LOG_BYTES = 256 * 1024 * 1024
+DEFAULT_LOG_BACKUPS = 5
+
+
+def safe_file_name(name: str) -> str:
+    cleaned = re.sub(r"[^\w.\-]+", "_", name).strip("._")
+    return cleaned or "lot"
+
+
+def task_log_path(run_dir: Path, task: DatabaseTask) -> Path:
+    """Log file of ``task``: unique per database, even for homonyms in different directories.
+
+    A database under the lot directory keeps its relative path
+    (``<lot>/<sous-dossier>/<base>.log``); any other one (liste ``files``)
+    gets a short hash of its full path after its name.
+    """
+
+    lot_dir = run_dir / safe_file_name(task.lot.name)
+    if task.lot.databases_path:
+        try:
+            relative = task.database.relative_to(Path(task.lot.databases_path).expanduser())
+        except ValueError:
+            relative = None
+        if relative is not None and relative.parts:
+            return lot_dir / relative.parent / f"{relative.name}.log"
+    digest = hashlib.blake2b(str(task.database).encode("utf-8"), digest_size=4).hexdigest()
+    return lot_dir / f"{task.display_name()}-{digest}.log"
+
+
+def new_run_directory(run_id: str = "") -> Path:
+    """Directory of the logs of a new run in the application data directory."""
+
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    suffix = f"-{run_id[:8]}" if run_id else ""
+    return app_data_dir() / "runs" / f"{stamp}{suffix}"
+
+
+class LogSpool:
+    """Complete task logs written to disk by a background thread.
+
+    Each task gets ``<run_dir>/<lot>/<database>.log`` (see
+    :func:`task_log_path`) holding its command line followed by its stdout
+    and stderr lines in arrival order.  When a file exceeds ``max_bytes``
+    it is rotated to ``.log.1`` (``.log.1.gz`` with ``compress``), keeping
+    ``backups`` rotated segments; the ``.log`` file always holds the most
+    recent output.  Callers only enqueue: no disk access happens on their
+    thread.
+    """
+
+    def __init__(
+        self,
+        run_dir: Path,
+        max_bytes: int = DEFAULT_MAX_LOG_BYTES,
+        backups: int = DEFAULT_LOG_BACKUPS,
+        compress: bool = False,
+    ):
+        self._run_dir = run_dir
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._compress = compress
+        self._queue: "queue.Queue[Optional[Callable[[], None]]]" = queue.Queue()
+        # Utilisés uniquement par le thread d'écriture.
+        self._handles: Dict[str, IO[bytes]] = {}
+        self._sizes: Dict[str, int] = {}
+        self._writer = threading.Thread(target=self._write_loop, name="log-spool-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def run_dir(self) -> Path:
+        return self._run_dir
+
+    def log_path(self, task: DatabaseTask) -> Path:
+        return task_log_path(self._run_dir, task)
+
+    def start_task(self, task: DatabaseTask, command: str) -> None:
+        path = self.log_path(task)
+        key = task.id()
+        self._queue.put(lambda: self._open(key, path, f"$ {command}\n"))
+
+    def append(self, task: DatabaseTask, lines: List[str]) -> None:
+        if not lines:
+            return
+        data = ("\n".join(lines) + "\n").encode("utf-8", errors="replace")
+        path = self.log_path(task)
+        key = task.id()
+        self._queue.put(lambda: self._write(key, path, data))
+
+    def finish_task(self, task: DatabaseTask) -> None:
+        key = task.id()
+        self._queue.put(lambda: self._close(key))
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    # --- Thread d'écriture ---
+    def _write_loop(self) -> None:
+        while True:
+            operation = self._queue.get()
+            try:
+                if operation is None:
+                    for key in list(self._handles):
+                        self._close(key)
+                    return
+                try:
+                    operation()
+                except OSError:
+                    pass
+            finally:
+                self._queue.task_done()
+
+    def _open(self, key: str, path: Path, header: str) -> None:
+        self._close(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        handle = path.open("wb")
+        data = header.encode("utf-8", errors="replace")
+        handle.write(data)
+        self._handles[key] = handle
+        self._sizes[key] = len(data)
+
+    def _write(self, key: str, path: Path, data: bytes) -> None:
+        handle = self._handles.get(key)
+        if handle is None:
+            # Sortie reçue sans démarrage (tâche déjà fermée) : compléter le fichier.
+            path.parent.mkdir(parents=True, exist_ok=True)
+            handle = path.open("ab")
+            self._handles[key] = handle
+            self._sizes[key] = path.stat().st_size
+        if self._max_bytes > 0 and self._sizes[key] + len(data) > self._max_bytes and self._sizes[key] > 0:
+            handle = self._rotate(key, path)
+        handle.write(data)
+        self._sizes[key] += len(data)
+
+    def _rotate(self, key: str, path: Path) -> IO[bytes]:
+        self._handles.pop(key).close()
+        suffix = ".gz" if self._compress else ""
+        oldest = path.with_name(f"{path.name}.{self._backups}{suffix}")
+        if self._backups > 0:
+            oldest.unlink(missing_ok=True)
+            for index in range(self._backups - 1, 0, -1):
+                source = path.with_name(f"{path.name}.{index}{suffix}")
+                if source.exists():
+                    os.replace(source, path.with_name(f"{path.name}.{index + 1}{suffix}"))
+            rotated = path.with_name(f"{path.name}.1")
+            os.replace(path, rotated)
+            if self._compress:
+                with rotated.open("rb") as source, gzip.open(f"{rotated}.gz", "wb") as target:
+                    shutil.copyfileobj(source, target)
+                rotated.unlink()
+        handle = path.open("wb")
+        self._handles[key] = handle
+        self._sizes[key] = 0
+        return handle
+
+    def _close(self, key: str) -> None:
+        handle = self._handles.pop(key, None)
+        self._sizes.pop(key, None)
+        if handle is not None:
+            handle.close()
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import ExecutionStatus
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_TEXTFILE_INTERVAL_S = 15.0
+# Bornes (secondes) de l'histogramme des durées : de la base vide au traitement de plusieurs heures.
+DURATION_BUCKETS: Tuple[float, ...] = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 7200, 14400)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_PREFIX = "cli_orchestrator"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels: str) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Histogram:
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = bounds
+        # Effectif de chaque intervalle (non cumulé), le dernier pour +Inf.
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """Counters and gauges of the orchestration, exposed in the OpenMetrics text format.
+
+    The orchestrator updates the values as its events happen (a dictionary
+    entry each), under a lock; :meth:`render` only formats them, so a scrape
+    from the HTTP or textfile thread never waits for the GUI thread.  The
+    ``*_total`` counters and the duration histogram accumulate over the life
+    of the process, the other gauges describe the current run.
+    """
+
+    def __init__(self, duration_buckets: Tuple[float, ...] = DURATION_BUCKETS):
+        self._lock = threading.Lock()
+        self._buckets = tuple(sorted(duration_buckets))
+        # Exécution en cours.
+        self._run_statuses: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._rss: Dict[str, int] = {}
+        self._queued_runners = 0
+        self._queued_tasks = 0
+        self._active_processes = 0
+        self._runs_started = 0
+        # Depuis le démarrage du processus.
+        self._finished: Dict[Tuple[str, str], int] = {}
+        self._skipped: Dict[str, int] = {}
+        self._output_bytes: Dict[str, int] = {}
+        self._durations: Dict[str, _Histogram] = {}
+
+    def begin_run(self) -> None:
+        with self._lock:
+            self._run_statuses.clear()
+            self._running.clear()
+            self._rss.clear()
+            self._runs_started += 1
+
+    def task_started(self, lot: str) -> None:
+        with self._lock:
+            self._running[lot] = self._running.get(lot, 0) + 1
+
+    def task_finished(self, lot: str, status: ExecutionStatus, duration: Optional[float]) -> None:
+        """Count a finished task; ``duration`` is ``None`` for a task stopped before its start."""
+
+        with self._lock:
+            if duration is not None:
+                running = self._running.get(lot, 0) - 1
+                self._running[lot] = max(0, running)
+                if running <= 0:
+                    self._rss.pop(lot, None)
+                histogram = self._durations.get(status.name)
+                if histogram is None:
+                    histogram = self._durations[status.name] = _Histogram(self._buckets)
+                histogram.observe(duration)
+            self._run_statuses[status.name] = self._run_statuses.get(status.name, 0) + 1
+            key = (lot, status.name)
+            self._finished[key] = self._finished.get(key, 0) + 1
+
+    def task_skipped(self, lot: str) -> None:
+        with self._lock:
+            self._skipped[lot] = self._skipped.get(lot, 0) + 1
+
+    def add_output(self, lot: str, size: int) -> None:
+        with self._lock:
+            self._output_bytes[lot] = self._output_bytes.get(lot, 0) + size
+
+    def set_rss(self, rss_by_lot: Dict[str, int]) -> None:
+        """Resident memory of the processes of each lot, from the last sample."""
+
+        with self._lock:
+            self._rss = {lot: rss for lot, rss in rss_by_lot.items() if self._running.get(lot)}
+
+    def set_queue(self, active_processes: int, queued_runners: int, queued_tasks: int) -> None:
+        with self._lock:
+            self._active_processes = active_processes
+            self._queued_runners = queued_runners
+            self._queued_tasks = queued_tasks
+
+    def render(self, openmetrics: bool = True) -> str:
+        """Exposition text; without ``openmetrics``, the Prometheus 0.0.4 text format (no ``# EOF``)."""
+
+        with self._lock:
+            lines: List[str] = []
+            running_total = sum(self._running.values())
+            statuses = {status.name: 0 for status in ExecutionStatus}
+            statuses.update(self._run_statuses)
+            statuses[ExecutionStatus.PENDING.name] = self._queued_tasks
+            statuses[ExecutionStatus.RUNNING.name] = running_total
+            self._gauge(lines, "tasks", "Tasks of the current run by status.", (
+                (_labels(status=status), count) for status, count in statuses.items()
+            ), openmetrics)
+            self._gauge(lines, "running_tasks", "Running tasks by lot.", (
+                (_labels(lot=lot), count) for lot, count in sorted(self._running.items())
+            ), openmetrics)
+            self._gauge(lines, "queued_tasks", "Tasks waiting in the worker pool queue.", [("", self._queued_tasks)], openmetrics)
+            self._gauge(lines, "queued_processes", "Processes waiting in the worker pool queue.", [("", self._queued_runners)], openmetrics)
+            self._gauge(lines, "active_processes", "Processes started by the worker pool.", [("", self._active_processes)], openmetrics)
+            self._gauge(lines, "process_rss_bytes", "Resident memory of the running processes by lot.", (
+                (_labels(lot=lot), rss) for lot, rss in sorted(self._rss.items())
+            ), openmetrics, unit="bytes")
+            self._counter(lines, "runs", "Runs started.", [("", self._runs_started)], openmetrics)
+            self._counter(lines, "tasks_finished", "Finished tasks by lot and status.", (
+                (_labels(lot=lot, status=status), count) for (lot, status), count in sorted(self._finished.items())
+            ), openmetrics)
+            self._counter(lines, "tasks_skipped", "Skipped tasks (resumed or unchanged) by lot.", (
+                (_labels(lot=lot), count) for lot, count in sorted(self._skipped.items())
+            ), openmetrics)
+            self._counter(lines, "task_output_bytes", "Bytes of task output by lot.", (
+                (_labels(lot=lot), size) for lot, size in sorted(self._output_bytes.items())
+            ), openmetrics, unit="bytes")
+            self._histogram(lines, openmetrics)
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines: List[str], name: str, kind: str, help_text: str, unit: str, openmetrics: bool) -> None:
+        lines.append(f"# TYPE {name} {kind}")
+        if unit and openmetrics:
+            lines.append(f"# UNIT {name} {unit}")
+        lines.append(f"# HELP {name} {help_text}")
+
+    def _gauge(
+        self,
+        lines: List[str],
+        name: str,
+        help_text: str,
+        samples: Iterable[Tuple[str, float]],
+        openmetrics: bool,
+        unit: str = "",
+    ) -> None:
+        name = f"{_PREFIX}_{name}"
+        self._header(lines, name, "gauge", help_text, unit, openmetrics)
+        lines.extend(f"{name}{labels} {_number(value)}" for labels, value in samples)
+
+    def _counter(
+        self,
+        lines: List[str],
+        name: str,
+        help_text: str,
+        samples: Iterable[Tuple[str, float]],
+        openmetrics: bool,
+        unit: str = "",
+    ) -> None:
+        name = f"{_PREFIX}_{name}"
+        # OpenMetrics déclare la famille sans suffixe ; le format Prometheus, l'échantillon lui-même.
+        self._header(lines, name if openmetrics else f"{name}_total", "counter", help_text, unit, openmetrics)
+        lines.extend(f"{name}_total{labels} {_number(value)}" for labels, value in samples)
+
+    def _histogram(self, lines: List[str], openmetrics: bool) -> None:
+        name = f"{_PREFIX}_task_duration_seconds"
+        self._header(lines, name, "histogram", "Duration of the finished tasks by status.", "seconds", openmetrics)
+        for status, histogram in sorted(self._durations.items()):
+            cumulated = 0
+            for bound, count in zip((*histogram.bounds, float("inf")), histogram.counts):
+                cumulated += count
+                # Bornes écrites en flottants (« 1.0 ») comme l'exige OpenMetrics.
+                le = "+Inf" if bound == float("inf") else repr(float(bound))
+                lines.append(f"{name}_bucket{_labels(status=status, le=le)} {cumulated}")
+            lines.append(f"{name}_count{_labels(status=status)} {cumulated}")
+            lines.append(f"{name}_sum{_labels(status=status)} {_number(histogram.sum)}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry
+
+    def do_GET(self) -> None:  # noqa: N802 (nom imposé par BaseHTTPRequestHandler)
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+        body = self.server.registry.render(openmetrics).encode("utf-8")  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        # Une ligne par collecte sur stderr serait du bruit.
+        return
+
+
+class MetricsServer:
+    """Serves a :class:`MetricsRegistry` on ``http://<host>:<port>/metrics`` from a background thread.
+
+    Listens on the loopback interface by default: the endpoint has no
+    authentication.  ``port`` 0 picks a free port (see :meth:`address`).
+    """
+
+    def __init__(self, registry: MetricsRegistry, port: int, host: str = DEFAULT_METRICS_HOST):
+        self._server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self._server.daemon_threads = True
+        self._server.registry = registry  # type: ignore[attr-defined]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+
+    def address(self) -> Tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return str(host), int(port)
+
+    def close(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=5)
+
+
+class MetricsTextfileWriter:
+    """Writes a :class:`MetricsRegistry` to ``path`` every ``interval`` seconds, for a textfile collector.
+
+    The file (Prometheus text format, as node_exporter expects) is replaced
+    atomically so that a collector never reads it half written; a last
+    write happens on :meth:`close`.
+    """
+
+    def __init__(self, registry: MetricsRegistry, path: Path, interval: float = DEFAULT_TEXTFILE_INTERVAL_S):
+        self._registry = registry
+        self._path = path
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._write_loop, name="metrics-textfile", daemon=True)
+        self._thread.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def write(self) -> None:
+        temporary = self._path.with_name(f".{self._path.name}.{os.getpid()}.tmp")
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temporary.write_text(self._registry.render(openmetrics=False), encoding="utf-8")
+            os.replace(temporary, self._path)
+        except OSError:
+            # Dossier du collecteur indisponible : la prochaine écriture réessaiera.
+            pass
+
+    def close(self) -> None:
+        self._stopped.set()
+        self._thread.join(timeout=5)
+        self.write()
+
+    def _write_loop(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self.write()
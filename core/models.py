@@ -1,10 +1,25 @@
 from __future__ import annotations
 
+import os
+import re
+import shlex
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from pathlib import Path
 from typing import Iterable, List, Optional, Sequence, Tuple
 
+from .diagnostics import timed
+from .file_walker import FileFilter, walk
+from .scheduling import SchedulingPolicy
+
+
+def _optional_positive_int(value) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
 
 class ExecutionStatus(Enum):
     PENDING = auto()
@@ -14,20 +29,100 @@ class ExecutionStatus(Enum):
     STOPPED = auto()
 
 
+@dataclass
+class BatchConfig:
+    """Traitement de plusieurs bases par invocation du jar.
+
+    ``argument`` est ajouté après les arguments applicatifs ; ``{databases}``
+    y est remplacé par les chemins séparés par des virgules et ``{argfile}``
+    par un fichier listant un chemin par ligne.  Les marqueurs sont des
+    expressions régulières appliquées à chaque ligne de sortie : le groupe
+    ``database`` désigne la base (chemin complet ou nom de fichier) et
+    ``exit_code`` son code retour.
+    """
+
+    DEFAULT_ARGUMENT = "--databases={databases}"
+    DEFAULT_START_MARKER = r"^BATCH-START (?P<database>.+?)\s*$"
+    DEFAULT_END_MARKER = r"^BATCH-END (?P<database>.+?) (?P<exit_code>-?\d+)\s*$"
+
+    size: int = 1
+    argument: str = DEFAULT_ARGUMENT
+    start_marker: str = DEFAULT_START_MARKER
+    end_marker: str = DEFAULT_END_MARKER
+
+    def enabled(self) -> bool:
+        return self.size > 1
+
+    def marker_errors(self) -> List[str]:
+        """Why the markers cannot split the output: invalid expression or no ``database`` group."""
+
+        errors: List[str] = []
+        for label, pattern in (("start_marker", self.start_marker), ("end_marker", self.end_marker)):
+            try:
+                regex = re.compile(pattern)
+            except re.error as exc:
+                errors.append(f"{label} : expression régulière invalide ({exc})")
+                continue
+            if "database" not in regex.groupindex:
+                errors.append(f"{label} : groupe (?P<database>...) manquant")
+        return errors
+
+    def to_dict(self) -> dict:
+        return {
+            "size": self.size,
+            "argument": self.argument,
+            "start_marker": self.start_marker,
+            "end_marker": self.end_marker,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BatchConfig":
+        batch = cls(
+            size=_optional_positive_int(data.get("size")) or 1,
+            argument=data.get("argument") or cls.DEFAULT_ARGUMENT,
+            start_marker=data.get("start_marker") or cls.DEFAULT_START_MARKER,
+            end_marker=data.get("end_marker") or cls.DEFAULT_END_MARKER,
+        )
+        errors = batch.marker_errors()
+        if errors:
+            raise ValueError("batch : " + " ; ".join(errors))
+        return batch
+
+
 @dataclass
 class LotConfig:
     name: str
     databases_path: str
     pattern: str = "*.db"
     files: List[str] = field(default_factory=list)
+    max_parallel: Optional[int] = None
+    # En mode pipeline, attendre la fin de tous les lots précédents avant de démarrer.
+    barrier: bool = False
+    batch: Optional[BatchConfig] = None
+    # Mémoire réservée par tâche pour l'admission ; ``None`` : estimation automatique.
+    task_memory_mb: Optional[int] = None
+    # Expressions régulières repérant l'avancement dans la sortie (groupes ``done`` et ``total``).
+    progress_patterns: List[str] = field(default_factory=list)
+    # Motifs supplémentaires (``**`` : sous-dossiers à toute profondeur) et exclusions, relatifs au dossier.
+    include_patterns: List[str] = field(default_factory=list)
+    exclude_patterns: List[str] = field(default_factory=list)
+    # Bornes de taille des bases retenues, en octets.
+    min_size_bytes: Optional[int] = None
+    max_size_bytes: Optional[int] = None
+
+    def file_filter(self) -> FileFilter:
+        return FileFilter(
+            include=(self.pattern, *self.include_patterns),
+            exclude=tuple(self.exclude_patterns),
+            min_size=self.min_size_bytes,
+            max_size=self.max_size_bytes,
+        )
 
+    @timed
     def iter_databases(self) -> List[Path]:
-        base_path = Path(self.databases_path).expanduser()
         if self.files:
             return [Path(f).expanduser() for f in self.files]
-        if not base_path.exists():
-            return []
-        return sorted(base_path.glob(self.pattern))
+        return [Path(path) for path, _stat in walk(Path(self.databases_path).expanduser(), self.file_filter())]
 
     def to_dict(self) -> dict:
         data = {
@@ -37,8 +132,35 @@ class LotConfig:
         }
         if self.files:
             data["files"] = self.files
+        if self.max_parallel:
+            data["max_parallel"] = self.max_parallel
+        if self.barrier:
+            data["barrier"] = True
+        if self.batch and self.batch.enabled():
+            data["batch"] = self.batch.to_dict()
+        if self.task_memory_mb:
+            data["task_memory_mb"] = self.task_memory_mb
+        if self.progress_patterns:
+            data["progress_patterns"] = self.progress_patterns
+        if self.include_patterns:
+            data["include_patterns"] = self.include_patterns
+        if self.exclude_patterns:
+            data["exclude_patterns"] = self.exclude_patterns
+        if self.min_size_bytes:
+            data["min_size_bytes"] = self.min_size_bytes
+        if self.max_size_bytes:
+            data["max_size_bytes"] = self.max_size_bytes
         return data
 
+    @staticmethod
+    def _batch_from_dict(data: dict) -> Optional[BatchConfig]:
+        if not isinstance(data.get("batch"), dict):
+            return None
+        try:
+            return BatchConfig.from_dict(data["batch"])
+        except ValueError as exc:
+            raise ValueError(f"Lot {data.get('name', '')} : {exc}") from exc
+
     @classmethod
     def from_dict(cls, data: dict) -> "LotConfig":
         return cls(
@@ -46,6 +168,15 @@ class LotConfig:
             databases_path=data.get("databases_path", ""),
             pattern=data.get("pattern", "*.db"),
             files=data.get("files", []) or [],
+            max_parallel=_optional_positive_int(data.get("max_parallel")),
+            barrier=bool(data.get("barrier", False)),
+            batch=cls._batch_from_dict(data),
+            task_memory_mb=_optional_positive_int(data.get("task_memory_mb")),
+            progress_patterns=[str(pattern) for pattern in data.get("progress_patterns", []) or []],
+            include_patterns=[str(pattern) for pattern in data.get("include_patterns", []) or [] if pattern],
+            exclude_patterns=[str(pattern) for pattern in data.get("exclude_patterns", []) or [] if pattern],
+            min_size_bytes=_optional_positive_int(data.get("min_size_bytes")),
+            max_size_bytes=_optional_positive_int(data.get("max_size_bytes")),
         )
 
 
@@ -58,13 +189,15 @@ class CommandArguments:
 
     jvm_properties: List[Tuple[str, str]] = field(default_factory=list)
     app_arguments: List[str] = field(default_factory=list)
+    # Options brutes de la JVM (ex : ``-Xmx2g``), placées avant les propriétés.
+    jvm_options: List[str] = field(default_factory=list)
 
     def __post_init__(self) -> None:
         # Toujours injecter l'argument applicatif attendu.
         self.app_arguments = [self.APP_ARGUMENT]
 
     def build_jvm_args(self, db_path: Path) -> List[str]:
-        args = [f"-D{self.PROFILE_KEY}={self.PROFILE_VALUE}"]
+        args = [*self.jvm_options, f"-D{self.PROFILE_KEY}={self.PROFILE_VALUE}"]
         datasource_key = self.DATASOURCE_KEY
         datasource_set = False
         for key, value in self.jvm_properties:
@@ -81,16 +214,28 @@ class CommandArguments:
             args.append(f"-D{datasource_key}=jdbc:sqlite:{db_path}")
         return args
 
+    def build_batch_jvm_args(self) -> List[str]:
+        """JVM arguments of an invocation handling several databases (no datasource URL)."""
+        args = [*self.jvm_options, f"-D{self.PROFILE_KEY}={self.PROFILE_VALUE}"]
+        for key, value in self.jvm_properties:
+            key = key.strip()
+            if not key or key in (self.PROFILE_KEY, self.DATASOURCE_KEY):
+                continue
+            args.append(f"-D{key}={'' if value is None else value}")
+        return args
+
     def to_dict(self) -> dict:
         return {
             "jvm_properties": [{"key": k, "value": v} for k, v in self.jvm_properties],
             "app_arguments": list(self.app_arguments),
+            "jvm_options": list(self.jvm_options),
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> "CommandArguments":
         jvm_props = [(item.get("key", ""), item.get("value", "")) for item in data.get("jvm_properties", [])]
-        return cls(jvm_properties=jvm_props)
+        jvm_options = [str(option) for option in data.get("jvm_options", []) if option]
+        return cls(jvm_properties=jvm_props, jvm_options=jvm_options)
 
 
 @dataclass
@@ -99,6 +244,35 @@ class AppSettings:
     lots: List[LotConfig] = field(default_factory=list)
     command_args: CommandArguments = field(default_factory=CommandArguments)
     auto_mode: bool = True
+    # ``None`` : plafond calculé à partir des CPU et de la mémoire libre.
+    max_parallel: Optional[int] = None
+    # Les créneaux libres prennent les tâches du lot suivant dès que le lot
+    # courant a tout distribué (mode automatique uniquement).
+    pipelined: bool = False
+    # Ordre de lancement des bases d'un lot : les plus coûteuses d'abord.
+    scheduling: SchedulingPolicy = SchedulingPolicy.LONGEST_FIRST
+    # Ne pas relancer une base inchangée depuis sa dernière exécution réussie
+    # (même taille, même date, même jar et mêmes arguments).
+    skip_unchanged: bool = True
+    # Comparer aussi le contenu (hachage en arrière-plan) et pas seulement taille et date.
+    fingerprint_content: bool = False
+    force_rerun: bool = False
+    # Archive AppCDS du jar, construite à la première exécution, pour accélérer le démarrage des JVM.
+    class_data_sharing: bool = True
+    # Mémoire réservée par tâche (Mo) ; ``None`` : pic observé, ``-Xmx`` ou valeur par défaut.
+    task_memory_mb: Optional[int] = None
+    # Mémoire que les tâches simultanées peuvent réserver (Mo) ; ``None`` : mémoire disponible au démarrage.
+    memory_budget_mb: Optional[int] = None
+    # Démarrer les processus depuis un thread dédié plutôt que depuis la boucle d'événements.
+    launch_thread: bool = False
+    # Commande lançant la JVM, éventuellement suivie d'arguments (ex : un substitut pour les mesures).
+    java_command: str = "java"
+
+    def java_executable(self) -> List[str]:
+        """``java_command`` split into the program and its leading arguments."""
+        parts = shlex.split(self.java_command, posix=os.name != "nt")
+        # Sous Windows, le découpage non POSIX conserve les guillemets des chemins avec espaces.
+        return [part.strip('"') for part in parts] or ["java"]
 
 
 @dataclass
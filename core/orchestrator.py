@@ -1,15 +1,36 @@
 from __future__ import annotations
 
+import hashlib
 import itertools
+import shlex
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from PySide6.QtCore import QObject, Signal
 
-from .models import AppSettings, DatabaseTask, ExecutionStatus, LotConfig
+from .batch_runner import BatchProcessRunner
+from .cds import REJECTION_HINT, CdsArchiveCache
+from .discovery import DiscoveredFile, DiscoveryKey, DiscoveryService, discovery_key
+from .checkpoint import CheckpointEntry, CheckpointJournal, CheckpointKey
+from .fingerprint import Fingerprint, FingerprintCache, content_fingerprint, stat_fingerprint
+from .hashing import file_sha256
+from .metrics import MetricsRegistry
+from .models import AppSettings, BatchConfig, DatabaseTask, ExecutionStatus, LotConfig
+from .paths import app_data_dir
 from .process_runner import ProcessRunner
+from .process_sampler import ProcessSampler, TaskUsage
+from .resources import DEFAULT_TASK_MEMORY_BYTES, JVM_NON_HEAP_FACTOR, default_memory_budget, max_heap_bytes
+from .run_history import RunHistoryStore
+from .scheduling import CostEstimator
 from .worker_pool import WorkerPool
 
+# Volume de sortie inspecté au démarrage d'une JVM pour détecter le refus de l'archive CDS.
+_CDS_CHECKED_BYTES = 64 * 1024
+_MB = 1024 * 1024
+
 
 class Orchestrator(QObject):
     lot_started = Signal(LotConfig)
@@ -17,30 +38,122 @@ class Orchestrator(QObject):
     lot_skipped = Signal(LotConfig, str)
     all_finished = Signal()
     task_started = Signal(DatabaseTask, str)
-    task_output = Signal(DatabaseTask, str, bool)
+    # Lots de lignes complètes de la sortie d'une tâche.
+    task_output = Signal(DatabaseTask, list, bool)
     task_finished = Signal(DatabaseTask, ExecutionStatus, int)
     task_error = Signal(DatabaseTask, str)
+    task_skipped = Signal(DatabaseTask, str)
     request_lot_confirmation = Signal(LotConfig)
     startup_error = Signal(str)
+    # Consommation (liste de TaskUsage) des tâches en cours, à chaque échantillonnage.
+    task_usage = Signal(list)
+    # Résultat d'une vérification d'empreinte, émis depuis le pool de hachage.
+    _fingerprint_checked = Signal(str, DatabaseTask, bool)
 
     def __init__(self, parent: Optional[QObject] = None):
         super().__init__(parent)
         self._settings: Optional[AppSettings] = None
         self._lots: List[LotConfig] = []
         self._current_lot_index: int = -1
-        self._pending_tasks: set[str] = set()
+        # Tâches restantes par lot démarré ; plusieurs lots en mode pipeline.
+        self._active_lots: Dict[str, set[str]] = {}
         self._worker_pool = WorkerPool()
         self._worker_pool.task_started.connect(self.task_started)
         self._worker_pool.task_output.connect(self.task_output)
         self._worker_pool.task_finished.connect(self._on_task_finished)
         self._worker_pool.task_error.connect(self.task_error)
+        self._worker_pool.group_dispatched.connect(self._on_lot_dispatched)
+        self._worker_pool.task_started.connect(self._record_task_start)
+        self._worker_pool.task_output.connect(self._count_task_output)
+        self._worker_pool.set_launch_hook(self._prepare_runner)
+        self._sampler = ProcessSampler(parent=self)
+        self._sampler.sampled.connect(self.task_usage)
+        self._sampler.sampled.connect(self._record_usage)
+        self._worker_pool.runner_completed.connect(self._on_runner_completed)
+        self._cost_estimator = CostEstimator()
+        self._task_start_times: Dict[str, float] = {}
+        self._task_output_bytes: Dict[str, int] = {}
+        self._history: Optional[RunHistoryStore] = None
+        self._run_id = ""
+        self._journal: Optional[CheckpointJournal] = None
+        self._jar_hash = ""
+        # Bases déjà réussies lors de l'exécution reprise, avec leur signature.
+        self._resumed: Dict[CheckpointKey, str] = {}
+        self._fingerprints: Optional[FingerprintCache] = None
+        self._hash_pool: Optional[ThreadPoolExecutor] = None
+        # Vérifications d'empreinte en cours par lot : le lot n'est pas encore entièrement distribué.
+        self._fingerprint_checks: Dict[str, int] = {}
+        self._fingerprint_checked.connect(self._on_fingerprint_checked)
+        self._cds: Optional[CdsArchiveCache] = None
+        self._metrics: Optional[MetricsRegistry] = None
+        self._worker_pool.queue_changed.connect(self._record_queue)
+        # Tâches lancées avec l'archive CDS, surveillées jusqu'à ce qu'elle soit acceptée.
+        self._cds_users: set[str] = set()
+        # Runners produisant l'archive CDS, avec le hachage du jar concerné.
+        self._cds_training: Dict[ProcessRunner, str] = {}
+        self.all_finished.connect(self._on_run_finished)
         self._awaiting_confirmation = False
+        self._discovery = DiscoveryService(parent=self)
+        self._discovery.lot_discovered.connect(self._on_lot_discovered)
+        self._discovery.files_found.connect(self._on_files_found)
+        # Lot dont les bases sont distribuées au fil de leur recherche, et celles déjà distribuées.
+        self._scanning_lot: Optional[LotConfig] = None
+        self._streamed: set[str] = set()
         self._running = False
 
     def is_running(self) -> bool:
         return self._running
 
-    def start(self, settings: AppSettings) -> None:
+    def worker_pool(self) -> WorkerPool:
+        return self._worker_pool
+
+    def cost_estimator(self) -> CostEstimator:
+        return self._cost_estimator
+
+    def discovery(self) -> DiscoveryService:
+        return self._discovery
+
+    def set_run_history(self, history: Optional[RunHistoryStore]) -> None:
+        """Record every run in ``history`` and schedule with its median durations."""
+
+        self._history = history
+        if history is None:
+            self._cost_estimator.set_duration_lookup(None)
+        else:
+            self._cost_estimator.set_duration_lookup(history.duration_percentiles)
+
+    def current_run_id(self) -> str:
+        return self._run_id
+
+    def set_checkpoint_journal(self, journal: Optional[CheckpointJournal]) -> None:
+        """Journal every task completion in ``journal`` so that a run can be resumed."""
+
+        self._journal = journal
+
+    def set_fingerprint_cache(self, cache: Optional[FingerprintCache]) -> None:
+        """Skip databases whose fingerprint matches their last successful run in ``cache``."""
+
+        self._fingerprints = cache
+        if cache is not None and self._hash_pool is None:
+            self._hash_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fingerprint")
+
+    def set_cds_cache(self, cache: Optional[CdsArchiveCache]) -> None:
+        """Start the JVMs with a class-data-sharing archive of the jar kept in ``cache``."""
+
+        self._cds = cache
+
+    def set_metrics(self, metrics: Optional[MetricsRegistry]) -> None:
+        """Keep the counters of ``metrics`` up to date with the tasks, their output and the queue."""
+
+        self._metrics = metrics
+
+    def start(self, settings: AppSettings, resume: bool = False) -> None:
+        """Start the lots of ``settings``.
+
+        With ``resume``, databases that already SUCCEEDED in the journaled run
+        with the same jar and arguments are skipped.
+        """
+
         if self._running:
             return
         self._settings = settings
@@ -54,59 +167,470 @@ class Orchestrator(QObject):
             self._running = False
             self.startup_error.emit("Jar introuvable : %s" % jar_path)
             return
+        for lot in self._lots:
+            # Marqueurs invalides : refus avant toute distribution plutôt qu'un échec en cours d'exécution.
+            errors = lot.batch.marker_errors() if lot.batch is not None and lot.batch.enabled() else []
+            if errors:
+                self._running = False
+                self.startup_error.emit(f"Lot {lot.name}, paquets : {' ; '.join(errors)}")
+                return
         self._current_lot_index = -1
-        self._pending_tasks.clear()
+        self._active_lots.clear()
+        self._task_start_times.clear()
+        self._task_output_bytes.clear()
+        self._worker_pool.set_max_parallel(settings.max_parallel)
+        self._worker_pool.set_launch_thread(settings.launch_thread)
+        if settings.memory_budget_mb:
+            self._worker_pool.set_memory_budget(settings.memory_budget_mb * _MB)
+        else:
+            self._worker_pool.set_memory_budget(default_memory_budget())
         self._running = True
         self._awaiting_confirmation = False
+        self._scanning_lot = None
+        # Vérifier dès maintenant, en parallèle, que les bases connues de chaque lot sont à jour.
+        self._discovery.refresh(self._lots)
+        self._run_id = uuid.uuid4().hex
+        if self._metrics:
+            self._metrics.begin_run()
+        if self._history:
+            self._history.begin_run(self._run_id, settings.jar_path)
+        self._resumed = {}
+        self._fingerprint_checks.clear()
+        self._cds_users.clear()
+        if self._cds:
+            self._cds.reset_session()
+        if self._journal or self._fingerprints or self._cds_enabled():
+            self._jar_hash = file_sha256(jar_path)
+        if self._journal:
+            if resume:
+                entries = self._journal.compact()
+                self._resumed = {
+                    key: entry.signature
+                    for key, entry in entries.items()
+                    if entry.status == ExecutionStatus.SUCCEEDED.name
+                }
+            else:
+                self._journal.reset()
         self._start_next_lot()
 
     def _start_next_lot(self) -> None:
-        if not self._running:
+        while self._running:
+            if self._scanning_lot is not None:
+                # Le lot suivant attendra que celui-ci ait trouvé toutes ses bases.
+                return
+            next_index = self._current_lot_index + 1
+            if next_index >= len(self._lots):
+                if not self._active_lots:
+                    self._running = False
+                    self.all_finished.emit()
+                return
+            lot = self._lots[next_index]
+            if self._active_lots and (lot.barrier or not self._is_pipelined()):
+                # Le lot démarrera quand les lots en cours seront terminés.
+                return
+            self._current_lot_index = next_index
+            snapshot = self._discovery.snapshot(lot)
+            if snapshot is None:
+                self._stream_lot(lot)
+                return
+            if not snapshot.files:
+                self.lot_skipped.emit(lot, "Aucune base trouvée pour ce lot")
+                continue
+            self._dispatch(lot, snapshot.files)
             return
-        self._current_lot_index += 1
-        if self._current_lot_index >= len(self._lots):
-            self._running = False
-            self.all_finished.emit()
+
+    def _stream_lot(self, lot: LotConfig) -> None:
+        """Dispatch the databases of ``lot`` as its scan finds them; ``lot_started`` comes with the first ones."""
+
+        self._scanning_lot = lot
+        self._streamed = set()
+        self._discovery.refresh([lot])
+        found = self._discovery.partial(lot)
+        if found:
+            self._dispatch_new(lot, found)
+
+    def _on_files_found(self, key: DiscoveryKey, files: List[DiscoveredFile]) -> None:
+        lot = self._scanning_lot
+        if lot is not None and self._running and key == discovery_key(lot):
+            self._dispatch_new(lot, files)
+
+    def _on_lot_discovered(self, snapshot) -> None:
+        lot = self._scanning_lot
+        if lot is None or not self._running or snapshot.key != discovery_key(lot):
             return
-        lot = self._lots[self._current_lot_index]
-        databases = lot.iter_databases()
-        if not databases:
+        # Le résultat complet : distribuer ce que les paquets n'ont pas apporté (tout, si rien n'a changé).
+        self._dispatch_new(lot, snapshot.files)
+        self._scanning_lot = None
+        self._streamed = set()
+        pending = self._active_lots.get(lot.name)
+        if pending is None:
             self.lot_skipped.emit(lot, "Aucune base trouvée pour ce lot")
             self._start_next_lot()
+        elif not pending:
+            # Toutes les bases ont déjà été ignorées ou traitées pendant la recherche.
+            del self._active_lots[lot.name]
+            self._on_lot_completed(lot)
+        elif not self._fingerprint_checks.get(lot.name) and not self._worker_pool.queued_count(lot.name):
+            self._on_lot_dispatched(lot.name)
+
+    def _dispatch_new(self, lot: LotConfig, files: List[DiscoveredFile]) -> None:
+        new_files = [entry for entry in files if entry.path not in self._streamed]
+        if new_files:
+            self._streamed.update(entry.path for entry in new_files)
+            self._dispatch(lot, new_files)
+
+    def _dispatch(self, lot: LotConfig, files: List[DiscoveredFile]) -> None:
+        sizes = {entry.path: entry.size for entry in files}
+        databases = self._cost_estimator.order([Path(entry.path) for entry in files], self._settings.scheduling, sizes)
+        tasks = [DatabaseTask(lot, db) for db in databases]
+        pending = self._active_lots.get(lot.name)
+        if pending is None:
+            pending = self._active_lots[lot.name] = set()
+            self.lot_started.emit(lot)
+            self._worker_pool.set_group_limit(lot.name, lot.max_parallel)
+        pending.update(task.id() for task in tasks)
+        runnable: List[DatabaseTask] = []
+        to_hash: List[DatabaseTask] = []
+        skipped: List[tuple[DatabaseTask, str]] = []
+        # Empreintes connues lues en une fois, comparées à la taille et à la date relevées par la découverte.
+        cached = self._cached_fingerprints(tasks)
+        stats = {str(Path(entry.path)): Fingerprint(entry.size, entry.mtime_ns) for entry in files}
+        for task in tasks:
+            if self._already_succeeded(task):
+                skipped.append((task, "Déjà traitée (reprise)"))
+                continue
+            verdict = self._fingerprint_verdict(task, cached.get(str(task.database)), stats.get(str(task.database)))
+            if verdict is True:
+                skipped.append((task, "À jour (base inchangée)"))
+            elif verdict is None:
+                to_hash.append(task)
+            else:
+                runnable.append(task)
+        if to_hash:
+            self._fingerprint_checks[lot.name] = self._fingerprint_checks.get(lot.name, 0) + len(to_hash)
+        if runnable:
+            self._submit(lot, runnable)
+        for task in to_hash:
+            self._submit_fingerprint_check(task)
+        for task, reason in skipped:
+            self._skip_task(task, reason)
+
+    def _submit(self, lot: LotConfig, tasks: List[DatabaseTask]) -> None:
+        if lot.batch is not None and lot.batch.enabled():
+            runners: List[ProcessRunner] = []
+            size = lot.batch.size
+            for start in range(0, len(tasks), size):
+                runners.append(self._build_batch_runner(lot.batch, tasks[start:start + size]))
+        else:
+            runners = [ProcessRunner(task, self._build_command(task)) for task in tasks]
+        estimates = self._memory_estimates(lot, tasks)
+        for runner in runners:
+            # Un paquet s'exécute dans une seule JVM : sa base la plus gourmande la dimensionne.
+            runner.memory_bytes = max(estimates[task.id()] for task in runner.tasks)
+        self._worker_pool.submit(runners, lot.name)
+
+    def _memory_estimates(self, lot: LotConfig, tasks: List[DatabaseTask]) -> Dict[str, int]:
+        """Memory to reserve for each task: configured, observed peak, ``-Xmx`` or default."""
+
+        assert self._settings is not None
+        configured = lot.task_memory_mb or self._settings.task_memory_mb
+        if configured:
+            return {task.id(): configured * _MB for task in tasks}
+        heap = max_heap_bytes(self._settings.command_args.jvm_options)
+        fallback = int(heap * JVM_NON_HEAP_FACTOR) if heap else DEFAULT_TASK_MEMORY_BYTES
+        observed: Dict[str, int] = {}
+        if self._history:
+            observed = self._history.peak_rss_percentiles([task.database for task in tasks])
+        return {task.id(): observed.get(str(task.database), fallback) for task in tasks}
+
+    def _build_batch_runner(self, batch: BatchConfig, tasks: List[DatabaseTask]) -> ProcessRunner:
+        assert self._settings is not None
+        if len(tasks) == 1:
+            return ProcessRunner(tasks[0], self._build_command(tasks[0]))
+        databases = [str(task.database) for task in tasks]
+        argfile: Optional[Path] = None
+        if "{argfile}" in batch.argument:
+            argfile = app_data_dir() / "batches" / f"{uuid.uuid4().hex}.txt"
+            argfile.parent.mkdir(parents=True, exist_ok=True)
+            argfile.write_text("\n".join(databases) + "\n", encoding="utf-8")
+        extra = [
+            part.format(databases=",".join(databases), argfile=str(argfile or ""))
+            for part in shlex.split(batch.argument)
+        ]
+        jar_path = Path(self._settings.jar_path).expanduser()
+        command = [
+            *self._settings.java_executable(),
+            *self._settings.command_args.build_batch_jvm_args(),
+            "-jar",
+            str(jar_path),
+            *self._settings.command_args.app_arguments,
+            *extra,
+        ]
+        return BatchProcessRunner(tasks, command, batch, argfile)
+
+    def _skip_task(self, task: DatabaseTask, reason: str) -> None:
+        if self._metrics:
+            self._metrics.task_skipped(task.lot.name)
+        self.task_skipped.emit(task, reason)
+        self._release_task(task)
+
+    def _skips_unchanged(self) -> bool:
+        assert self._settings is not None
+        return self._fingerprints is not None and not self._settings.force_rerun and self._settings.skip_unchanged
+
+    def _cached_fingerprints(self, tasks: List[DatabaseTask]) -> Dict[str, tuple[Fingerprint, str]]:
+        if not tasks or not self._skips_unchanged():
+            return {}
+        assert self._fingerprints is not None
+        return self._fingerprints.lookup_many([task.database for task in tasks])
+
+    def _fingerprint_verdict(
+        self,
+        task: DatabaseTask,
+        cached: Optional[tuple[Fingerprint, str]],
+        current: Optional[Fingerprint],
+    ) -> Optional[bool]:
+        """``True`` when ``task`` is up to date, ``False`` when it must run, ``None`` when its content must be hashed.
+
+        ``cached`` is the entry of the fingerprint cache and ``current`` the
+        size and date found by the discovery: no file is read here.
+        """
+
+        assert self._settings is not None
+        if not self._skips_unchanged():
+            return False
+        if cached is None or cached[1] != self._task_signature(task):
+            return False
+        if current is None or not current.same_stat(cached[0]):
+            return False
+        if self._settings.fingerprint_content and cached[0].content_hash:
+            return None
+        return True
+
+    def _submit_fingerprint_check(self, task: DatabaseTask) -> None:
+        assert self._fingerprints is not None and self._hash_pool is not None
+        cache = self._fingerprints
+        run_id = self._run_id
+
+        def check() -> None:
+            cached = cache.lookup(task.database)
+            current = content_fingerprint(task.database)
+            unchanged = cached is not None and current is not None and current == cached[0]
+            self._fingerprint_checked.emit(run_id, task, unchanged)
+
+        self._hash_pool.submit(check)
+
+    def _on_fingerprint_checked(self, run_id: str, task: DatabaseTask, unchanged: bool) -> None:
+        if run_id != self._run_id or task.lot.name not in self._active_lots:
+            return
+        lot_name = task.lot.name
+        remaining = self._fingerprint_checks.get(lot_name, 0) - 1
+        if remaining > 0:
+            self._fingerprint_checks[lot_name] = remaining
+        else:
+            self._fingerprint_checks.pop(lot_name, None)
+        if unchanged:
+            self._skip_task(task, "À jour (base inchangée)")
+            if remaining <= 0 and not self._worker_pool.queued_count(lot_name):
+                self._on_lot_dispatched(lot_name)
+        else:
+            self._submit(task.lot, [task])
+
+    def _record_fingerprint(self, task: DatabaseTask) -> None:
+        """Remember the state of a database right after a successful run."""
+
+        if self._fingerprints is None or self._hash_pool is None or self._settings is None:
             return
-        self._pending_tasks = {DatabaseTask(lot, db).id() for db in databases}
-        self.lot_started.emit(lot)
-        for db in databases:
-            task = DatabaseTask(lot, db)
-            command = self._build_command(task)
-            runner = ProcessRunner(task, command)
-            self._worker_pool.start_runner(runner)
+        cache = self._fingerprints
+        signature = self._task_signature(task)
+        hash_content = self._settings.fingerprint_content
+
+        def record() -> None:
+            fingerprint: Optional[Fingerprint]
+            fingerprint = content_fingerprint(task.database) if hash_content else stat_fingerprint(task.database)
+            if fingerprint is not None:
+                cache.store(task.database, fingerprint, signature)
+
+        self._hash_pool.submit(record)
+
+    def _task_signature(self, task: DatabaseTask) -> str:
+        """Identify the jar and arguments used for ``task``, whatever the jar location."""
+
+        assert self._settings is not None
+        args = self._settings.command_args
+        payload = "\0".join([self._jar_hash, *args.build_jvm_args(task.database), *args.app_arguments])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+    def _already_succeeded(self, task: DatabaseTask) -> bool:
+        signature = self._resumed.get((task.lot.name, str(task.database)))
+        return signature is not None and signature == self._task_signature(task)
+
+    def _is_scanning(self, lot_name: str) -> bool:
+        return self._scanning_lot is not None and self._scanning_lot.name == lot_name
+
+    def _is_pipelined(self) -> bool:
+        # En mode manuel chaque lot attend la confirmation : pas de chevauchement.
+        return bool(self._settings and self._settings.pipelined and self._settings.auto_mode)
+
+    def _on_lot_dispatched(self, lot_name: str) -> None:
+        """Pipelined mode: free slots may take the next lot once this one is fully dispatched."""
+
+        if not self._running or not self._is_pipelined():
+            return
+        if not 0 <= self._current_lot_index < len(self._lots):
+            return
+        if self._lots[self._current_lot_index].name != lot_name:
+            return
+        if self._fingerprint_checks.get(lot_name) or self._is_scanning(lot_name):
+            # Des bases en cours de hachage ou pas encore trouvées peuvent encore être distribuées.
+            return
+        if self._current_lot_index + 1 < len(self._lots):
+            self._start_next_lot()
 
     def _build_command(self, task: DatabaseTask) -> List[str]:
         assert self._settings is not None
         jar_path = Path(self._settings.jar_path).expanduser()
         jvm_args = self._settings.command_args.build_jvm_args(task.database)
-        base_command = ["java", *jvm_args, "-jar", str(jar_path)]
+        base_command = [*self._settings.java_executable(), *jvm_args, "-jar", str(jar_path)]
         app_args = list(self._settings.command_args.app_arguments)
         return base_command + app_args
 
+    def _record_task_start(self, task: DatabaseTask, _command: str) -> None:
+        self._task_start_times[task.id()] = time.monotonic()
+        if self._metrics:
+            self._metrics.task_started(task.lot.name)
+
+    def _count_task_output(self, task: DatabaseTask, lines: List[str], _is_error: bool) -> None:
+        task_id = task.id()
+        size = sum(len(line.encode("utf-8")) for line in lines) + len(lines)
+        self._task_output_bytes[task_id] = self._task_output_bytes.get(task_id, 0) + size
+        if self._metrics:
+            self._metrics.add_output(task.lot.name, size)
+        if task_id in self._cds_users:
+            self._check_cds_output(task_id, lines)
+
+    def _record_usage(self, usages: List[TaskUsage]) -> None:
+        if self._metrics is None:
+            return
+        rss_by_lot: Dict[str, int] = {}
+        # Les tâches d'un paquet partagent l'échantillon de leur JVM : le compter une fois.
+        seen: set[int] = set()
+        for usage in usages:
+            sample = usage.current
+            if sample is None or id(sample) in seen:
+                continue
+            seen.add(id(sample))
+            lot_name = usage.task.lot.name
+            rss_by_lot[lot_name] = rss_by_lot.get(lot_name, 0) + sample.rss_bytes
+        self._metrics.set_rss(rss_by_lot)
+
+    def _record_queue(self, running: int, queued: int) -> None:
+        if self._metrics:
+            self._metrics.set_queue(running, queued, self._worker_pool.queued_task_count())
+
+    def _cds_enabled(self) -> bool:
+        return self._cds is not None and self._settings is not None and self._settings.class_data_sharing
+
+    def _prepare_runner(self, runner: ProcessRunner) -> None:
+        self._sampler.track(runner)
+        self._apply_cds(runner)
+
+    def _apply_cds(self, runner: ProcessRunner) -> None:
+        if not self._cds_enabled() or not self._jar_hash:
+            return
+        assert self._cds is not None
+        cds = self._cds
+        jar_hash = self._jar_hash
+        args = cds.archive_args(jar_hash)
+        if args:
+            self._cds_users.update(task.id() for task in runner.tasks)
+        else:
+            args = cds.begin_training(jar_hash)
+            if not args:
+                return
+            self._cds_training[runner] = jar_hash
+        # Les options de la JVM suivent directement la commande java.
+        position = len(self._settings.java_executable()) if self._settings else 1
+        runner.command[position:position] = args
+
+    def _on_runner_completed(self, runner: ProcessRunner) -> None:
+        self._sampler.untrack(runner)
+        jar_hash = self._cds_training.pop(runner, None)
+        if jar_hash is not None and self._cds is not None:
+            self._cds.finish_training(jar_hash)
+
+    def _check_cds_output(self, task_id: str, lines: List[str]) -> None:
+        # Les avertissements CDS apparaissent au démarrage de la JVM.
+        if self._task_output_bytes.get(task_id, 0) > _CDS_CHECKED_BYTES:
+            self._cds_users.discard(task_id)
+            return
+        if self._cds is not None and any(REJECTION_HINT in line.lower() for line in lines):
+            self._cds.reject(self._jar_hash)
+            self._cds_users.clear()
+
     def _on_task_finished(self, task: DatabaseTask, status: ExecutionStatus, exit_code: int) -> None:
-        if task.id() in self._pending_tasks:
-            self._pending_tasks.remove(task.id())
+        start_time = self._task_start_times.pop(task.id(), None)
+        log_bytes = self._task_output_bytes.pop(task.id(), 0)
+        self._cds_users.discard(task.id())
+        usage = self._sampler.release(task)
+        if self._metrics:
+            self._metrics.task_finished(
+                task.lot.name, status, time.monotonic() - start_time if start_time is not None else None
+            )
+        if start_time is not None:
+            duration = time.monotonic() - start_time
+            if status == ExecutionStatus.SUCCEEDED:
+                self._cost_estimator.record(task.database, duration)
+            if self._history:
+                self._history.record_task(
+                    self._run_id,
+                    task.lot.name,
+                    str(task.database),
+                    status.name,
+                    exit_code,
+                    time.time() - duration,
+                    duration,
+                    log_bytes,
+                    (usage.peak_rss_bytes or None) if usage else None,
+                )
+        if self._journal:
+            self._journal.append(
+                CheckpointEntry(task.lot.name, str(task.database), status.name, exit_code, self._task_signature(task))
+            )
+        if status == ExecutionStatus.SUCCEEDED:
+            self._record_fingerprint(task)
         self.task_finished.emit(task, status, exit_code)
-        if not self._pending_tasks and self._running:
-            lot = self._lots[self._current_lot_index]
-            self.lot_finished.emit(lot)
-            if self._settings and self._settings.auto_mode:
-                self._start_next_lot()
+        self._release_task(task)
+
+    def _release_task(self, task: DatabaseTask) -> None:
+        pending = self._active_lots.get(task.lot.name)
+        if pending is None:
+            return
+        pending.discard(task.id())
+        if pending or not self._running or self._is_scanning(task.lot.name):
+            return
+        del self._active_lots[task.lot.name]
+        self._on_lot_completed(task.lot)
+
+    def _on_lot_completed(self, lot: LotConfig) -> None:
+        self.lot_finished.emit(lot)
+        if self._active_lots:
+            # Mode pipeline : d'autres lots occupent encore des créneaux.
+            return
+        if self._settings and self._settings.auto_mode:
+            self._start_next_lot()
+        else:
+            has_more_lots = self._current_lot_index + 1 < len(self._lots)
+            if has_more_lots:
+                self._awaiting_confirmation = True
+                self.request_lot_confirmation.emit(lot)
             else:
-                has_more_lots = self._current_lot_index + 1 < len(self._lots)
-                if has_more_lots:
-                    self._awaiting_confirmation = True
-                    self.request_lot_confirmation.emit(lot)
-                else:
-                    # Aucun lot supplémentaire : terminer immédiatement sans demander.
-                    self._start_next_lot()
+                # Aucun lot supplémentaire : terminer immédiatement sans demander.
+                self._start_next_lot()
+
+    def _on_run_finished(self) -> None:
+        if self._history and self._run_id:
+            self._history.end_run(self._run_id)
 
     def continue_to_next_lot(self) -> None:
         if not self._running or not self._awaiting_confirmation:
@@ -115,11 +639,15 @@ class Orchestrator(QObject):
         self._start_next_lot()
 
     def stop_all(self) -> None:
-        self._worker_pool.stop_all()
-        self._pending_tasks.clear()
+        was_running = self._running
+        # Arrêt avant le pool : les tâches en attente qu'il termine ne doivent pas démarrer le lot suivant.
+        self._running = False
+        self._active_lots.clear()
+        self._fingerprint_checks.clear()
         self._awaiting_confirmation = False
-        if self._running:
-            self._running = False
+        self._scanning_lot = None
+        self._worker_pool.stop_all()
+        if was_running:
             self.all_finished.emit()
 
     def stop_task(self, task: DatabaseTask) -> None:
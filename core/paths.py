@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+HOME_ENV_VAR = "CLI_ORCHESTRATOR_HOME"
+
+
+def app_data_dir() -> Path:
+    """Directory holding the local state of the orchestrator (history, caches...).
+
+    Defaults to ``~/.cli-orchestrator`` and can be moved with the
+    ``CLI_ORCHESTRATOR_HOME`` environment variable.
+    """
+
+    override = os.environ.get(HOME_ENV_VAR)
+    base = Path(override).expanduser() if override else Path.home() / ".cli-orchestrator"
+    base.mkdir(parents=True, exist_ok=True)
+    return base
@@ -1,32 +1,63 @@
 from __future__ import annotations
 
+import codecs
 import shlex
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from PySide6.QtCore import QObject, QProcess, QTimer, Signal
+from PySide6.QtCore import QObject, QProcess, QTimer, Signal, Slot
 
+from .diagnostics import timed
 from .models import DatabaseTask, ExecutionStatus
 
+# La sortie est livrée par lots de lignes complètes, au plus toutes les 50 ms
+# ou dès que 64 Ko sont en attente.
+OUTPUT_FLUSH_INTERVAL_MS = 50
+OUTPUT_FLUSH_BYTES = 64 * 1024
+# Une ligne sans fin de ligne plus longue que ceci est livrée telle quelle.
+_MAX_PARTIAL_LINE = 64 * 1024
+
 
 class ProcessRunner(QObject):
     started = Signal(DatabaseTask, str)
-    stdout_received = Signal(DatabaseTask, str)
-    stderr_received = Signal(DatabaseTask, str)
+    # Lignes complètes (sans fin de ligne) et canal d'erreur.
+    output_received = Signal(DatabaseTask, list, bool)
     finished = Signal(DatabaseTask, ExecutionStatus, int)
     error = Signal(DatabaseTask, str)
+    # Émis une fois le processus terminé et toutes ses tâches signalées.
+    completed = Signal()
 
     def __init__(self, task: DatabaseTask, command: List[str], working_directory: Optional[str] = None, parent: Optional[QObject] = None):
         super().__init__(parent)
         self.task = task
+        self.tasks: List[DatabaseTask] = [task]
         self.command = command
         self.working_directory = working_directory
+        # Mémoire réservée pour ce processus dans le budget du WorkerPool.
+        self.memory_bytes = 0
         self._process: Optional[QProcess] = None
+        self._pid = 0
         self._terminated = False
+        # Par canal (False : stdout, True : stderr).
+        self._decoders: Dict[bool, codecs.IncrementalDecoder] = {
+            channel: codecs.getincrementaldecoder("utf-8")(errors="replace") for channel in (False, True)
+        }
+        self._partial_lines: Dict[bool, str] = {False: "", True: ""}
+        self._pending_lines: Dict[bool, List[str]] = {False: [], True: []}
+        self._pending_bytes = 0
+        self._flush_timer: Optional[QTimer] = None
 
+    @Slot()
+    @timed
     def start(self) -> None:
+        """Launch the process without waiting: ``started`` is emitted once the OS reports it."""
         if self._process is not None:
             return
         self._process = QProcess(self)
+        # Créé ici pour appartenir au thread qui démarre le processus.
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(OUTPUT_FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_output)
         if self.working_directory:
             self._process.setWorkingDirectory(self.working_directory)
         program = self.command[0]
@@ -37,14 +68,17 @@ class ProcessRunner(QObject):
         self._process.readyReadStandardOutput.connect(self._on_stdout)
         self._process.readyReadStandardError.connect(self._on_stderr)
         self._process.stateChanged.connect(self._on_state_changed)
+        self._process.started.connect(self._on_started)
         self._process.finished.connect(self._on_finished)
         self._process.errorOccurred.connect(self._on_error)
         self._process.start()
-        if not self._process.waitForStarted(5000):
-            self.error.emit(self.task, "Impossible de démarrer le processus")
-            return
-        self.started.emit(self.task, self.command_as_string())
 
+    def process_id(self) -> int:
+        """PID of the running process, ``0`` when it is not running."""
+        # Attribut simple : lisible depuis un autre thread que celui du processus.
+        return self._pid
+
+    @Slot()
     def terminate(self) -> None:
         self._terminated = True
         if self._process and self._process.state() != QProcess.NotRunning:
@@ -58,33 +92,97 @@ class ProcessRunner(QObject):
     def _on_state_changed(self, state):
         pass
 
-    def _on_stdout(self) -> None:
-        if not self._process:
+    def _on_started(self) -> None:
+        if self._process is None:
             return
-        data = self._process.readAllStandardOutput().data().decode(errors="replace")
-        if data:
-            self.stdout_received.emit(self.task, data)
+        self._pid = int(self._process.processId())
+        self._report_started()
+        if self._terminated:
+            # Arrêt demandé pendant le démarrage.
+            self._process.terminate()
+
+    def _on_stdout(self) -> None:
+        if self._process:
+            self._receive(self._process.readAllStandardOutput().data(), False)
 
     def _on_stderr(self) -> None:
-        if not self._process:
+        if self._process:
+            self._receive(self._process.readAllStandardError().data(), True)
+
+    def _receive(self, data: bytes, is_error: bool) -> None:
+        if not data:
             return
-        data = self._process.readAllStandardError().data().decode(errors="replace")
-        if data:
-            self.stderr_received.emit(self.task, data)
+        # Décodage incrémental : un caractère multi-octets coupé entre deux lectures reste entier.
+        text = self._partial_lines[is_error] + self._decoders[is_error].decode(data)
+        lines = text.split("\n")
+        partial = lines.pop()
+        if len(partial) > _MAX_PARTIAL_LINE:
+            lines.append(partial)
+            partial = ""
+        self._partial_lines[is_error] = partial
+        if lines:
+            self._pending_lines[is_error].extend(line[:-1] if line.endswith("\r") else line for line in lines)
+        self._pending_bytes += len(data)
+        if self._pending_bytes >= OUTPUT_FLUSH_BYTES:
+            self._flush_output()
+        elif self._flush_timer is not None and not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_output(self, final: bool = False) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
+        self._pending_bytes = 0
+        for is_error in (False, True):
+            if final:
+                tail = self._partial_lines[is_error] + self._decoders[is_error].decode(b"", final=True)
+                self._partial_lines[is_error] = ""
+                if tail:
+                    self._pending_lines[is_error].append(tail.rstrip("\r"))
+            lines = self._pending_lines[is_error]
+            if lines:
+                self._pending_lines[is_error] = []
+                self._handle_output(lines, is_error)
 
     def _on_finished(self, exit_code: int, exit_status: QProcess.ExitStatus) -> None:
+        self._on_stdout()
+        self._on_stderr()
+        self._flush_output(final=True)
         status = ExecutionStatus.SUCCEEDED
         if self._terminated:
             status = ExecutionStatus.STOPPED
         elif exit_status != QProcess.ExitStatus.NormalExit or exit_code != 0:
             status = ExecutionStatus.FAILED
-        self.finished.emit(self.task, status, exit_code)
+        self._pid = 0
+        self._report_finished(status, exit_code)
+        self.completed.emit()
         if self._process:
             self._process.deleteLater()
             self._process = None
 
     def _on_error(self, process_error: QProcess.ProcessError) -> None:
-        self.error.emit(self.task, f"Erreur du processus: {process_error}")
+        if process_error != QProcess.ProcessError.FailedToStart:
+            for task in self.tasks:
+                self.error.emit(task, f"Erreur du processus: {process_error}")
+            return
+        reason = self._process.errorString() if self._process else ""
+        for task in self.tasks:
+            self.error.emit(task, f"Impossible de démarrer le processus : {reason}")
+        # QProcess n'émet pas finished dans ce cas : libérer le créneau du WorkerPool.
+        self._report_finished(ExecutionStatus.FAILED, -1)
+        self.completed.emit()
+        if self._process:
+            self._process.deleteLater()
+            self._process = None
+
+    # --- Points d'extension (exécution par paquets) ---
+    def _report_started(self) -> None:
+        self.started.emit(self.task, self.command_as_string())
+
+    def _handle_output(self, lines: List[str], is_error: bool) -> None:
+        self.output_received.emit(self.task, lines, is_error)
+
+    def _report_finished(self, status: ExecutionStatus, exit_code: int) -> None:
+        self.finished.emit(self.task, status, exit_code)
 
     def command_as_string(self) -> str:
         return " ".join(shlex.quote(part) for part in self.command)
@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+from .models import DatabaseTask
+from .process_runner import ProcessRunner
+
+try:  # Échantillonnage hors Linux (Windows, macOS).
+    import psutil  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    psutil = None
+
+DEFAULT_SAMPLE_INTERVAL_MS = 1000
+# Nombre d'échantillons conservés par tâche.
+SAMPLE_HISTORY = 120
+# Les descendants d'un processus ne sont recherchés qu'un échantillon sur N : parcourir
+# /proc/<pid>/task coûte un fichier par thread, et une JVM en compte des centaines.
+DESCENDANTS_REFRESH_TICKS = 10
+
+_PROC = "/proc"
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass
+class ProcessSample:
+    timestamp: float
+    cpu_percent: float
+    rss_bytes: int
+    read_bytes: int
+    write_bytes: int
+
+
+@dataclass
+class TaskUsage:
+    """Resource usage of the process (and child processes) running a task."""
+
+    task: DatabaseTask
+    current: Optional[ProcessSample] = None
+    peak_cpu_percent: float = 0.0
+    peak_rss_bytes: int = 0
+    samples: Deque[ProcessSample] = field(default_factory=lambda: deque(maxlen=SAMPLE_HISTORY))
+
+    def add(self, sample: ProcessSample) -> None:
+        self.current = sample
+        self.samples.append(sample)
+        self.peak_cpu_percent = max(self.peak_cpu_percent, sample.cpu_percent)
+        self.peak_rss_bytes = max(self.peak_rss_bytes, sample.rss_bytes)
+
+
+# (temps CPU cumulé en secondes, RSS, octets lus, octets écrits)
+_RawUsage = Tuple[float, int, int, int]
+
+
+def sampling_supported() -> bool:
+    return sys.platform.startswith("linux") or psutil is not None
+
+
+def read_process_tree(pid: int, descendants: Optional[List[int]] = None) -> Optional[_RawUsage]:
+    """Cumulated CPU time, RSS and I/O of ``pid`` and its descendants.
+
+    ``descendants`` is a list previously returned by
+    :func:`process_descendants`; they are looked up again when omitted.
+    """
+
+    if pid <= 0:
+        return None
+    if descendants is None:
+        descendants = process_descendants(pid)
+    if sys.platform.startswith("linux"):
+        return _read_proc_tree(pid, descendants)
+    if psutil is not None:
+        return _read_psutil_tree(pid, descendants)
+    return None
+
+
+def process_descendants(pid: int) -> List[int]:
+    if pid <= 0:
+        return []
+    if sys.platform.startswith("linux"):
+        return _descendants(pid)
+    if psutil is not None:
+        try:
+            return [child.pid for child in psutil.Process(pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    return []
+
+
+class ProcessSampler(QObject):
+    """Polls the processes of the running tasks with a single shared timer.
+
+    Every tick reads the whole process tree of each tracked runner (the JVM
+    may fork helpers) and emits one ``sampled`` signal with the usage of all
+    the tasks, so that views refresh once per tick whatever the number of
+    processes.  The descendants of a runner are only searched again every
+    ``DESCENDANTS_REFRESH_TICKS`` ticks.  A batch runner's usage is reported
+    for each of its tasks.
+    """
+
+    sampled = Signal(list)
+
+    def __init__(self, interval_ms: int = DEFAULT_SAMPLE_INTERVAL_MS, parent: Optional[QObject] = None):
+        super().__init__(parent)
+        self._runners: List[ProcessRunner] = []
+        self._usage: Dict[str, TaskUsage] = {}
+        self._previous: Dict[int, Tuple[float, float]] = {}
+        # Descendants de chaque runner : pid racine, échantillons restants avant la prochaine recherche, pids.
+        self._descendants: Dict[int, Tuple[int, int, List[int]]] = {}
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._sample)
+
+    def track(self, runner: ProcessRunner) -> None:
+        if not sampling_supported():
+            return
+        self._runners.append(runner)
+        for task in runner.tasks:
+            self._usage[task.id()] = TaskUsage(task)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def usage(self, task: DatabaseTask) -> Optional[TaskUsage]:
+        return self._usage.get(task.id())
+
+    def release(self, task: DatabaseTask) -> Optional[TaskUsage]:
+        """Forget ``task`` and return its final usage (with its peaks)."""
+
+        return self._usage.pop(task.id(), None)
+
+    def untrack(self, runner: ProcessRunner) -> None:
+        """Stop polling ``runner`` once its process has exited."""
+        if runner in self._runners:
+            self._runners.remove(runner)
+        self._previous.pop(id(runner), None)
+        self._descendants.pop(id(runner), None)
+        if not self._runners:
+            self._timer.stop()
+
+    def _sample(self) -> None:
+        updated: List[TaskUsage] = []
+        now = time.monotonic()
+        for runner in self._runners:
+            pid = runner.process_id()
+            known_pid, countdown, descendants = self._descendants.get(id(runner), (0, 0, []))
+            if known_pid != pid or countdown <= 0:
+                countdown, descendants = DESCENDANTS_REFRESH_TICKS, process_descendants(pid)
+            self._descendants[id(runner)] = (pid, countdown - 1, descendants)
+            raw = read_process_tree(pid, descendants)
+            if raw is None:
+                continue
+            cpu_seconds, rss, read_bytes, write_bytes = raw
+            previous = self._previous.get(id(runner))
+            self._previous[id(runner)] = (now, cpu_seconds)
+            cpu_percent = 0.0
+            if previous is not None and now > previous[0]:
+                cpu_percent = max(0.0, (cpu_seconds - previous[1]) / (now - previous[0]) * 100.0)
+            sample = ProcessSample(time.time(), cpu_percent, rss, read_bytes, write_bytes)
+            for task in runner.tasks:
+                usage = self._usage.get(task.id())
+                if usage is not None:
+                    usage.add(sample)
+                    updated.append(usage)
+        if updated:
+            self.sampled.emit(updated)
+
+
+def _read_proc_tree(pid: int, descendants: List[int]) -> Optional[_RawUsage]:
+    root = _read_proc(pid)
+    if root is None:
+        return None
+    cpu, rss, read_bytes, write_bytes = root
+    # Un descendant terminé depuis la recherche est simplement ignoré.
+    for child in descendants:
+        usage = _read_proc(child)
+        if usage is not None:
+            cpu += usage[0]
+            rss += usage[1]
+            read_bytes += usage[2]
+            write_bytes += usage[3]
+    return cpu, rss, read_bytes, write_bytes
+
+
+def _read_proc(pid: int) -> Optional[_RawUsage]:
+    base = f"{_PROC}/{pid}"
+    try:
+        with open(f"{base}/stat", "rb") as handle:
+            stat = handle.read()
+        # Le nom du processus (champ 2) peut contenir des espaces : découper après la parenthèse.
+        fields = stat[stat.rindex(b")") + 2 :].split()
+        cpu = (int(fields[11]) + int(fields[12])) / _CLOCK_TICKS
+        rss = 0
+        with open(f"{base}/status", "rb") as handle:
+            for line in handle:
+                if line.startswith(b"VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        return None
+    read_bytes = write_bytes = 0
+    try:
+        with open(f"{base}/io", "rb") as handle:
+            for line in handle:
+                if line.startswith(b"read_bytes:"):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith(b"write_bytes:"):
+                    write_bytes = int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        # /proc/<pid>/io n'est lisible que par le propriétaire du processus.
+        pass
+    return cpu, rss, read_bytes, write_bytes
+
+
+def _descendants(pid: int) -> List[int]:
+    result: List[int] = []
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            threads = os.listdir(f"{_PROC}/{current}/task")
+        except OSError:
+            continue
+        for thread in threads:
+            try:
+                with open(f"{_PROC}/{current}/task/{thread}/children", "rb") as handle:
+                    children = [int(child) for child in handle.read().split()]
+            except (OSError, ValueError):
+                continue
+            result.extend(children)
+            pending.extend(children)
+    return result
+
+
+def _read_psutil_tree(pid: int, descendants: List[int]) -> Optional[_RawUsage]:
+    assert psutil is not None
+    try:
+        processes = [psutil.Process(pid)]
+    except psutil.Error:
+        return None
+    for child in descendants:
+        try:
+            processes.append(psutil.Process(child))
+        except psutil.Error:
+            continue
+    cpu = 0.0
+    rss = read_bytes = write_bytes = 0
+    for process in processes:
+        try:
+            with process.oneshot():
+                times = process.cpu_times()
+                cpu += times.user + times.system
+                rss += process.memory_info().rss
+                if hasattr(process, "io_counters"):
+                    counters = process.io_counters()
+                    read_bytes += counters.read_bytes
+                    write_bytes += counters.write_bytes
+        except psutil.Error:
+            continue
+    return cpu, rss, read_bytes, write_bytes
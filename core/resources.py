@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+from typing import Iterable, Optional
+
+# Empreinte mémoire moyenne d'une JVM Spring Boot lancée par l'orchestrateur.
+DEFAULT_TASK_MEMORY_BYTES = 512 * 1024 * 1024
+# Mémoire d'une JVM au-delà de son tas (metaspace, code compilé, piles des threads).
+JVM_NON_HEAP_FACTOR = 1.25
+# Part de la mémoire disponible au démarrage laissée au système et aux autres applications.
+MEMORY_HEADROOM_FRACTION = 0.1
+
+_MEMORY_SIZE = re.compile(r"^(\d+)([kKmMgGtT]?)$")
+_MEMORY_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+
+
+def cpu_count() -> int:
+    try:
+        return max(1, len(os.sched_getaffinity(0)))  # type: ignore[attr-defined]
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def available_memory_bytes() -> Optional[int]:
+    """Return the memory currently available to new processes, if known."""
+
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/meminfo", "r", encoding="ascii") as handle:
+                for line in handle:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        return None
+    if sys.platform == "win32":
+        import ctypes
+
+        class _MemoryStatus(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        status = _MemoryStatus()
+        status.dwLength = ctypes.sizeof(_MemoryStatus)
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):  # type: ignore[attr-defined]
+            return int(status.ullAvailPhys)
+        return None
+    try:
+        pages = os.sysconf("SC_AVPHYS_PAGES")
+        page_size = os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return None
+    if pages <= 0 or page_size <= 0:
+        return None
+    return int(pages * page_size)
+
+
+def default_max_parallel(task_memory_bytes: int = DEFAULT_TASK_MEMORY_BYTES) -> int:
+    """Number of concurrent JVMs the machine can host without swapping.
+
+    One slot per CPU, further limited by the free memory divided by the
+    expected footprint of a single task.
+    """
+
+    limit = cpu_count()
+    memory = available_memory_bytes()
+    if memory is not None and task_memory_bytes > 0:
+        limit = min(limit, memory // task_memory_bytes)
+    return max(1, int(limit))
+
+
+def parse_memory_size(value: str) -> Optional[int]:
+    """Bytes of a JVM memory size such as ``512m`` or ``2G``."""
+
+    match = _MEMORY_SIZE.match(value.strip())
+    if not match:
+        return None
+    return int(match.group(1)) * _MEMORY_UNITS[match.group(2).lower()]
+
+
+def max_heap_bytes(jvm_options: Iterable[str]) -> Optional[int]:
+    """Heap cap set by the last ``-Xmx`` option, as the JVM applies it."""
+
+    heap: Optional[int] = None
+    for option in jvm_options:
+        if option.startswith("-Xmx"):
+            heap = parse_memory_size(option[4:]) or heap
+    return heap
+
+
+def default_memory_budget() -> Optional[int]:
+    """Memory the tasks may reserve: what is available now, minus some headroom."""
+
+    memory = available_memory_bytes()
+    if memory is None:
+        return None
+    return int(memory * (1 - MEMORY_HEADROOM_FRACTION))
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import math
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from .hashing import file_sha256
+from .paths import app_data_dir
+
+DEFAULT_HISTORY_RUNS = 20
+# Bases par requête de lecture groupée (limite de paramètres des anciennes versions de SQLite : 999).
+_QUERY_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    jar_path TEXT NOT NULL,
+    jar_hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs(id),
+    lot TEXT NOT NULL,
+    database TEXT NOT NULL,
+    status TEXT NOT NULL,
+    exit_code INTEGER NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    log_bytes INTEGER NOT NULL,
+    peak_rss INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_database ON tasks(database, started_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_run ON tasks(run_id);
+CREATE INDEX IF NOT EXISTS idx_runs_started ON runs(started_at);
+"""
+
+
+@dataclass
+class DurationStats:
+    database: str
+    runs: int
+    p50: float
+    p95: float
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Linear-interpolated percentile of ``values`` (``fraction`` in [0, 1])."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * fraction
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _migrate(connection: sqlite3.Connection) -> None:
+    """Add the columns introduced after the creation of an existing history."""
+
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}
+    if "peak_rss" not in columns:
+        connection.execute("ALTER TABLE tasks ADD COLUMN peak_rss INTEGER")
+
+
+class RunHistoryStore:
+    """Local SQLite history of the runs: one row per run and per task.
+
+    Writes are queued and applied by a background thread so that callers
+    (the GUI thread) never wait on the disk.  Reads use a connection owned by
+    the calling thread; the database runs in WAL mode so both can proceed
+    concurrently.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self._path = path or app_data_dir() / "history.sqlite3"
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._queue: "queue.Queue[Optional[Callable[[sqlite3.Connection], None]]]" = queue.Queue()
+        self._local = threading.local()
+        connection = self._connect()
+        connection.executescript(_SCHEMA)
+        _migrate(connection)
+        connection.commit()
+        self._writer = threading.Thread(target=self._write_loop, name="run-history-writer", daemon=True)
+        self._writer.start()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    # --- Écriture (asynchrone) ---
+    def begin_run(self, run_id: str, jar_path: str, started_at: Optional[float] = None) -> None:
+        started = time.time() if started_at is None else started_at
+
+        def write(connection: sqlite3.Connection) -> None:
+            # Le hachage du jar est fait ici pour ne pas bloquer l'appelant.
+            jar_hash = file_sha256(Path(jar_path).expanduser())
+            connection.execute(
+                "INSERT OR REPLACE INTO runs (id, started_at, jar_path, jar_hash) VALUES (?, ?, ?, ?)",
+                (run_id, started, jar_path, jar_hash),
+            )
+
+        self._queue.put(write)
+
+    def record_task(
+        self,
+        run_id: str,
+        lot: str,
+        database: str,
+        status: str,
+        exit_code: int,
+        started_at: float,
+        duration: float,
+        log_bytes: int,
+        peak_rss: Optional[int] = None,
+    ) -> None:
+        row = (run_id, lot, database, status, exit_code, started_at, duration, log_bytes, peak_rss)
+        self._queue.put(
+            lambda connection: connection.execute(
+                "INSERT INTO tasks (run_id, lot, database, status, exit_code, started_at, duration, log_bytes, peak_rss)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+        )
+
+    def end_run(self, run_id: str, finished_at: Optional[float] = None) -> None:
+        finished = time.time() if finished_at is None else finished_at
+        self._queue.put(
+            lambda connection: connection.execute("UPDATE runs SET finished_at = ? WHERE id = ?", (finished, run_id))
+        )
+
+    def flush(self) -> None:
+        """Block until every queued write has been committed."""
+
+        self._queue.join()
+
+    def close(self) -> None:
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+    # --- Lecture ---
+    def duration_stats(self, database: str, last_runs: int = DEFAULT_HISTORY_RUNS) -> Optional[DurationStats]:
+        durations = self._recent_durations(database, last_runs)
+        if not durations:
+            return None
+        return DurationStats(database, len(durations), percentile(durations, 0.5), percentile(durations, 0.95))
+
+    def duration_percentiles(
+        self,
+        databases: Sequence[Path],
+        fraction: float = 0.5,
+        last_runs: int = DEFAULT_HISTORY_RUNS,
+    ) -> Dict[str, float]:
+        """Percentile of the successful durations of each database that has a history."""
+
+        recent = self._recent_values("duration", "status = 'SUCCEEDED'", databases, last_runs)
+        return {database: percentile(durations, fraction) for database, durations in recent.items()}
+
+    def peak_rss_percentiles(
+        self,
+        databases: Sequence[Path],
+        fraction: float = 0.95,
+        last_runs: int = DEFAULT_HISTORY_RUNS,
+    ) -> Dict[str, int]:
+        """Percentile of the peak resident memory (bytes) of each database that has one recorded."""
+
+        recent = self._recent_values("peak_rss", "peak_rss IS NOT NULL", databases, last_runs)
+        return {database: int(percentile(peaks, fraction)) for database, peaks in recent.items()}
+
+    def recent_runs(self, limit: int = 20) -> List[sqlite3.Row]:
+        cursor = self._connect().execute(
+            "SELECT id, started_at, finished_at, jar_path, jar_hash FROM runs ORDER BY started_at DESC LIMIT ?",
+            (limit,),
+        )
+        return cursor.fetchall()
+
+    def _recent_durations(self, database: str, last_runs: int) -> List[float]:
+        cursor = self._connect().execute(
+            "SELECT duration FROM tasks WHERE database = ? AND status = 'SUCCEEDED'"
+            " ORDER BY started_at DESC LIMIT ?",
+            (database, last_runs),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def _recent_values(
+        self, column: str, condition: str, databases: Sequence[Path], last_runs: int
+    ) -> Dict[str, List[float]]:
+        """``column`` of the ``last_runs`` latest rows matching ``condition``, for many databases at once.
+
+        One query per chunk of databases instead of one per database; the rows
+        come in index order (base, most recent first) and are cut in Python.
+        """
+
+        keys = list(dict.fromkeys(str(database) for database in databases))
+        values: Dict[str, List[float]] = {}
+        connection = self._connect()
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            cursor = connection.execute(
+                f"SELECT database, {column} FROM tasks WHERE database IN ({placeholders}) AND {condition}"
+                " ORDER BY database, started_at DESC",
+                chunk,
+            )
+            for database, value in cursor:
+                recent = values.get(database)
+                if recent is None:
+                    values[database] = [value]
+                elif len(recent) < last_runs:
+                    recent.append(value)
+        return values
+
+    # --- Interne ---
+    def _connect(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(str(self._path), timeout=30)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def _write_loop(self) -> None:
+        connection = self._connect()
+        stopping = False
+        while not stopping:
+            batch = [self._queue.get()]
+            # Regrouper les écritures déjà en attente dans la même transaction.
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for operation in batch:
+                if operation is None:
+                    stopping = True
+                    continue
+                try:
+                    operation(connection)
+                except (sqlite3.Error, OSError):
+                    pass
+            try:
+                connection.commit()
+            except sqlite3.Error:
+                connection.rollback()
+            for _ in batch:
+                self._queue.task_done()
+        connection.close()
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from enum import Enum
+from pathlib import Path
+from statistics import median
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Durées connues (en secondes) pour les bases demandées, indexées par chemin.
+DurationLookup = Callable[[Sequence[Path]], Dict[str, float]]
+
+
+class SchedulingPolicy(Enum):
+    NAME = "name"
+    LONGEST_FIRST = "longest_first"
+
+
+class CostEstimator:
+    """Estimate how long each database will take and order the dispatch.
+
+    Past durations win when they are known: the ones measured during this
+    session first, then the ones returned by the optional ``duration_lookup``.
+    Databases without history are estimated from their file size, scaled by
+    the seconds-per-byte observed on the databases that do have one.
+    """
+
+    def __init__(self, duration_lookup: Optional[DurationLookup] = None):
+        self._duration_lookup = duration_lookup
+        self._session_durations: Dict[str, float] = {}
+
+    def set_duration_lookup(self, lookup: Optional[DurationLookup]) -> None:
+        self._duration_lookup = lookup
+
+    def record(self, database: Path, seconds: float) -> None:
+        self._session_durations[str(database)] = seconds
+
+    def order(
+        self, databases: Sequence[Path], policy: SchedulingPolicy, sizes: Optional[Dict[str, int]] = None
+    ) -> List[Path]:
+        if policy == SchedulingPolicy.NAME or len(databases) < 2:
+            return list(databases)
+        costs = self.estimate(databases, sizes)
+        return sorted(databases, key=lambda db: (-costs[str(db)], str(db)))
+
+    def estimate(self, databases: Sequence[Path], sizes: Optional[Dict[str, int]] = None) -> Dict[str, float]:
+        """Cost of each database; ``sizes`` (by path) avoids a ``stat`` per file when already known."""
+
+        known: Dict[str, float] = {}
+        if self._duration_lookup is not None:
+            known.update(self._duration_lookup(databases))
+        for db in databases:
+            duration = self._session_durations.get(str(db))
+            if duration is not None:
+                known[str(db)] = duration
+
+        known_sizes = sizes or {}
+        sizes = {str(db): known_sizes[str(db)] if str(db) in known_sizes else _file_size(db) for db in databases}
+        known_bytes = sum(sizes[key] for key in known if key in sizes)
+        known_seconds = sum(seconds for key, seconds in known.items() if key in sizes)
+        seconds_per_byte = known_seconds / known_bytes if known_bytes and known_seconds else None
+        fallback = median(known.values()) if known else 0.0
+
+        costs: Dict[str, float] = {}
+        for key, size in sizes.items():
+            if key in known:
+                costs[key] = known[key]
+            elif not known:
+                # Aucun historique : la taille seule suffit à comparer les bases.
+                costs[key] = float(size)
+            elif seconds_per_byte is not None and size:
+                costs[key] = size * seconds_per_byte
+            else:
+                costs[key] = fallback
+        return costs
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
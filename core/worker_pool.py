@@ -1,48 +1,293 @@
 from __future__ import annotations
 
-from typing import Dict, Iterable, List, Optional
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QCoreApplication, QMetaObject, QObject, Qt, QThread, Signal
 
+from .diagnostics import timed
 from .models import DatabaseTask, ExecutionStatus
 from .process_runner import ProcessRunner
+from .resources import default_max_parallel
+
+_MB = 1024 * 1024
 
 
 class WorkerPool(QObject):
+    """Admission queue in front of the processes launched for the tasks.
+
+    Runners are queued in submission order and started as soon as a slot is
+    free; a runner takes one slot whatever the number of tasks it carries.
+    The global cap can be further restricted per group (one group per lot),
+    a runner whose group is full lets the following runners of other groups
+    go first while keeping the order inside its own group.
+
+    With a memory budget, a runner is also admitted only if its
+    ``memory_bytes`` fit next to the reservations of the running ones; the
+    queue then waits, in order, for enough memory to be released.  A runner
+    is always admitted when nothing runs, whatever its estimate.
+
+    Processes are started asynchronously, optionally from a dedicated
+    launcher thread (:meth:`set_launch_thread`); the runner signals are then
+    delivered to the pool's thread through queued connections, so every
+    bookkeeping step below still runs on the thread that owns the pool.
+    """
+
     task_started = Signal(DatabaseTask, str)
-    task_output = Signal(DatabaseTask, str, bool)
+    task_output = Signal(DatabaseTask, list, bool)
     task_finished = Signal(DatabaseTask, ExecutionStatus, int)
     task_error = Signal(DatabaseTask, str)
+    queue_changed = Signal(int, int)
+    group_dispatched = Signal(str)
+    # Émis (dans le thread du pool) lorsque le processus d'un runner est terminé.
+    runner_completed = Signal(object)
+    # Mémoire réservée et budget, en Mo (0 : pas de budget).
+    budget_changed = Signal(int, int)
 
-    def __init__(self, parent: Optional[QObject] = None):
+    def __init__(self, max_parallel: Optional[int] = None, parent: Optional[QObject] = None):
         super().__init__(parent)
+        self._active: List[ProcessRunner] = []
+        # Tâches encore en cours, par identifiant, vers leur runner.
         self._runners: Dict[str, ProcessRunner] = {}
+        self._queue: Deque[ProcessRunner] = deque()
+        self._group_limits: Dict[str, int] = {}
+        self._group_running: Dict[str, int] = {}
+        self._runner_groups: Dict[ProcessRunner, str] = {}
+        self._group_queued: Dict[str, int] = {}
+        # Tâches portées par les runners en attente (un paquet en compte plusieurs).
+        self._queued_tasks = 0
+        self._draining = False
+        self._launch_hook: Optional[Callable[[ProcessRunner], None]] = None
+        self._memory_budget: Optional[int] = None
+        self._reserved_memory = 0
+        self._launcher: Optional[QThread] = None
+        self._launch_in_thread = False
+        self._max_parallel = 1
+        self.set_max_parallel(max_parallel)
+
+    def max_parallel(self) -> int:
+        return self._max_parallel
+
+    def set_max_parallel(self, value: Optional[int]) -> None:
+        """Set the global cap; ``None`` or ``0`` selects the machine default."""
+
+        self._max_parallel = value if value and value > 0 else default_max_parallel()
+        self._drain()
+
+    def memory_budget(self) -> Optional[int]:
+        return self._memory_budget
+
+    def reserved_memory(self) -> int:
+        return self._reserved_memory
+
+    def set_memory_budget(self, budget: Optional[int]) -> None:
+        """Bytes the running processes may reserve; ``None`` disables the budget."""
+
+        self._memory_budget = budget if budget and budget > 0 else None
+        self._emit_budget_changed()
+        self._drain()
+
+    def set_group_limit(self, group: str, limit: Optional[int]) -> None:
+        if limit and limit > 0:
+            self._group_limits[group] = limit
+        else:
+            self._group_limits.pop(group, None)
+        self._drain()
+
+    def set_launch_hook(self, hook: Optional[Callable[[ProcessRunner], None]]) -> None:
+        """Call ``hook`` with each runner right before its process is started."""
+
+        self._launch_hook = hook
+
+    def set_launch_thread(self, enabled: bool) -> None:
+        """Start the processes from a dedicated thread instead of the pool's thread."""
+
+        self._launch_in_thread = enabled
+        if enabled and self._launcher is None:
+            # Conservé jusqu'à la fin de l'application : des runners peuvent encore y vivre.
+            self._launcher = QThread()
+            self._launcher.setObjectName("process-launcher")
+            self._launcher.start()
+            app = QCoreApplication.instance()
+            if app is not None:
+                app.aboutToQuit.connect(self._stop_launcher)
 
     def active_tasks(self) -> List[str]:
         return list(self._runners.keys())
 
-    def start_runner(self, runner: ProcessRunner) -> None:
-        task_id = runner.task.id()
-        self._runners[task_id] = runner
-        runner.started.connect(self.task_started)
-        runner.stdout_received.connect(lambda task, text: self.task_output.emit(task, text, False))
-        runner.stderr_received.connect(lambda task, text: self.task_output.emit(task, text, True))
-        runner.finished.connect(self._on_finished)
-        runner.error.connect(self.task_error)
-        runner.start()
+    def queued_count(self, group: Optional[str] = None) -> int:
+        if group is None:
+            return len(self._queue)
+        return self._group_queued.get(group, 0)
+
+    def queued_task_count(self) -> int:
+        return self._queued_tasks
+
+    def running_count(self) -> int:
+        return len(self._active)
+
+    def start_runner(self, runner: ProcessRunner, group: str = "") -> None:
+        self.submit([runner], group)
+
+    def submit(self, runners: Iterable[ProcessRunner], group: str = "") -> None:
+        """Queue ``runners`` for ``group``.
+
+        ``group_dispatched`` is emitted once every queued runner of the group
+        has been handed a slot, including when that happens immediately.
+        """
+
+        queued = False
+        for runner in runners:
+            self._runner_groups[runner] = group
+            self._queue.append(runner)
+            self._group_queued[group] = self._group_queued.get(group, 0) + 1
+            self._queued_tasks += len(runner.tasks)
+            queued = True
+        if queued:
+            self._drain()
 
     def stop_all(self) -> None:
-        for runner in list(self._runners.values()):
-            runner.terminate()
+        queued = list(self._queue)
+        self._queue.clear()
+        self._group_queued.clear()
+        self._queued_tasks = 0
+        self._runner_groups = {
+            runner: group for runner, group in self._runner_groups.items() if runner in self._active
+        }
+        self._emit_queue_changed()
+        # Comme stop_task : les tâches en attente sont terminées comme arrêtées.
+        for runner in queued:
+            runner.deleteLater()
+            for task in runner.tasks:
+                self.task_finished.emit(task, ExecutionStatus.STOPPED, -1)
+        for runner in list(self._active):
+            self._terminate(runner)
 
     def stop_task(self, task: DatabaseTask) -> None:
         runner = self._runners.get(task.id())
         if runner:
+            self._terminate(runner)
+            return
+        for queued in list(self._queue):
+            if any(queued_task.id() == task.id() for queued_task in queued.tasks):
+                # Un paquet en attente est retiré en entier.
+                self._queue.remove(queued)
+                self._queued_tasks -= len(queued.tasks)
+                group = self._runner_groups.pop(queued, "")
+                queued.deleteLater()
+                self._emit_queue_changed()
+                for queued_task in queued.tasks:
+                    self.task_finished.emit(queued_task, ExecutionStatus.STOPPED, -1)
+                if self._dequeued(group):
+                    self.group_dispatched.emit(group)
+                return
+
+    @timed
+    def _drain(self) -> None:
+        # Un runner peut se terminer pendant son lancement : la boucle en cours
+        # reprend alors le créneau libéré.
+        if self._draining:
+            return
+        self._draining = True
+        started = False
+        dispatched_groups: List[str] = []
+        index = 0
+        blocked_groups: set[str] = set()
+        try:
+            while index < len(self._queue) and len(self._active) < self._max_parallel:
+                runner = self._queue[index]
+                group = self._runner_groups.get(runner, "")
+                if group in blocked_groups or not self._group_has_capacity(group):
+                    blocked_groups.add(group)
+                    index += 1
+                    continue
+                if not self._fits_in_budget(runner):
+                    # Pas de dépassement par des tâches plus petites : la file attend.
+                    break
+                del self._queue[index]
+                self._queued_tasks -= len(runner.tasks)
+                if self._dequeued(group):
+                    dispatched_groups.append(group)
+                self._launch(runner, group)
+                started = True
+        finally:
+            self._draining = False
+        if started:
+            self._emit_queue_changed()
+        # Émis après la boucle : un récepteur peut soumettre de nouveaux runners.
+        for group in dispatched_groups:
+            self.group_dispatched.emit(group)
+
+    def _dequeued(self, group: str) -> bool:
+        """Account for a runner leaving the queue; ``True`` when its group is drained."""
+
+        remaining = self._group_queued.get(group, 0) - 1
+        if remaining > 0:
+            self._group_queued[group] = remaining
+            return False
+        self._group_queued.pop(group, None)
+        return True
+
+    def _group_has_capacity(self, group: str) -> bool:
+        limit = self._group_limits.get(group)
+        return limit is None or self._group_running.get(group, 0) < limit
+
+    def _fits_in_budget(self, runner: ProcessRunner) -> bool:
+        if self._memory_budget is None or not self._active:
+            return True
+        return self._reserved_memory + runner.memory_bytes <= self._memory_budget
+
+    def _launch(self, runner: ProcessRunner, group: str) -> None:
+        self._active.append(runner)
+        self._reserved_memory += runner.memory_bytes
+        for task in runner.tasks:
+            self._runners[task.id()] = runner
+        self._group_running[group] = self._group_running.get(group, 0) + 1
+        # Méthodes liées plutôt que lambdas : livrées dans le thread du pool.
+        runner.started.connect(self.task_started)
+        runner.output_received.connect(self.task_output)
+        runner.finished.connect(self._on_finished)
+        runner.completed.connect(self._on_completed)
+        runner.error.connect(self.task_error)
+        if self._launch_hook is not None:
+            self._launch_hook(runner)
+        if not self._launch_in_thread or self._launcher is None:
+            runner.start()
+            return
+        runner.moveToThread(self._launcher)
+        QMetaObject.invokeMethod(runner, "start", Qt.QueuedConnection)
+
+    def _terminate(self, runner: ProcessRunner) -> None:
+        if runner.thread() is QThread.currentThread():
             runner.terminate()
+        else:
+            QMetaObject.invokeMethod(runner, "terminate", Qt.QueuedConnection)
+
+    def _stop_launcher(self) -> None:
+        if self._launcher is not None:
+            self._launcher.quit()
+            self._launcher.wait()
 
     def _on_finished(self, task: DatabaseTask, status: ExecutionStatus, exit_code: int) -> None:
-        task_id = task.id()
-        runner = self._runners.pop(task_id, None)
-        if runner:
-            runner.deleteLater()
+        self._runners.pop(task.id(), None)
         self.task_finished.emit(task, status, exit_code)
+
+    def _on_completed(self) -> None:
+        runner = self.sender()
+        if not isinstance(runner, ProcessRunner) or runner not in self._active:
+            return
+        self._active.remove(runner)
+        self._reserved_memory = max(0, self._reserved_memory - runner.memory_bytes)
+        group = self._runner_groups.pop(runner, "")
+        self._group_running[group] = max(0, self._group_running.get(group, 0) - 1)
+        runner.deleteLater()
+        self.runner_completed.emit(runner)
+        self._drain()
+        self._emit_queue_changed()
+
+    def _emit_queue_changed(self) -> None:
+        self.queue_changed.emit(len(self._active), len(self._queue))
+        self._emit_budget_changed()
+
+    def _emit_budget_changed(self) -> None:
+        self.budget_changed.emit(self._reserved_memory // _MB, (self._memory_budget or 0) // _MB)
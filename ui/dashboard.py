@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional, Set
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer
+from PySide6.QtGui import QBrush, QColor
 from PySide6.QtWidgets import (
     QAbstractItemView,
     QFrame,
@@ -12,12 +13,15 @@ from PySide6.QtWidgets import (
     QHeaderView,
     QLabel,
     QSizePolicy,
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QVBoxLayout,
 )
 
+from core.diagnostics import timed
+from core.discovery import DiscoveredFile, DiscoveryKey, DiscoveryService, LotSnapshot, discovery_key
+from core.log_parser import ParsedOutput
 from core.models import DatabaseTask, ExecutionStatus, LotConfig
+from core.process_sampler import TaskUsage
 
 
 @dataclass
@@ -25,6 +29,8 @@ class LotProgress:
     lot: LotConfig
     total_databases: int
     detected_files: List[str] = field(default_factory=list)
+    # Recherche des bases du lot en cours, sans résultat encore connu.
+    discovering: bool = False
     processed: int = 0
     running: int = 0
     succeeded: int = 0
@@ -32,6 +38,20 @@ class LotProgress:
     skipped: bool = False
     status: str = field(default="En attente", init=False)
     total_elapsed_seconds: float = 0.0
+    overlaps: List[str] = field(default_factory=list)
+    # Consommation des processus en cours du lot et pics observés.
+    cpu_percent: float = 0.0
+    rss_bytes: int = 0
+    peak_cpu_percent: float = 0.0
+    peak_rss_bytes: int = 0
+    read_bytes: int = 0
+    write_bytes: int = 0
+    # E/S des tâches terminées du lot.
+    finished_read_bytes: int = 0
+    finished_write_bytes: int = 0
+    # Événements WARN et ERROR/FATAL relevés dans la sortie des tâches.
+    log_warnings: int = 0
+    log_errors: int = 0
 
     def reset(self) -> None:
         self.processed = 0
@@ -41,17 +61,226 @@ class LotProgress:
         self.skipped = False
         self.status = "En attente"
         self.total_elapsed_seconds = 0.0
+        self.overlaps = []
+        self.cpu_percent = 0.0
+        self.rss_bytes = 0
+        self.peak_cpu_percent = 0.0
+        self.peak_rss_bytes = 0
+        self.read_bytes = 0
+        self.write_bytes = 0
+        self.finished_read_bytes = 0
+        self.finished_write_bytes = 0
+        self.log_warnings = 0
+        self.log_errors = 0
+
+
+# Intervalle minimal entre deux rafraîchissements du tableau de bord.
+REFRESH_INTERVAL_MS = 250
+# Fichiers listés dans l'infobulle de la colonne « Fichiers détectés ».
+MAX_LISTED_FILES = 50
+
+COLUMNS = [
+    "Nom",
+    "Dossier",
+    "Pattern",
+    "Fichiers détectés",
+    "Bases totales",
+    "Traitées",
+    "En cours",
+    "Erreurs",
+    "Temps cumulé",
+    "CPU",
+    "Mémoire",
+    "E/S",
+    "Chevauchement",
+    "Alertes",
+    "Statut",
+]
+ALERTS_COLUMN = 13
+
+_PENDING, _RUNNING, _DONE = "pending", "running", "done"
+
+
+def _status_bucket(progress: LotProgress) -> str:
+    if progress.skipped or progress.status.startswith("Terminé"):
+        return _DONE
+    if progress.status == "En cours":
+        return _RUNNING
+    if progress.status == "En attente":
+        return _PENDING
+    return ""
+
+
+def _format_memory(megabytes: int) -> str:
+    if megabytes >= 1024:
+        return f"{megabytes / 1024:.1f} Go".replace(".", ",")
+    return f"{megabytes} Mo"
+
+
+def _format_elapsed(elapsed_seconds: float) -> str:
+    if elapsed_seconds <= 0:
+        return "-"
+    total_seconds = int(round(elapsed_seconds))
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+def _format_cpu(progress: LotProgress) -> str:
+    if progress.peak_cpu_percent <= 0:
+        return "-"
+    return f"{progress.cpu_percent:.0f} % (pic {progress.peak_cpu_percent:.0f} %)"
+
+
+def _format_rss(progress: LotProgress) -> str:
+    if progress.peak_rss_bytes <= 0:
+        return "-"
+    current = _format_memory(progress.rss_bytes // (1024 * 1024))
+    return f"{current} (pic {_format_memory(progress.peak_rss_bytes // (1024 * 1024))})"
+
+
+def _format_io(progress: LotProgress) -> str:
+    if not progress.read_bytes and not progress.write_bytes:
+        return "-"
+    read = _format_memory(progress.read_bytes // (1024 * 1024))
+    written = _format_memory(progress.write_bytes // (1024 * 1024))
+    return f"L {read} / É {written}"
+
+
+def _format_files(progress: LotProgress) -> str:
+    files = progress.detected_files
+    if progress.discovering:
+        return f"Recherche des bases... ({len(files)})" if files else "Recherche des bases..."
+    if not files:
+        return "Aucun fichier trouvé"
+    if len(files) == 1:
+        return files[0]
+    return f"{len(files)} fichiers ({files[0]}, ...)"
+
+
+class LotTableModel(QAbstractTableModel):
+    """Une ligne par lot ; le texte des cellules est calculé à l'affichage."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[LotProgress] = []
+
+    def set_rows(self, rows: List[LotProgress]) -> None:
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def row_changed(self, row: int) -> None:
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        progress = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return self._display(progress, column)
+        if role == Qt.ToolTipRole:
+            if column == 3 and progress.detected_files:
+                listed = progress.detected_files[:MAX_LISTED_FILES]
+                more = len(progress.detected_files) - len(listed)
+                return "\n".join(listed) + (f"\n... et {more} autre(s)" if more > 0 else "")
+            if column == ALERTS_COLUMN and (progress.log_warnings or progress.log_errors):
+                return "Lignes ERROR/FATAL et WARN dans la sortie des tâches du lot"
+            return None
+        if column == ALERTS_COLUMN and role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            if progress.log_errors:
+                color = "#F2DEDE" if role == Qt.BackgroundRole else "#A94442"
+            elif progress.log_warnings:
+                color = "#FCF8E3" if role == Qt.BackgroundRole else "#8A6D3B"
+            else:
+                return None
+            return QBrush(QColor(color))
+        return None
+
+    def _display(self, progress: LotProgress, column: int) -> str:
+        lot = progress.lot
+        if column == 0:
+            return lot.name
+        if column == 1:
+            return lot.databases_path
+        if column == 2:
+            return lot.pattern
+        if column == 3:
+            return _format_files(progress)
+        if column == 4:
+            return str(progress.total_databases)
+        if column == 5:
+            return f"{progress.processed}/{progress.total_databases}"
+        if column == 6:
+            return str(progress.running)
+        if column == 7:
+            return str(progress.failed)
+        if column == 8:
+            return _format_elapsed(progress.total_elapsed_seconds)
+        if column == 9:
+            return _format_cpu(progress)
+        if column == 10:
+            return _format_rss(progress)
+        if column == 11:
+            return _format_io(progress)
+        if column == 12:
+            return ", ".join(progress.overlaps) if progress.overlaps else "-"
+        if column == ALERTS_COLUMN:
+            if not progress.log_warnings and not progress.log_errors:
+                return "-"
+            return f"{progress.log_errors} erreur(s), {progress.log_warnings} avert."
+        return progress.status
 
 
 class DashboardWidget(QFrame):
-    """Widget qui présente un récapitulatif visuel de l'état des lots."""
+    """Widget qui présente un récapitulatif visuel de l'état des lots.
 
-    def __init__(self, parent=None):
+    Chaque événement met à jour l'état du lot concerné et les totaux du
+    résumé de façon incrémentale, puis marque la ligne à rafraîchir ; les
+    lignes modifiées sont signalées à la vue au plus toutes les
+    ``REFRESH_INTERVAL_MS`` millisecondes.  Les bases des lots viennent du
+    service de découverte, en arrière-plan : le tableau affiche le dernier
+    résultat connu et se met à jour quand une recherche se termine.
+    """
+
+    def __init__(self, discovery: Optional[DiscoveryService] = None, parent=None):
         super().__init__(parent)
+        self._discovery = discovery or DiscoveryService(parent=self)
+        self._discovery.lot_discovered.connect(self._on_lot_discovered)
+        self._discovery.files_found.connect(self._on_files_found)
         self._lot_rows: List[str] = []
+        self._lot_keys: Dict[str, DiscoveryKey] = {}
         self._progress: Dict[str, LotProgress] = {}
+        self._row_of: Dict[str, int] = {}
         self._summary_labels: Dict[str, QLabel] = {}
         self._task_start_times: Dict[str, float] = {}
+        self._running_lots: List[str] = []
+        self._task_usage: Dict[str, TaskUsage] = {}
+        # Totaux du résumé, tenus à jour à chaque changement d'un lot.
+        self._databases_total = 0
+        self._bucket_counts: Dict[str, int] = {_PENDING: 0, _RUNNING: 0, _DONE: 0}
+        self._errors_total = 0
+        self._dirty_rows: Set[int] = set()
+        self._summary_dirty = False
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self._flush_refresh)
 
         self.setFrameShape(QFrame.StyledPanel)
         self.setObjectName("dashboardFrame")
@@ -77,6 +306,7 @@ class DashboardWidget(QFrame):
             ("Lots en cours", "lots_running"),
             ("Lots en attente", "lots_pending"),
             ("Erreurs cumulées", "errors"),
+            ("Mémoire réservée", "memory"),
         ]
         for index, (label, key) in enumerate(metrics):
             column = index
@@ -101,48 +331,35 @@ class DashboardWidget(QFrame):
         summary_layout.setColumnStretch(3, 1)
         summary_layout.setColumnStretch(4, 1)
         summary_layout.setColumnStretch(5, 1)
+        summary_layout.setColumnStretch(6, 1)
+        self._summary_labels["memory"].setText("—")
+        self._summary_labels["memory"].setToolTip("Mémoire réservée par les tâches en cours / budget mémoire")
 
         parent_layout.addWidget(summary_frame)
 
     def _build_table(self, parent_layout: QVBoxLayout) -> None:
-        self._table = QTableWidget(0, 10)
-        self._table.setHorizontalHeaderLabels(
-            [
-                "Nom",
-                "Dossier",
-                "Pattern",
-                "Fichiers détectés",
-                "Bases totales",
-                "Traitées",
-                "En cours",
-                "Erreurs",
-                "Temps cumulé",
-                "Statut",
-            ]
-        )
+        self._model = LotTableModel(self)
+        self._table = QTableView()
+        self._table.setModel(self._model)
         self._table.verticalHeader().setVisible(False)
         self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self._table.setSelectionMode(QAbstractItemView.SingleSelection)
         self._table.setAlternatingRowColors(True)
-        self._table.setWordWrap(True)
+        self._table.setWordWrap(False)
         self._table.setToolTip(
             "Synthèse des lots chargés : configuration et progression en temps réel."
         )
         header = self._table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        # Largeurs calculées une fois par chargement (set_lots) : ResizeToContents
+        # mesurerait toutes les lignes à chaque rafraîchissement.
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(1, QHeaderView.Stretch)
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)
         header.setSectionResizeMode(3, QHeaderView.Stretch)
-        header.setSectionResizeMode(4, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(8, QHeaderView.ResizeToContents)
-        header.setSectionResizeMode(9, QHeaderView.Stretch)
+        header.setSectionResizeMode(len(COLUMNS) - 1, QHeaderView.Stretch)
         parent_layout.addWidget(self._table)
 
-    def table_widget(self) -> QTableWidget:
+    def table_widget(self) -> QTableView:
         return self._table
 
     # --- Données ---
@@ -151,58 +368,124 @@ class DashboardWidget(QFrame):
         self._progress = {}
         self._task_start_times = {}
         for lot in lots:
-            detected_files = [str(path) for path in lot.iter_databases()]
-            self._progress[lot.name] = LotProgress(
-                lot=lot,
-                total_databases=len(detected_files),
-                detected_files=detected_files,
-            )
+            self._progress[lot.name] = LotProgress(lot=lot, total_databases=0)
+        self._row_of = {name: row for row, name in enumerate(self._lot_rows)}
+        self._lot_keys = {lot.name: discovery_key(lot) for lot in lots}
+        self._model.set_rows([self._progress[name] for name in self._lot_rows])
+        self._table.resizeColumnsToContents()
+        self._discovery.track(lots)
         self.prepare_for_run()
 
     def prepare_for_run(self) -> None:
         for progress in self._progress.values():
             progress.reset()
+            self._apply_snapshot(progress, self._discovery.cached(progress.lot))
+        self._databases_total = sum(progress.total_databases for progress in self._progress.values())
         self._task_start_times = {}
-        self._refresh_ui()
+        self._running_lots = []
+        self._task_usage = {}
+        self._recount()
+        self._dirty_rows.update(range(len(self._lot_rows)))
+        self._flush_refresh()
+
+    def _apply_snapshot(self, progress: LotProgress, snapshot: Optional[LotSnapshot]) -> None:
+        if snapshot is None:
+            # Pas encore de résultat : afficher ce que la recherche en cours a déjà trouvé.
+            progress.discovering = True
+            progress.detected_files = [entry.path for entry in self._discovery.partial(progress.lot)]
+        else:
+            progress.discovering = False
+            progress.detected_files = [entry.path for entry in snapshot.files]
+        progress.total_databases = len(progress.detected_files)
+
+    def _on_lot_discovered(self, snapshot: LotSnapshot) -> None:
+        for progress in self._progress.values():
+            # Un lot terminé garde les bases de son exécution.
+            if self._lot_keys.get(progress.lot.name) != snapshot.key or progress.status not in ("En attente", "En cours"):
+                continue
+            files = [entry.path for entry in snapshot.files]
+            if not progress.discovering and files == progress.detected_files:
+                continue
+            bucket = _status_bucket(progress)
+            self._databases_total -= progress.total_databases
+            self._apply_snapshot(progress, snapshot)
+            self._databases_total += progress.total_databases
+            self._summary_dirty = True
+            self._changed(progress, bucket)
+
+    def _on_files_found(self, key: DiscoveryKey, files: List[DiscoveredFile]) -> None:
+        for progress in self._progress.values():
+            if not progress.discovering or self._lot_keys.get(progress.lot.name) != key:
+                continue
+            bucket = _status_bucket(progress)
+            progress.detected_files.extend(entry.path for entry in files)
+            progress.total_databases += len(files)
+            self._databases_total += len(files)
+            self._summary_dirty = True
+            self._changed(progress, bucket)
 
     def mark_lot_started(self, lot: LotConfig) -> None:
         progress = self._progress.get(lot.name)
         if not progress:
             return
+        bucket = _status_bucket(progress)
         progress.status = "En cours"
-        self._refresh_ui()
+        # Mode pipeline : noter les lots qui partagent les créneaux avec celui-ci.
+        for other_name in self._running_lots:
+            other = self._progress.get(other_name)
+            if other is None or other_name == lot.name:
+                continue
+            if other_name not in progress.overlaps:
+                progress.overlaps.append(other_name)
+            if lot.name not in other.overlaps:
+                other.overlaps.append(lot.name)
+                self._changed(other, _status_bucket(other))
+        if lot.name not in self._running_lots:
+            self._running_lots.append(lot.name)
+        self._changed(progress, bucket)
 
     def mark_lot_finished(self, lot: LotConfig) -> None:
         progress = self._progress.get(lot.name)
         if not progress:
             return
+        bucket = _status_bucket(progress)
+        if lot.name in self._running_lots:
+            self._running_lots.remove(lot.name)
         progress.status = "Terminé" if progress.failed == 0 else "Terminé avec erreurs"
-        self._refresh_ui()
+        self._changed(progress, bucket)
 
     def mark_lot_skipped(self, lot: LotConfig, reason: str | None = None) -> None:
         progress = self._progress.get(lot.name)
         if not progress:
             return
+        bucket = _status_bucket(progress)
         progress.skipped = True
         progress.status = "Ignoré" if not reason else f"Ignoré ({reason})"
-        self._refresh_ui()
+        self._changed(progress, bucket)
 
     def mark_task_started(self, task: DatabaseTask) -> None:
         progress = self._progress.get(task.lot.name)
         if not progress:
             return
+        bucket = _status_bucket(progress)
         progress.running += 1
         if progress.status == "En attente":
             progress.status = "En cours"
         self._task_start_times[task.id()] = time.perf_counter()
-        self._refresh_ui()
+        self._changed(progress, bucket)
 
     def mark_task_finished(self, task: DatabaseTask, status: ExecutionStatus) -> None:
         progress = self._progress.get(task.lot.name)
         if not progress:
             return
+        bucket = _status_bucket(progress)
         progress.running = max(0, progress.running - 1)
         progress.processed += 1
+        usage = self._task_usage.pop(task.id(), None)
+        if usage is not None and usage.current is not None:
+            progress.finished_read_bytes += usage.current.read_bytes
+            progress.finished_write_bytes += usage.current.write_bytes
+            self._aggregate_usage(progress)
         start_time = self._task_start_times.pop(task.id(), None)
         if start_time is not None:
             elapsed = max(0.0, time.perf_counter() - start_time)
@@ -211,77 +494,131 @@ class DashboardWidget(QFrame):
             progress.succeeded += 1
         elif status in (ExecutionStatus.FAILED, ExecutionStatus.STOPPED):
             progress.failed += 1
-        if progress.processed >= progress.total_databases and not progress.skipped:
+            self._errors_total += 1
+        self._update_lot_status(progress)
+        self._changed(progress, bucket)
+
+    def mark_task_skipped(self, task: DatabaseTask, reason: str | None = None) -> None:
+        """Une base non relancée (déjà traitée) compte comme traitée avec succès."""
+        progress = self._progress.get(task.lot.name)
+        if not progress:
+            return
+        bucket = _status_bucket(progress)
+        progress.processed += 1
+        progress.succeeded += 1
+        self._update_lot_status(progress)
+        self._changed(progress, bucket)
+
+    def _update_lot_status(self, progress: LotProgress) -> None:
+        if progress.processed >= progress.total_databases and not progress.skipped and not progress.discovering:
             progress.status = "Terminé" if progress.failed == 0 else "Terminé avec erreurs"
         elif not progress.skipped:
             progress.status = "En cours"
-        self._refresh_ui()
+
+    @timed
+    def update_usage(self, usages: List[TaskUsage]) -> None:
+        """Met à jour la consommation des tâches en cours (un appel par échantillonnage)."""
+        lots = set()
+        for usage in usages:
+            if usage.task.lot.name in self._progress:
+                self._task_usage[usage.task.id()] = usage
+                lots.add(usage.task.lot.name)
+        for lot_name in lots:
+            progress = self._progress[lot_name]
+            self._aggregate_usage(progress)
+            self._changed(progress, _status_bucket(progress))
+
+    def _aggregate_usage(self, progress: LotProgress) -> None:
+        cpu = 0.0
+        rss = read_bytes = write_bytes = 0
+        # Les bases d'un même paquet partagent un processus : le compter une fois.
+        seen = set()
+        for usage in self._task_usage.values():
+            sample = usage.current
+            if usage.task.lot.name != progress.lot.name or sample is None or id(sample) in seen:
+                continue
+            seen.add(id(sample))
+            cpu += sample.cpu_percent
+            rss += sample.rss_bytes
+            read_bytes += sample.read_bytes
+            write_bytes += sample.write_bytes
+        progress.cpu_percent = cpu
+        progress.rss_bytes = rss
+        progress.peak_cpu_percent = max(progress.peak_cpu_percent, cpu)
+        progress.peak_rss_bytes = max(progress.peak_rss_bytes, rss)
+        progress.read_bytes = progress.finished_read_bytes + read_bytes
+        progress.write_bytes = progress.finished_write_bytes + write_bytes
+
+    @timed
+    def update_log_levels(self, parsed: ParsedOutput) -> None:
+        """Compte les avertissements et erreurs relevés par l'analyse de la sortie."""
+        progress = self._progress.get(parsed.task.lot.name)
+        if not progress:
+            return
+        warnings = parsed.counts.get("WARN", 0)
+        errors = parsed.counts.get("ERROR", 0) + parsed.counts.get("FATAL", 0)
+        if not warnings and not errors:
+            return
+        progress.log_warnings += warnings
+        progress.log_errors += errors
+        self._changed(progress, _status_bucket(progress))
+
+    def update_memory_budget(self, reserved_mb: int, budget_mb: int) -> None:
+        """Affiche la mémoire réservée par les tâches en cours face au budget."""
+        label = self._summary_labels["memory"]
+        if budget_mb <= 0:
+            label.setText(_format_memory(reserved_mb) if reserved_mb else "—")
+            return
+        label.setText(f"{_format_memory(reserved_mb)} / {_format_memory(budget_mb)}")
 
     def mark_run_completed(self) -> None:
-        self._refresh_ui()
+        self._running_lots = []
+        self._flush_refresh()
 
     # --- UI updates ---
-    def _refresh_ui(self) -> None:
-        self._update_table()
-        self._update_summary()
-
-    def _update_table(self) -> None:
-        self._table.setSortingEnabled(False)
-        self._table.setRowCount(len(self._lot_rows))
-        for row, lot_name in enumerate(self._lot_rows):
-            progress = self._progress.get(lot_name)
-            if not progress:
-                continue
-            lot = progress.lot
-            self._table.setItem(row, 0, QTableWidgetItem(lot.name))
-            self._table.setItem(row, 1, QTableWidgetItem(lot.databases_path))
-            self._table.setItem(row, 2, QTableWidgetItem(lot.pattern))
-
-            if progress.detected_files:
-                files_text = "\n".join(progress.detected_files)
-            else:
-                files_text = "Aucun fichier trouvé"
-            files_item = QTableWidgetItem(files_text)
-            files_item.setFlags(files_item.flags() & ~Qt.ItemIsEditable)
-            self._table.setItem(row, 3, files_item)
-
-            self._table.setItem(row, 4, QTableWidgetItem(str(progress.total_databases)))
-            progress_text = f"{progress.processed}/{progress.total_databases}"
-            self._table.setItem(row, 5, QTableWidgetItem(progress_text))
-            self._table.setItem(row, 6, QTableWidgetItem(str(progress.running)))
-            self._table.setItem(row, 7, QTableWidgetItem(str(progress.failed)))
-            elapsed_text = self._format_elapsed(progress.total_elapsed_seconds)
-            self._table.setItem(row, 8, QTableWidgetItem(elapsed_text))
-            self._table.setItem(row, 9, QTableWidgetItem(progress.status))
-        self._table.resizeColumnsToContents()
-        self._table.resizeRowsToContents()
-        self._table.setSortingEnabled(True)
-
-    def _format_elapsed(self, elapsed_seconds: float) -> str:
-        if elapsed_seconds <= 0:
-            return "-"
-        total_seconds = int(round(elapsed_seconds))
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-        if hours:
-            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-        return f"{minutes:02d}:{seconds:02d}"
+    def _changed(self, progress: LotProgress, previous_bucket: str) -> None:
+        """Reporte le changement d'un lot dans les totaux et planifie le rafraîchissement de sa ligne."""
+        bucket = _status_bucket(progress)
+        if bucket != previous_bucket:
+            if previous_bucket:
+                self._bucket_counts[previous_bucket] -= 1
+            if bucket:
+                self._bucket_counts[bucket] += 1
+            self._summary_dirty = True
+        elif progress.status.startswith("Terminé") or progress.failed:
+            self._summary_dirty = True
+        row = self._row_of.get(progress.lot.name)
+        if row is not None:
+            self._dirty_rows.add(row)
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _recount(self) -> None:
+        self._bucket_counts = {_PENDING: 0, _RUNNING: 0, _DONE: 0}
+        for progress in self._progress.values():
+            bucket = _status_bucket(progress)
+            if bucket:
+                self._bucket_counts[bucket] += 1
+        self._errors_total = sum(progress.failed for progress in self._progress.values())
+        self._summary_dirty = True
+
+    @timed
+    def _flush_refresh(self) -> None:
+        self._refresh_timer.stop()
+        for row in sorted(self._dirty_rows):
+            self._model.row_changed(row)
+        self._dirty_rows.clear()
+        if self._summary_dirty:
+            self._update_summary()
+            self._summary_dirty = False
 
     def _update_summary(self) -> None:
-        lots_total = len(self._progress)
-        databases_total = sum(p.total_databases for p in self._progress.values())
-        lots_done = sum(1 for p in self._progress.values() if p.status.startswith("Terminé") or p.skipped)
-        lots_running = sum(1 for p in self._progress.values() if p.status == "En cours")
-        lots_pending = sum(1 for p in self._progress.values() if p.status == "En attente")
-        errors = sum(p.failed for p in self._progress.values())
-
-        self._set_summary_value("lots", lots_total)
-        self._set_summary_value("databases", databases_total)
-        self._set_summary_value("lots_done", lots_done)
-        self._set_summary_value("lots_running", lots_running)
-        self._set_summary_value("lots_pending", lots_pending)
-        self._set_summary_value("errors", errors)
+        self._set_summary_value("lots", len(self._progress))
+        self._set_summary_value("databases", self._databases_total)
+        self._set_summary_value("lots_done", self._bucket_counts[_DONE])
+        self._set_summary_value("lots_running", self._bucket_counts[_RUNNING])
+        self._set_summary_value("lots_pending", self._bucket_counts[_PENDING])
+        self._set_summary_value("errors", self._errors_total)
 
     def _set_summary_value(self, key: str, value: int) -> None:
         label = self._summary_labels.get(key)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from PySide6.QtCore import Qt, QTimer, QUrl
+from PySide6.QtGui import QDesktopServices
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QPushButton,
+    QStyle,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.diagnostics import (
+    STALL_THRESHOLD_S,
+    TIMINGS,
+    EventLoopLagProbe,
+    UiProfiler,
+    diagnostics_dir,
+    write_report,
+)
+
+REFRESH_INTERVAL_MS = 1000
+COLUMNS = ("Point de mesure", "Appels", "Total (ms)", "Moyenne (ms)", "Max (ms)", "Appels lents")
+
+
+def _numeric_item(value: float, decimals: int) -> QTableWidgetItem:
+    item = QTableWidgetItem(f"{value:,.{decimals}f}".replace(",", " ").replace(".", ","))
+    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+    return item
+
+
+class DiagnosticsDialog(QDialog):
+    """Retard de la boucle d'événements, durée des fonctions instrumentées et capture cProfile."""
+
+    def __init__(self, probe: EventLoopLagProbe, profiler: UiProfiler, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(900, 550)
+        self._probe = probe
+        self._profiler = profiler
+
+        self._lag_label = QLabel()
+        self._lag_label.setStyleSheet("font-weight: 500;")
+
+        self._table = QTableWidget(0, len(COLUMNS))
+        self._table.setHorizontalHeaderLabels(list(COLUMNS))
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionMode(QAbstractItemView.NoSelection)
+        self._table.setAlternatingRowColors(True)
+        self._table.setWordWrap(False)
+        header = self._table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        self._table.horizontalHeaderItem(5).setToolTip(
+            f"Appels de plus de {STALL_THRESHOLD_S * 1000:.0f} ms : l'interface reste figée pendant ce temps"
+        )
+
+        self._profile_button = QPushButton()
+        self._profile_button.setCheckable(True)
+        self._profile_button.setToolTip("Capturer avec cProfile les fonctions exécutées par le thread de l'interface")
+        self._profile_button.toggled.connect(self._toggle_profiling)
+        reset_button = QPushButton("Réinitialiser")
+        reset_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        reset_button.clicked.connect(self._reset)
+        report_button = QPushButton("Enregistrer un rapport")
+        report_button.setIcon(self.style().standardIcon(QStyle.SP_DialogSaveButton))
+        report_button.clicked.connect(self._save_report)
+        open_button = QPushButton("Ouvrir le dossier")
+        open_button.setIcon(self.style().standardIcon(QStyle.SP_DirOpenIcon))
+        open_button.clicked.connect(
+            lambda: QDesktopServices.openUrl(QUrl.fromLocalFile(str(diagnostics_dir())))
+        )
+        self._status_label = QLabel()
+        self._status_label.setStyleSheet("color: #555;")
+        self._status_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(self._profile_button)
+        buttons.addWidget(reset_button)
+        buttons.addWidget(report_button)
+        buttons.addWidget(open_button)
+        buttons.addStretch()
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(self._lag_label)
+        layout.addWidget(self._table, stretch=1)
+        layout.addLayout(buttons)
+        layout.addWidget(self._status_label)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_INTERVAL_MS)
+        self._timer.timeout.connect(self.refresh)
+        self._profile_button.blockSignals(True)
+        self._profile_button.setChecked(profiler.is_running())
+        self._profile_button.blockSignals(False)
+        self._update_profile_button()
+
+    def showEvent(self, event) -> None:  # type: ignore[override]
+        super().showEvent(event)
+        self.refresh()
+        self._timer.start()
+
+    def hideEvent(self, event) -> None:  # type: ignore[override]
+        # Fenêtre fermée : plus de rafraîchissement, les mesures continuent.
+        self._timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self) -> None:
+        lag = self._probe.summary()
+        self._lag_label.setText(
+            "Retard de la boucle d'événements : "
+            f"actuel {lag.current * 1000:.0f} ms · médiane {lag.p50 * 1000:.0f} ms · "
+            f"p95 {lag.p95 * 1000:.0f} ms · max {lag.max * 1000:.0f} ms · "
+            f"blocages : {lag.stalls} ({lag.stalled_seconds:.1f} s)"
+        )
+        timings = TIMINGS.snapshot()
+        self._table.setUpdatesEnabled(False)
+        self._table.setRowCount(len(timings))
+        for row, stats in enumerate(timings):
+            self._table.setItem(row, 0, QTableWidgetItem(stats.name))
+            self._table.setItem(row, 1, _numeric_item(stats.calls, 0))
+            self._table.setItem(row, 2, _numeric_item(stats.total * 1000, 1))
+            self._table.setItem(row, 3, _numeric_item(stats.mean() * 1000, 3))
+            self._table.setItem(row, 4, _numeric_item(stats.max * 1000, 1))
+            self._table.setItem(row, 5, _numeric_item(stats.slow_calls, 0))
+        self._table.setUpdatesEnabled(True)
+
+    def _reset(self) -> None:
+        TIMINGS.reset()
+        self._probe.reset()
+        self.refresh()
+
+    def _toggle_profiling(self, checked: bool) -> None:
+        if checked:
+            self._profiler.start()
+            self._status_label.setText("Capture cProfile en cours...")
+        else:
+            try:
+                path = self._profiler.stop()
+            except OSError as exc:
+                self._status_label.setText(f"Impossible d'écrire le profil : {exc}")
+                path = None
+            if path:
+                self._status_label.setText(f"Profil enregistré : {path} (résumé : {path.with_suffix('.txt').name})")
+        self._update_profile_button()
+
+    def _update_profile_button(self) -> None:
+        running = self._profiler.is_running()
+        self._profile_button.setText("Arrêter le profilage" if running else "Profiler (cProfile)")
+        self._profile_button.setIcon(
+            self.style().standardIcon(QStyle.SP_MediaStop if running else QStyle.SP_MediaPlay)
+        )
+
+    def _save_report(self) -> None:
+        try:
+            path = write_report(self._probe)
+        except OSError as exc:
+            self._status_label.setText(f"Impossible d'écrire le rapport : {exc}")
+            return
+        self._status_label.setText(f"Rapport enregistré : {path}")
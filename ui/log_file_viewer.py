@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import mmap
+from array import array
+from itertools import accumulate, repeat
+from operator import add
+from pathlib import Path
+from typing import Optional
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QDialog,
+    QHBoxLayout,
+    QLabel,
+    QListView,
+    QPushButton,
+    QSpinBox,
+    QStyle,
+    QVBoxLayout,
+    QWidget,
+)
+
+# Octets indexés à chaque demande de la vue (défilement vers le bas).
+INDEX_CHUNK_BYTES = 16 * 1024 * 1024
+# Longueur maximale d'une ligne affichée ; le reste est tronqué.
+MAX_DISPLAYED_LINE = 4096
+
+
+class LogFileModel(QAbstractListModel):
+    """Lines of a log file read through a memory mapping.
+
+    Only the offsets of the line starts are kept in memory.  They are
+    computed on demand, chunk by chunk, as the view asks for more rows
+    (``canFetchMore``/``fetchMore``), so opening a file of several gigabytes
+    is immediate and jumping to a line only indexes up to it.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._path: Optional[Path] = None
+        self._handle = None
+        self._map: Optional[mmap.mmap] = None
+        self._size = 0
+        self._offsets = array("q", [0])
+        self._indexed = 0
+        self._rows = 0
+
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def file_size(self) -> int:
+        return self._size
+
+    def fully_indexed(self) -> bool:
+        return self._indexed >= self._size
+
+    def open(self, path: Path) -> None:
+        self.beginResetModel()
+        self._unmap()
+        self._path = path
+        self._offsets = array("q", [0])
+        self._indexed = 0
+        self._rows = 0
+        self._map_file()
+        self._index_chunk()
+        self._rows = self._available_rows()
+        self.endResetModel()
+
+    def reload(self) -> None:
+        """Map the file again after it has grown; offsets already computed are kept."""
+
+        if self._path is None:
+            return
+        self.beginResetModel()
+        previous_size = self._size
+        self._unmap()
+        self._map_file()
+        if self._size < previous_size:
+            # Fichier tronqué ou remplacé par une rotation : tout réindexer.
+            self._offsets = array("q", [0])
+            self._indexed = 0
+        self._index_chunk()
+        self._rows = self._available_rows()
+        self.endResetModel()
+
+    def close(self) -> None:
+        self.beginResetModel()
+        self._unmap()
+        self._path = None
+        self._offsets = array("q", [0])
+        self._indexed = 0
+        self._rows = 0
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else self._rows
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:  # type: ignore[override]
+        return not parent.isValid() and (self._indexed < self._size or self._rows < self._available_rows())
+
+    def fetchMore(self, parent=QModelIndex()) -> None:  # type: ignore[override]
+        if parent.isValid():
+            return
+        self._index_chunk()
+        self._expose_rows()
+
+    def ensure_row(self, row: int) -> int:
+        """Index the file up to ``row``; return it, or the last row of a shorter file."""
+
+        while self._available_rows() <= row and self._indexed < self._size:
+            self._index_chunk()
+        self._expose_rows()
+        return min(row, self._rows - 1)
+
+    def index_all(self) -> None:
+        while self._indexed < self._size:
+            self._index_chunk()
+        self._expose_rows()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role != Qt.DisplayRole or not index.isValid() or self._map is None:
+            return None
+        row = index.row()
+        if row >= self._rows:
+            return None
+        start = self._offsets[row]
+        end = self._offsets[row + 1] - 1 if row + 1 < len(self._offsets) else self._size
+        end = min(end, start + MAX_DISPLAYED_LINE)
+        text = self._map[start:end].decode("utf-8", errors="replace")
+        return text.rstrip("\r")
+
+    def _map_file(self) -> None:
+        assert self._path is not None
+        try:
+            self._handle = self._path.open("rb")
+            self._size = self._handle.seek(0, 2)
+            if self._size:
+                self._map = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._unmap()
+
+    def _unmap(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        self._size = 0
+
+    def _index_chunk(self) -> None:
+        if self._map is None or self._indexed >= self._size:
+            return
+        start = self._indexed
+        end = min(self._size, start + INDEX_CHUNK_BYTES)
+        if end < self._size:
+            # Couper après le dernier saut de ligne ; une ligne plus longue que le bloc est indexée en entier.
+            cut = self._map.rfind(b"\n", start, end)
+            if cut == -1:
+                cut = self._map.find(b"\n", end)
+            end = self._size if cut == -1 else cut + 1
+        parts = self._map[start:end].split(b"\n")
+        # Début de chaque ligne suivant un saut de ligne, calculé sans boucle Python.
+        starts = accumulate(map(add, map(len, parts[:-1]), repeat(1)), initial=start)
+        next(starts)
+        self._offsets.extend(starts)
+        self._indexed = end
+
+    def _available_rows(self) -> int:
+        rows = len(self._offsets) - 1
+        if self._indexed >= self._size and self._offsets[-1] < self._size:
+            rows += 1  # Dernière ligne sans saut de ligne final.
+        return rows
+
+    def _expose_rows(self) -> None:
+        rows = self._available_rows()
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+
+
+def _format_size(value: int) -> str:
+    megabytes = value / (1024 * 1024)
+    if megabytes >= 1024:
+        return f"{megabytes / 1024:.1f} Go".replace(".", ",")
+    return f"{megabytes:.1f} Mo".replace(".", ",")
+
+
+class LogFileViewerDialog(QDialog):
+    """Visionneuse du journal complet d'une tâche, tel qu'écrit sur disque."""
+
+    def __init__(self, path: Path, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Journal complet : {path.name}")
+        self.resize(1000, 700)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+
+        self._model = LogFileModel(self)
+        self._view = QListView()
+        self._view.setModel(self._model)
+        self._view.setUniformItemSizes(True)
+        self._view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self._view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
+        font = QFont("monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        self._view.setFont(font)
+
+        self._info_label = QLabel()
+        self._info_label.setStyleSheet("color: #555;")
+        path_label = QLabel(str(path))
+        path_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        path_label.setStyleSheet("font-family: monospace; color: #333;")
+
+        self._line_spin = QSpinBox()
+        self._line_spin.setRange(1, 2_000_000_000)
+        self._line_spin.setPrefix("Ligne ")
+        go_button = QPushButton("Aller")
+        go_button.clicked.connect(self._go_to_line)
+        self._line_spin.editingFinished.connect(self._go_to_line)
+        top_button = QPushButton("Début")
+        top_button.setIcon(self.style().standardIcon(QStyle.SP_MediaSkipBackward))
+        top_button.clicked.connect(self._view.scrollToTop)
+        end_button = QPushButton("Fin")
+        end_button.setIcon(self.style().standardIcon(QStyle.SP_MediaSkipForward))
+        end_button.clicked.connect(self._go_to_end)
+        reload_button = QPushButton("Recharger")
+        reload_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        reload_button.setToolTip("Relire le fichier pour afficher les lignes écrites depuis l'ouverture")
+        reload_button.clicked.connect(self._reload)
+
+        controls = QHBoxLayout()
+        controls.addWidget(self._line_spin)
+        controls.addWidget(go_button)
+        controls.addWidget(top_button)
+        controls.addWidget(end_button)
+        controls.addStretch()
+        controls.addWidget(self._info_label)
+        controls.addWidget(reload_button)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(path_label)
+        layout.addLayout(controls)
+        layout.addWidget(self._view, stretch=1)
+
+        self._model.rowsInserted.connect(self._update_info)
+        self._model.modelReset.connect(self._update_info)
+        self._model.open(path)
+        self.finished.connect(lambda _result: self._model.close())
+
+    def _update_info(self, *_args) -> None:
+        rows = self._model.rowCount()
+        suffix = "" if self._model.fully_indexed() else "+"
+        self._info_label.setText(f"{rows} ligne(s){suffix}  ·  {_format_size(self._model.file_size())}")
+
+    def go_to_line(self, line: int) -> None:
+        """Sélectionne la ligne ``line`` (numérotée à partir de 1)."""
+        self._line_spin.setValue(line)
+        self._go_to_line()
+
+    def _go_to_line(self) -> None:
+        row = self._model.ensure_row(self._line_spin.value() - 1)
+        self._select_row(row)
+
+    def _go_to_end(self) -> None:
+        self._model.index_all()
+        self._select_row(self._model.rowCount() - 1)
+
+    def _reload(self) -> None:
+        row = self._view.currentIndex().row()
+        self._model.reload()
+        if row >= 0:
+            self._select_row(self._model.ensure_row(row))
+
+    def _select_row(self, row: int) -> None:
+        if row < 0:
+            return
+        index = self._model.index(row, 0)
+        self._view.setCurrentIndex(index)
+        self._view.scrollTo(index, QAbstractItemView.PositionAtCenter)
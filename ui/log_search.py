@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QSplitter,
+    QStyle,
+    QTableWidget,
+    QTableWidgetItem,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.log_index import LogIndex, LogMatch
+from ui.log_file_viewer import LogFileViewerDialog
+
+
+class LogSearchDialog(QDialog):
+    """Recherche d'un texte ou d'une expression régulière dans les journaux de toutes les tâches."""
+
+    def __init__(self, index: LogIndex, current_run_id: Callable[[], str], parent: QWidget | None = None):
+        super().__init__(parent)
+        self.setWindowTitle("Rechercher dans les journaux")
+        self.resize(1100, 650)
+        self._index = index
+        self._current_run_id = current_run_id
+        self._matches: List[LogMatch] = []
+
+        self._query_edit = QLineEdit()
+        self._query_edit.setPlaceholderText("Texte à rechercher (ex : ERROR, Exception, timeout...)")
+        self._query_edit.returnPressed.connect(self._search)
+        self._regex_box = QCheckBox("Expression régulière")
+        self._scope_combo = QComboBox()
+        self._scope_combo.addItem("Exécution en cours", "current")
+        self._scope_combo.addItem("Toutes les exécutions", "all")
+        search_button = QPushButton("Rechercher")
+        search_button.setIcon(self.style().standardIcon(QStyle.SP_FileDialogContentsView))
+        search_button.setDefault(True)
+        search_button.clicked.connect(self._search)
+
+        self._results = QTableWidget(0, 5)
+        self._results.setHorizontalHeaderLabels(["Exécution", "Lot", "Base", "Ligne", "Texte"])
+        self._results.verticalHeader().setVisible(False)
+        self._results.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._results.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._results.setSelectionMode(QAbstractItemView.SingleSelection)
+        self._results.setAlternatingRowColors(True)
+        self._results.setWordWrap(False)
+        header = self._results.horizontalHeader()
+        for column in range(4):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(4, QHeaderView.Stretch)
+        self._results.currentCellChanged.connect(lambda row, *_: self._show_context(row))
+        self._results.cellDoubleClicked.connect(lambda row, _column: self._open_log(row))
+
+        self._context_view = QPlainTextEdit()
+        self._context_view.setReadOnly(True)
+        self._context_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        font = QFont("monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        self._context_view.setFont(font)
+        self._status_label = QLabel()
+        self._status_label.setStyleSheet("color: #555;")
+
+        controls = QHBoxLayout()
+        controls.addWidget(self._query_edit, stretch=1)
+        controls.addWidget(self._regex_box)
+        controls.addWidget(self._scope_combo)
+        controls.addWidget(search_button)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self._results)
+        splitter.addWidget(self._context_view)
+        splitter.setStretchFactor(0, 3)
+        splitter.setStretchFactor(1, 1)
+
+        layout = QVBoxLayout(self)
+        layout.addLayout(controls)
+        layout.addWidget(splitter, stretch=1)
+        hint = QLabel("Double-cliquez sur un résultat pour ouvrir le journal complet à cette ligne.")
+        hint.setStyleSheet("color: #777;")
+        footer = QHBoxLayout()
+        footer.addWidget(hint)
+        footer.addStretch()
+        footer.addWidget(self._status_label)
+        layout.addLayout(footer)
+
+    def _search(self) -> None:
+        query = self._query_edit.text()
+        if not query:
+            return
+        run_id: Optional[str] = None
+        if self._scope_combo.currentData() == "current":
+            run_id = self._current_run_id() or None
+        started = time.perf_counter()
+        try:
+            self._matches = self._index.search(query, regex=self._regex_box.isChecked(), run_id=run_id)
+        except re.error as exc:
+            self._status_label.setText(f"Expression régulière invalide : {exc}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._fill_results()
+        self._status_label.setText(f"{len(self._matches)} résultat(s) en {elapsed_ms:.0f} ms")
+
+    def _fill_results(self) -> None:
+        self._results.setRowCount(0)
+        self._results.setRowCount(len(self._matches))
+        for row, match in enumerate(self._matches):
+            started = datetime.fromtimestamp(match.started_at).strftime("%d/%m %H:%M")
+            values = [started, match.lot, Path(match.database).name, str(match.line), match.text]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if column == 2:
+                    item.setToolTip(match.database)
+                self._results.setItem(row, column, item)
+        self._context_view.clear()
+        if self._matches:
+            self._results.setCurrentCell(0, 0)
+
+    def _show_context(self, row: int) -> None:
+        if not 0 <= row < len(self._matches):
+            self._context_view.clear()
+            return
+        match = self._matches[row]
+        first = match.line - len(match.before)
+        lines = [f"  {first + offset:>8}  {text}" for offset, text in enumerate(match.before)]
+        lines.append(f"> {match.line:>8}  {match.text}")
+        lines.extend(f"  {match.line + 1 + offset:>8}  {text}" for offset, text in enumerate(match.after))
+        self._context_view.setPlainText("\n".join(lines))
+
+    def _open_log(self, row: int) -> None:
+        if not 0 <= row < len(self._matches):
+            return
+        match = self._matches[row]
+        if match.log_path is None or not match.log_path.is_file():
+            self._status_label.setText("Le fichier de ce journal n'existe plus.")
+            return
+        viewer = LogFileViewerDialog(match.log_path, self)
+        viewer.show()
+        viewer.go_to_line(match.line)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import QPlainTextEdit
+
+from core.diagnostics import timed
+
+# Nombre de lignes conservées par défaut dans un onglet de tâche.
+DEFAULT_MAX_LOG_LINES = 10_000
+
+
+class LogView(QPlainTextEdit):
+    """Vue de journal à mémoire bornée.
+
+    Seules les ``max_lines`` dernières lignes sont conservées (les plus
+    anciennes sont supprimées par le document lui-même) et seule la partie
+    visible est mise en page.  La couleur est appliquée aux lignes insérées,
+    sans reformater le texte existant, et le défilement automatique est
+    suspendu tant que l'utilisateur n'est pas en bas du journal.
+    """
+
+    def __init__(self, max_lines: int = DEFAULT_MAX_LOG_LINES, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.setMaximumBlockCount(max_lines)
+        font = QFont("monospace")
+        font.setStyleHint(QFont.TypeWriter)
+        self.setFont(font)
+        self._stdout_format = QTextCharFormat()
+        self._stdout_format.setForeground(QColor("#202020"))
+        self._stderr_format = QTextCharFormat()
+        self._stderr_format.setForeground(QColor("#B00020"))
+        self._warn_format = QTextCharFormat()
+        self._warn_format.setForeground(QColor("#9A5B00"))
+        self._warn_format.setBackground(QColor("#FFF4DB"))
+        self._error_format = QTextCharFormat()
+        self._error_format.setForeground(QColor("#B00020"))
+        self._error_format.setBackground(QColor("#FDE7EA"))
+        self._error_format.setFontWeight(QFont.Bold)
+
+    def set_max_lines(self, max_lines: int) -> None:
+        self.setMaximumBlockCount(max_lines)
+
+    @timed
+    def append_lines(
+        self, lines: List[str], is_error: bool = False, levels: Optional[Sequence[Optional[str]]] = None
+    ) -> None:
+        """Ajoute ``lines`` ; ``levels`` (niveau de chaque ligne) met en évidence WARN et ERROR."""
+        if not lines:
+            return
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 2
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.beginEditBlock()
+        if not self.document().isEmpty():
+            cursor.insertBlock()
+        default_format = self._stderr_format if is_error else self._stdout_format
+        if levels is None:
+            cursor.insertText("\n".join(lines), default_format)
+        else:
+            # Une insertion par suite de lignes de même format.
+            start = 0
+            for index in range(1, len(lines) + 1):
+                if index < len(lines) and levels[index] == levels[start]:
+                    continue
+                if start:
+                    cursor.insertBlock()
+                cursor.insertText("\n".join(lines[start:index]), self._format_for(levels[start], default_format))
+                start = index
+        cursor.endEditBlock()
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+    def _format_for(self, level: Optional[str], default_format: QTextCharFormat) -> QTextCharFormat:
+        if level == "WARN":
+            return self._warn_format
+        if level in ("ERROR", "FATAL"):
+            return self._error_format
+        return default_format
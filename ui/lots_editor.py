@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 from typing import List, Optional
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
     QAbstractItemView,
+    QCheckBox,
     QDialog,
     QDialogButtonBox,
     QFileDialog,
@@ -17,11 +19,12 @@ from PySide6.QtWidgets import (
     QListWidget,
     QListWidgetItem,
     QPushButton,
+    QSpinBox,
     QVBoxLayout,
     QStyle,
 )
 
-from core.models import LotConfig
+from core.models import BatchConfig, LotConfig
 
 
 class LotEditorDialog(QDialog):
@@ -37,14 +40,61 @@ class LotEditorDialog(QDialog):
         self._path_edit.setPlaceholderText("Dossier contenant les bases")
         self._path_edit.setClearButtonEnabled(True)
         self._pattern_edit = QLineEdit("*.db")
-        self._pattern_edit.setPlaceholderText("Pattern de fichiers (ex: *.db)")
+        self._pattern_edit.setPlaceholderText("Pattern de fichiers (ex: *.db ; sites/**/*.sqlite)")
         self._pattern_edit.setClearButtonEnabled(True)
+        self._exclude_edit = QLineEdit()
+        self._exclude_edit.setPlaceholderText("Exclusions (ex: archives ; *-journal)")
+        self._exclude_edit.setClearButtonEnabled(True)
+        self._exclude_edit.setToolTip(
+            "Motifs séparés par des points-virgules. Sans /, un motif porte sur le nom des fichiers et "
+            "des dossiers (un dossier exclu n'est pas parcouru) ; avec /, sur le chemin relatif au dossier."
+        )
+        self._min_size_spin = self._size_spin("Taille minimale des bases retenues")
+        self._max_size_spin = self._size_spin("Taille maximale des bases retenues")
+        self._max_parallel_spin = QSpinBox()
+        self._max_parallel_spin.setRange(0, 512)
+        self._max_parallel_spin.setSpecialValueText("Global")
+        self._max_parallel_spin.setToolTip(
+            "Nombre maximal de bases traitées simultanément dans ce lot (Global : réglage de l'application)."
+        )
+        self._task_memory_spin = QSpinBox()
+        self._task_memory_spin.setRange(0, 1024 * 1024)
+        self._task_memory_spin.setSingleStep(256)
+        self._task_memory_spin.setSuffix(" Mo")
+        self._task_memory_spin.setSpecialValueText("Auto")
+        self._task_memory_spin.setToolTip(
+            "Mémoire réservée par base pour l'admission des tâches (Auto : pic observé ou -Xmx)."
+        )
+        self._batch_size_spin = QSpinBox()
+        self._batch_size_spin.setRange(1, 1000)
+        self._batch_size_spin.setSpecialValueText("Désactivé")
+        self._batch_size_spin.setToolTip(
+            "Nombre de bases traitées par une même invocation du jar (le jar doit accepter plusieurs bases)."
+        )
+        self._batch = lot.batch if lot else None
+        self._progress_edit = QLineEdit()
+        self._progress_edit.setPlaceholderText(r"Par défaut : rows migrated: (?P<done>\d+) / (?P<total>\d+)")
+        self._progress_edit.setClearButtonEnabled(True)
+        self._progress_edit.setToolTip(
+            "Expression régulière repérant l'avancement dans la sortie du jar, "
+            "avec les groupes nommés done et total. D'autres motifs peuvent être ajoutés dans le YAML."
+        )
+        self._progress_patterns = list(lot.progress_patterns) if lot else []
+        self._barrier_check = QCheckBox("Attendre la fin des lots précédents")
+        self._barrier_check.setToolTip(
+            "En mode pipeline, ce lot ne démarre qu'une fois tous les lots précédents terminés."
+        )
         self._files_list = QListWidget()
         self._files_list.setSelectionMode(QAbstractItemView.SingleSelection)
         self._files_list.setAlternatingRowColors(True)
 
         form = QFormLayout()
         form.addRow("Nom", self._name_edit)
+        form.addRow("Parallélisme max", self._max_parallel_spin)
+        form.addRow("Mémoire par tâche", self._task_memory_spin)
+        form.addRow("Bases par invocation", self._batch_size_spin)
+        form.addRow("Barrière", self._barrier_check)
+        form.addRow("Motif d'avancement", self._progress_edit)
 
         method1_group = QGroupBox("Méthode 1 : Extraire automatiquement depuis un dossier")
         method1_layout = QFormLayout(method1_group)
@@ -65,8 +115,19 @@ class LotEditorDialog(QDialog):
         method1_layout.addRow("Dossier", path_layout)
 
         pattern_label = QLabel("Pattern")
-        pattern_label.setToolTip("Les fichiers trouvés dans le dossier seront filtrés avec ce pattern.")
+        pattern_label.setToolTip(
+            "Les fichiers trouvés dans le dossier seront filtrés avec ce pattern. Plusieurs patterns se "
+            "séparent par des points-virgules ; ** désigne les sous-dossiers à toute profondeur (**/*.db)."
+        )
         method1_layout.addRow(pattern_label, self._pattern_edit)
+        method1_layout.addRow("Exclure", self._exclude_edit)
+        size_layout = QHBoxLayout()
+        size_layout.addWidget(QLabel("de"))
+        size_layout.addWidget(self._min_size_spin)
+        size_layout.addWidget(QLabel("à"))
+        size_layout.addWidget(self._max_size_spin)
+        size_layout.addStretch()
+        method1_layout.addRow("Taille", size_layout)
 
         files_group = QGroupBox("Méthode 2 : Ajouter manuellement des fichiers")
         files_layout = QVBoxLayout(files_group)
@@ -109,10 +170,28 @@ class LotEditorDialog(QDialog):
         if lot:
             self._name_edit.setText(lot.name)
             self._path_edit.setText(lot.databases_path)
-            self._pattern_edit.setText(lot.pattern)
+            self._pattern_edit.setText(" ; ".join([lot.pattern, *lot.include_patterns]))
+            self._exclude_edit.setText(" ; ".join(lot.exclude_patterns))
+            self._min_size_spin.setValue((lot.min_size_bytes or 0) // 1024)
+            self._max_size_spin.setValue((lot.max_size_bytes or 0) // 1024)
+            self._max_parallel_spin.setValue(lot.max_parallel or 0)
+            self._barrier_check.setChecked(lot.barrier)
+            self._batch_size_spin.setValue(lot.batch.size if lot.batch else 1)
+            self._task_memory_spin.setValue(lot.task_memory_mb or 0)
+            if lot.progress_patterns:
+                self._progress_edit.setText(lot.progress_patterns[0])
             for file in lot.files:
                 QListWidgetItem(file, self._files_list)
 
+    def _size_spin(self, tooltip: str) -> QSpinBox:
+        spin = QSpinBox()
+        spin.setRange(0, 2_000_000_000)
+        spin.setSingleStep(1024)
+        spin.setSuffix(" Ko")
+        spin.setSpecialValueText("Aucune")
+        spin.setToolTip(tooltip)
+        return spin
+
     def _choose_directory(self) -> None:
         directory = QFileDialog.getExistingDirectory(self, "Sélectionner un dossier", self._path_edit.text() or str(Path.home()))
         if directory:
@@ -154,9 +233,36 @@ class LotEditorDialog(QDialog):
 
     def get_lot(self) -> LotConfig:
         files = [self._files_list.item(i).text() for i in range(self._files_list.count())]
+        patterns = _split_patterns(self._pattern_edit.text()) or ["*.db"]
         return LotConfig(
             name=self._name_edit.text().strip(),
             databases_path=self._path_edit.text().strip(),
-            pattern=self._pattern_edit.text().strip() or "*.db",
+            pattern=patterns[0],
+            include_patterns=patterns[1:],
+            exclude_patterns=_split_patterns(self._exclude_edit.text()),
+            min_size_bytes=self._min_size_spin.value() * 1024 or None,
+            max_size_bytes=self._max_size_spin.value() * 1024 or None,
             files=files,
+            max_parallel=self._max_parallel_spin.value() or None,
+            barrier=self._barrier_check.isChecked(),
+            batch=self._get_batch(),
+            task_memory_mb=self._task_memory_spin.value() or None,
+            progress_patterns=self._get_progress_patterns(),
         )
+
+    def _get_progress_patterns(self) -> List[str]:
+        # Seul le premier motif est éditable ici ; les suivants sont conservés.
+        first = self._progress_edit.text().strip()
+        others = self._progress_patterns[1:]
+        return [first, *others] if first else others
+
+    def _get_batch(self) -> Optional[BatchConfig]:
+        size = self._batch_size_spin.value()
+        if size <= 1:
+            return None
+        # Argument et marqueurs se règlent dans le fichier de configuration.
+        return replace(self._batch, size=size) if self._batch else BatchConfig(size=size)
+
+
+def _split_patterns(text: str) -> List[str]:
+    return [pattern.strip() for pattern in text.split(";") if pattern.strip()]
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sqlite3
 from pathlib import Path
 from typing import List, Tuple
 
@@ -15,6 +16,7 @@ from PySide6.QtWidgets import (
     QMainWindow,
     QMessageBox,
     QPushButton,
+    QSpinBox,
     QSplitter,
     QStyle,
     QVBoxLayout,
@@ -22,11 +24,23 @@ from PySide6.QtWidgets import (
 )
 
 from core.models import AppSettings, CommandArguments, ExecutionStatus, LotConfig
+from core.cds import CdsArchiveCache
+from core.event_journal import JOURNAL_FILE_NAME, EventJournal
+from core.checkpoint import CheckpointJournal
+from core.diagnostics import EventLoopLagProbe, UiProfiler, profile_requested, timed, write_report
+from core.fingerprint import FingerprintCache
+from core.log_index import LogIndex
+from core.log_parser import LogParsingService, ParsedOutput
+from core.log_spool import LogSpool, new_run_directory
+from core.metrics import MetricsRegistry, MetricsServer, MetricsTextfileWriter
 from core.orchestrator import Orchestrator
+from core.run_history import RunHistoryStore
 from app_io.settings import SettingsManager
 from app_io.yaml_io import load_lots_from_yaml, save_lots_to_yaml
 from ui.dashboard import DashboardWidget
+from ui.diagnostics_panel import DiagnosticsDialog
 from ui.env_editor import EnvEditorDialog
+from ui.log_search import LogSearchDialog
 from ui.lots_editor import LotEditorDialog
 from ui.run_tabs import RunTabsWidget
 
@@ -37,6 +51,14 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Orchestrateur FSADA")
         self.resize(1200, 800)
 
+        # Mesures toujours actives (peu coûteuses) ; cProfile sur demande ou avec CLI_ORCHESTRATOR_PROFILE.
+        self._lag_probe = EventLoopLagProbe(parent=self)
+        self._lag_probe.start()
+        self._profiler = UiProfiler()
+        if profile_requested():
+            self._profiler.start()
+        self._diagnostics_dialog: DiagnosticsDialog | None = None
+
         self._settings_manager = SettingsManager()
         self._orchestrator = Orchestrator()
         self._orchestrator.lot_started.connect(self._on_lot_started)
@@ -46,14 +68,31 @@ class MainWindow(QMainWindow):
         self._orchestrator.task_output.connect(self._on_task_output)
         self._orchestrator.task_finished.connect(self._on_task_finished)
         self._orchestrator.task_error.connect(self._on_task_error)
+        self._orchestrator.task_skipped.connect(self._on_task_skipped)
         self._orchestrator.all_finished.connect(self._on_all_finished)
         self._orchestrator.request_lot_confirmation.connect(self._on_request_confirmation)
         self._orchestrator.startup_error.connect(self._on_startup_error)
+        self._orchestrator.task_usage.connect(self._on_task_usage)
+        self._run_history = self._open_run_history()
+        self._orchestrator.set_run_history(self._run_history)
+        self._orchestrator.set_checkpoint_journal(CheckpointJournal())
+        self._orchestrator.set_fingerprint_cache(FingerprintCache())
+        self._orchestrator.set_cds_cache(CdsArchiveCache())
+        self._metrics_server: MetricsServer | None = None
+        self._metrics_writer: MetricsTextfileWriter | None = None
+        self._open_metrics()
+        self._log_spool: LogSpool | None = None
+        self._event_journal: EventJournal | None = None
+        self._log_index = self._open_log_index()
+        self._log_parser = LogParsingService(parent=self)
+        self._log_parser.parsed.connect(self._on_task_parsed)
 
         self._jar_path = self._settings_manager.load_jar_path()
         self._command_args = CommandArguments()
         self._lots: List[LotConfig] = []
         self._auto_mode = self._settings_manager.load_auto_mode()
+        self._max_parallel = self._settings_manager.load_max_parallel()
+        self._pipelined = self._settings_manager.load_pipelined()
 
         self._env_watcher = QFileSystemWatcher(self)
         self._env_watcher.fileChanged.connect(self._on_env_fs_event)
@@ -70,8 +109,60 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event: QCloseEvent) -> None:  # type: ignore[override]
         """Ensure the jar path is cleared between sessions."""
         self._settings_manager.clear_jar_path()
+        if self._log_spool:
+            self._log_spool.close()
+        if self._event_journal:
+            self._event_journal.close()
+        if self._log_index:
+            self._log_index.close()
+        if self._run_history:
+            self._run_history.close()
+        if self._metrics_server:
+            self._metrics_server.close()
+        if self._metrics_writer:
+            self._metrics_writer.close()
+        self._write_diagnostics()
         super().closeEvent(event)
 
+    def _write_diagnostics(self) -> None:
+        """Dump the profile and the timings at exit when a capture is running."""
+        if not self._profiler.is_running():
+            return
+        try:
+            write_report(self._lag_probe, self._profiler.stop())
+        except OSError:
+            pass
+
+    def _open_run_history(self) -> RunHistoryStore | None:
+        try:
+            return RunHistoryStore()
+        except (OSError, sqlite3.Error):
+            # L'historique est facultatif : l'ordonnancement se rabat sur la taille des fichiers.
+            return None
+
+    def _open_metrics(self) -> None:
+        port = self._settings_manager.load_metrics_port()
+        textfile = self._settings_manager.load_metrics_textfile()
+        if not port and not textfile:
+            return
+        metrics = MetricsRegistry()
+        self._orchestrator.set_metrics(metrics)
+        if port:
+            try:
+                self._metrics_server = MetricsServer(metrics, port)
+            except OSError:
+                # Port déjà utilisé : les métriques restent disponibles par fichier s'il est configuré.
+                self._metrics_server = None
+        if textfile:
+            self._metrics_writer = MetricsTextfileWriter(metrics, Path(textfile).expanduser())
+
+    def _open_log_index(self) -> LogIndex | None:
+        try:
+            return LogIndex()
+        except (OSError, sqlite3.Error):
+            # Sans index, la recherche dans les journaux est simplement indisponible.
+            return None
+
     def _build_ui(self) -> None:
         central = QWidget()
         self.setCentralWidget(central)
@@ -122,6 +213,19 @@ class MainWindow(QMainWindow):
         save_yaml_btn.clicked.connect(self._save_yaml)
         buttons_layout.addWidget(save_yaml_btn)
 
+        search_logs_btn = QPushButton("Rechercher")
+        search_logs_btn.setIcon(self.style().standardIcon(QStyle.SP_FileDialogContentsView))
+        search_logs_btn.setToolTip("Rechercher un texte dans les journaux de l'exécution en cours et des précédentes")
+        search_logs_btn.setEnabled(self._log_index is not None)
+        search_logs_btn.clicked.connect(self._open_log_search)
+        buttons_layout.addWidget(search_logs_btn)
+
+        diagnostics_btn = QPushButton("Diagnostics")
+        diagnostics_btn.setIcon(self.style().standardIcon(QStyle.SP_ComputerIcon))
+        diagnostics_btn.setToolTip("Retard de l'interface, durée des traitements et profilage")
+        diagnostics_btn.clicked.connect(self._open_diagnostics)
+        buttons_layout.addWidget(diagnostics_btn)
+
         self._mode_button = QPushButton()
         self._mode_button.setCheckable(True)
         self._mode_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
@@ -129,15 +233,54 @@ class MainWindow(QMainWindow):
         self._mode_button.clicked.connect(self._toggle_mode)
         buttons_layout.addWidget(self._mode_button)
 
+        self._pipeline_button = QPushButton("Pipeline")
+        self._pipeline_button.setCheckable(True)
+        self._pipeline_button.setChecked(self._pipelined)
+        self._pipeline_button.setIcon(self.style().standardIcon(QStyle.SP_ArrowForward))
+        self._pipeline_button.setToolTip(
+            "Mode automatique : démarrer le lot suivant dès que toutes les bases du lot courant sont lancées"
+        )
+        self._pipeline_button.toggled.connect(self._on_pipelined_toggled)
+        buttons_layout.addWidget(self._pipeline_button)
+
+        self._force_button = QPushButton("Forcer")
+        self._force_button.setCheckable(True)
+        self._force_button.setIcon(self.style().standardIcon(QStyle.SP_BrowserReload))
+        self._force_button.setToolTip(
+            "Relancer toutes les bases, même celles inchangées depuis leur dernière exécution réussie"
+        )
+        buttons_layout.addWidget(self._force_button)
+
+        parallel_label = QLabel("Parallélisme")
+        buttons_layout.addWidget(parallel_label)
+        self._parallel_spin = QSpinBox()
+        self._parallel_spin.setRange(0, 512)
+        self._parallel_spin.setSpecialValueText("Auto")
+        self._parallel_spin.setValue(self._max_parallel)
+        self._parallel_spin.setToolTip(
+            "Nombre maximal de processus simultanés (Auto : selon les CPU et la mémoire disponibles)"
+        )
+        self._parallel_spin.valueChanged.connect(self._on_max_parallel_changed)
+        buttons_layout.addWidget(self._parallel_spin)
+
         buttons_layout.addStretch()
 
         self._start_button = QPushButton("Démarrer")
         self._start_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay))
         self._start_button.setIconSize(QSize(28, 28))
         self._start_button.setToolTip("Lancer l'orchestration avec les paramètres actuels")
-        self._start_button.clicked.connect(self._start_execution)
+        self._start_button.clicked.connect(lambda: self._start_execution())
         buttons_layout.addWidget(self._start_button)
 
+        self._resume_button = QPushButton("Reprendre")
+        self._resume_button.setIcon(self.style().standardIcon(QStyle.SP_MediaSeekForward))
+        self._resume_button.setIconSize(QSize(28, 28))
+        self._resume_button.setToolTip(
+            "Relancer l'orchestration en ignorant les bases déjà réussies lors de la dernière exécution"
+        )
+        self._resume_button.clicked.connect(lambda: self._start_execution(resume=True))
+        buttons_layout.addWidget(self._resume_button)
+
         self._stop_button = QPushButton("Arrêter")
         self._stop_button.setIcon(self.style().standardIcon(QStyle.SP_MediaStop))
         self._stop_button.setIconSize(QSize(28, 28))
@@ -149,8 +292,9 @@ class MainWindow(QMainWindow):
         header_layout.addLayout(buttons_layout)
         root_layout.addWidget(header_frame)
 
-        self._dashboard = DashboardWidget()
+        self._dashboard = DashboardWidget(self._orchestrator.discovery())
         self._lots_table = self._dashboard.table_widget()
+        self._orchestrator.worker_pool().budget_changed.connect(self._dashboard.update_memory_budget)
 
         lot_buttons_layout = QHBoxLayout()
         lot_buttons_layout.setSpacing(6)
@@ -196,6 +340,7 @@ class MainWindow(QMainWindow):
         splitter.addWidget(overview_container)
 
         self._run_tabs = RunTabsWidget()
+        self._run_tabs.set_max_log_lines(self._settings_manager.load_log_max_lines())
         self._run_tabs.stop_requested.connect(self._stop_single_task)
         splitter.addWidget(self._run_tabs)
         splitter.setStretchFactor(0, 1)
@@ -423,7 +568,7 @@ class MainWindow(QMainWindow):
             self._update_status("Lot ajouté", QStyle.SP_FileDialogNewFolder)
 
     def _edit_lot(self) -> None:
-        row = self._lots_table.currentRow()
+        row = self._lots_table.currentIndex().row()
         if row < 0 or row >= len(self._lots):
             return
         dialog = LotEditorDialog(self._lots[row], self)
@@ -433,14 +578,14 @@ class MainWindow(QMainWindow):
             self._update_status("Lot mis à jour", QStyle.SP_FileDialogContentsView)
 
     def _remove_lot(self) -> None:
-        row = self._lots_table.currentRow()
+        row = self._lots_table.currentIndex().row()
         if row >= 0 and row < len(self._lots):
             self._lots.pop(row)
             self._refresh_lots_table()
             self._update_status("Lot supprimé", QStyle.SP_DialogDiscardButton)
 
     def _move_lot(self, offset: int) -> None:
-        row = self._lots_table.currentRow()
+        row = self._lots_table.currentIndex().row()
         if row < 0:
             return
         new_row = row + offset
@@ -450,12 +595,27 @@ class MainWindow(QMainWindow):
             self._lots_table.selectRow(new_row)
             self._update_status("Ordre mis à jour", QStyle.SP_ArrowUp if offset < 0 else QStyle.SP_ArrowDown)
 
+    @timed
     def _refresh_lots_table(self) -> None:
-        previous_row = self._lots_table.currentRow()
+        previous_row = self._lots_table.currentIndex().row()
         self._dashboard.set_lots(self._lots)
         if 0 <= previous_row < len(self._lots):
             self._lots_table.selectRow(previous_row)
 
+    def _open_diagnostics(self) -> None:
+        if self._diagnostics_dialog is None:
+            self._diagnostics_dialog = DiagnosticsDialog(self._lag_probe, self._profiler, self)
+        self._diagnostics_dialog.show()
+        self._diagnostics_dialog.raise_()
+        self._diagnostics_dialog.activateWindow()
+
+    def _open_log_search(self) -> None:
+        if self._log_index is None:
+            return
+        dialog = LogSearchDialog(self._log_index, self._orchestrator.current_run_id, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
     def _toggle_mode(self) -> None:
         self._auto_mode = not self._auto_mode
         self._settings_manager.save_auto_mode(self._auto_mode)
@@ -465,7 +625,15 @@ class MainWindow(QMainWindow):
             QStyle.SP_BrowserReload if self._auto_mode else QStyle.SP_CommandLink,
         )
 
-    def _start_execution(self) -> None:
+    def _on_pipelined_toggled(self, checked: bool) -> None:
+        self._pipelined = checked
+        self._settings_manager.save_pipelined(checked)
+
+    def _on_max_parallel_changed(self, value: int) -> None:
+        self._max_parallel = value
+        self._settings_manager.save_max_parallel(value)
+
+    def _start_execution(self, resume: bool = False) -> None:
         if not self._jar_path:
             QMessageBox.warning(self, "Jar manquant", "Veuillez sélectionner un fichier jar")
             return
@@ -477,13 +645,50 @@ class MainWindow(QMainWindow):
             lots=list(self._lots),
             command_args=self._command_args,
             auto_mode=self._auto_mode,
+            max_parallel=self._max_parallel or None,
+            pipelined=self._pipelined,
+            force_rerun=self._force_button.isChecked(),
+        )
+        self.start_run(settings, resume=resume)
+
+    def orchestrator(self) -> Orchestrator:
+        return self._orchestrator
+
+    def log_parser(self) -> LogParsingService:
+        return self._log_parser
+
+    @timed
+    def start_run(self, settings: AppSettings, resume: bool = False) -> None:
+        """Start ``settings`` as if from the start button (the lots shown become ``settings.lots``)."""
+
+        if settings.lots != self._lots:
+            self._lots = list(settings.lots)
+            self._refresh_lots_table()
+        if self._log_spool:
+            self._log_spool.close()
+        self._log_spool = LogSpool(
+            new_run_directory(),
+            max_bytes=self._settings_manager.load_log_file_max_mb() * 1024 * 1024,
+            compress=self._settings_manager.load_compress_logs(),
         )
+        if self._event_journal:
+            self._event_journal.close()
+            self._event_journal = None
+        if self._settings_manager.load_event_journal():
+            # Journal des événements à côté des journaux des tâches, relisible avec ui.replay_window.
+            self._event_journal = EventJournal(self._log_spool.run_dir / JOURNAL_FILE_NAME, settings.lots, settings.jar_path)
+            self._event_journal.attach(self._orchestrator)
+        self._log_parser.reset()
         self._run_tabs.reset()
         self._dashboard.prepare_for_run()
-        self._start_button.setEnabled(False)
-        self._stop_button.setEnabled(True)
-        self._update_status("Initialisation...", QStyle.SP_BrowserReload)
-        self._orchestrator.start(settings)
+        self._set_running_controls(True)
+        self._update_status("Reprise..." if resume else "Initialisation...", QStyle.SP_BrowserReload)
+        self._orchestrator.start(settings, resume=resume)
+
+    def _set_running_controls(self, running: bool) -> None:
+        self._start_button.setEnabled(not running)
+        self._resume_button.setEnabled(not running)
+        self._stop_button.setEnabled(running)
 
     def _stop_execution(self) -> None:
         self._orchestrator.stop_all()
@@ -492,11 +697,13 @@ class MainWindow(QMainWindow):
     def _stop_single_task(self, task) -> None:
         self._orchestrator.stop_task(task)
 
+    @timed
     def _on_lot_started(self, lot: LotConfig) -> None:
         self._update_status(f"Lot en cours : {lot.name}", QStyle.SP_MediaPlay)
         self._run_tabs.mark_lot_started(lot.name)
         self._dashboard.mark_lot_started(lot)
 
+    @timed
     def _on_lot_finished(self, lot: LotConfig) -> None:
         self._update_status(f"Lot terminé : {lot.name}", QStyle.SP_DialogApplyButton)
         self._run_tabs.mark_lot_finished(lot.name)
@@ -507,23 +714,54 @@ class MainWindow(QMainWindow):
         self._run_tabs.mark_lot_skipped(lot.name, reason)
         self._dashboard.mark_lot_skipped(lot, reason)
 
+    @timed
     def _on_task_started(self, task, command: str) -> None:
-        self._run_tabs.start_task(task, command)
+        log_path = None
+        if self._log_spool:
+            self._log_spool.start_task(task, command)
+            log_path = self._log_spool.log_path(task)
+        if self._log_index:
+            self._log_index.start_task(self._orchestrator.current_run_id(), task, command, log_path)
+        self._run_tabs.start_task(task, command, log_path)
         self._dashboard.mark_task_started(task)
 
-    def _on_task_output(self, task, text: str, is_error: bool) -> None:
-        self._run_tabs.append_output(task, text, is_error)
-
+    @timed
+    def _on_task_output(self, task, lines: list, is_error: bool) -> None:
+        if self._log_spool:
+            self._log_spool.append(task, lines)
+        if self._log_index:
+            self._log_index.append(self._orchestrator.current_run_id(), task, lines)
+        # Affichage après analyse (niveaux, avancement) dans le thread de l'analyseur.
+        self._log_parser.submit(task, lines, is_error)
+
+    @timed
+    def _on_task_parsed(self, parsed: ParsedOutput) -> None:
+        self._run_tabs.append_parsed(parsed)
+        self._dashboard.update_log_levels(parsed)
+
+    @timed
     def _on_task_finished(self, task, status: ExecutionStatus, exit_code: int) -> None:
+        if self._log_spool:
+            self._log_spool.finish_task(task)
+        if self._log_index:
+            self._log_index.finish_task(self._orchestrator.current_run_id(), task)
+        self._log_parser.forget(task)
         self._run_tabs.finish_task(task, status)
         self._dashboard.mark_task_finished(task, status)
 
+    @timed
+    def _on_task_usage(self, usages: list) -> None:
+        self._dashboard.update_usage(usages)
+        self._run_tabs.update_usage(usages)
+
+    def _on_task_skipped(self, task, reason: str) -> None:
+        self._dashboard.mark_task_skipped(task, reason)
+
     def _on_task_error(self, task, message: str) -> None:
         QMessageBox.critical(self, "Erreur", f"{task.display_name()} : {message}")
 
     def _on_all_finished(self) -> None:
-        self._start_button.setEnabled(True)
-        self._stop_button.setEnabled(False)
+        self._set_running_controls(False)
         self._update_status("Prêt", QStyle.SP_MessageBoxInformation)
         self._dashboard.mark_run_completed()
 
@@ -536,8 +774,7 @@ class MainWindow(QMainWindow):
 
     def _on_startup_error(self, message: str) -> None:
         QMessageBox.critical(self, "Erreur", message)
-        self._start_button.setEnabled(True)
-        self._stop_button.setEnabled(False)
+        self._set_running_controls(False)
         self._update_status("Prêt", QStyle.SP_MessageBoxWarning)
 
 
@@ -0,0 +1,178 @@
+"""Replay of an event journal: ``python -m ui.replay_window runs/<horodatage>/events.jsonl --speed 10``.
+
+The journal is fed to a dashboard and run tabs wired as in the main window,
+to inspect a past run or to measure the interface under a real event load.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import (
+    QApplication,
+    QComboBox,
+    QHBoxLayout,
+    QLabel,
+    QMainWindow,
+    QPushButton,
+    QSplitter,
+    QStyle,
+    QVBoxLayout,
+    QWidget,
+)
+
+from core.event_journal import EventReplayer
+from core.log_parser import LogParsingService, ParsedOutput
+from core.log_spool import task_log_path
+from core.models import DatabaseTask, ExecutionStatus, LotConfig
+from ui.dashboard import DashboardWidget
+from ui.run_tabs import RunTabsWidget
+
+# Vitesses proposées ; 0 : sans attente.
+SPEEDS = (0.5, 1.0, 2.0, 5.0, 10.0, 50.0, 0.0)
+
+
+def _speed_label(speed: float) -> str:
+    return "Maximale" if speed == 0 else f"× {speed:g}".replace(".", ",")
+
+
+class ReplayWindow(QMainWindow):
+    def __init__(self, journal_path: Path, speed: float = 1.0, quit_at_end: bool = False):
+        super().__init__()
+        self.setWindowTitle(f"Relecture : {journal_path}")
+        self.resize(1200, 800)
+        self._journal_path = journal_path
+        self._quit_at_end = quit_at_end
+        self._started = 0.0
+
+        self._replayer = EventReplayer(journal_path, speed, self)
+        self._log_parser = LogParsingService(parent=self)
+        self._log_parser.parsed.connect(self._on_task_parsed)
+        self._dashboard = DashboardWidget()
+        self._run_tabs = RunTabsWidget()
+
+        self._speed_combo = QComboBox()
+        for value in SPEEDS:
+            self._speed_combo.addItem(_speed_label(value), value)
+        self._speed_combo.setCurrentIndex(SPEEDS.index(speed) if speed in SPEEDS else self._add_speed(speed))
+        self._speed_combo.currentIndexChanged.connect(
+            lambda _index: self._replayer.set_speed(self._speed_combo.currentData())
+        )
+        self._pause_button = QPushButton("Pause")
+        self._pause_button.setCheckable(True)
+        self._pause_button.setIcon(self.style().standardIcon(QStyle.SP_MediaPause))
+        self._pause_button.toggled.connect(self._replayer.set_paused)
+        self._position_label = QLabel()
+        self._position_label.setStyleSheet("color: #555;")
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Vitesse"))
+        controls.addWidget(self._speed_combo)
+        controls.addWidget(self._pause_button)
+        controls.addStretch()
+        controls.addWidget(self._position_label)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self._dashboard)
+        splitter.addWidget(self._run_tabs)
+        splitter.setStretchFactor(1, 1)
+
+        central = QWidget()
+        layout = QVBoxLayout(central)
+        layout.addLayout(controls)
+        layout.addWidget(splitter, stretch=1)
+        self.setCentralWidget(central)
+
+        replayer = self._replayer
+        replayer.lots_loaded.connect(self._on_lots_loaded)
+        replayer.lot_started.connect(lambda lot: (self._run_tabs.mark_lot_started(lot.name), self._dashboard.mark_lot_started(lot)))
+        replayer.lot_finished.connect(lambda lot: (self._run_tabs.mark_lot_finished(lot.name), self._dashboard.mark_lot_finished(lot)))
+        replayer.lot_skipped.connect(self._on_lot_skipped)
+        replayer.task_started.connect(self._on_task_started)
+        replayer.task_output.connect(self._log_parser.submit)
+        replayer.task_finished.connect(self._on_task_finished)
+        replayer.task_skipped.connect(self._dashboard.mark_task_skipped)
+        replayer.task_usage.connect(self._on_task_usage)
+        replayer.budget_changed.connect(self._dashboard.update_memory_budget)
+        replayer.all_finished.connect(self._dashboard.mark_run_completed)
+        replayer.position_changed.connect(self._on_position_changed)
+        replayer.finished.connect(self._on_replay_finished)
+
+    def start(self) -> None:
+        self._started = time.monotonic()
+        self._replayer.start()
+
+    def _add_speed(self, speed: float) -> int:
+        self._speed_combo.addItem(_speed_label(speed), speed)
+        return self._speed_combo.count() - 1
+
+    def _on_lots_loaded(self, lots: List[LotConfig]) -> None:
+        self._log_parser.reset()
+        self._run_tabs.reset()
+        self._dashboard.set_lots(lots)
+        self._dashboard.prepare_for_run()
+
+    def _on_lot_skipped(self, lot: LotConfig, reason: str) -> None:
+        self._run_tabs.mark_lot_skipped(lot.name, reason)
+        self._dashboard.mark_lot_skipped(lot, reason)
+
+    def _on_task_started(self, task: DatabaseTask, command: str) -> None:
+        # Le journal est écrit dans le dossier de l'exécution : les journaux des tâches sont à côté.
+        log_path: Optional[Path] = task_log_path(self._journal_path.parent, task)
+        if not log_path.exists():
+            log_path = None
+        self._run_tabs.start_task(task, command, log_path)
+        self._dashboard.mark_task_started(task)
+
+    def _on_task_parsed(self, parsed: ParsedOutput) -> None:
+        self._run_tabs.append_parsed(parsed)
+        self._dashboard.update_log_levels(parsed)
+
+    def _on_task_finished(self, task: DatabaseTask, status: ExecutionStatus, _exit_code: int) -> None:
+        self._log_parser.forget(task)
+        self._run_tabs.finish_task(task, status)
+        self._dashboard.mark_task_finished(task, status)
+
+    def _on_task_usage(self, usages: list) -> None:
+        self._dashboard.update_usage(usages)
+        self._run_tabs.update_usage(usages)
+
+    def _on_position_changed(self, position: float) -> None:
+        minutes, seconds = divmod(int(position), 60)
+        self._position_label.setText(f"Temps de l'exécution : {minutes // 60:02d}:{minutes % 60:02d}:{seconds:02d}")
+
+    def _on_replay_finished(self) -> None:
+        elapsed = time.monotonic() - self._started
+        self._position_label.setText(f"{self._position_label.text()}  ·  relecture terminée en {elapsed:.1f} s")
+        if self._quit_at_end:
+            print(f"Relecture terminée en {elapsed:.2f} s (journal : {self._replayer.position():.1f} s)", flush=True)
+            QApplication.instance().quit()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="replay_window", description="Relecture d'un journal d'événements")
+    parser.add_argument("journal", help="Fichier events.jsonl d'une exécution")
+    parser.add_argument("--speed", type=float, default=1.0, help="Facteur d'accélération (0 : sans attente)")
+    parser.add_argument(
+        "--quit-at-end",
+        action="store_true",
+        help="Fermer à la fin de la relecture et afficher sa durée (mesure de l'interface)",
+    )
+    args = parser.parse_args(argv)
+    journal = Path(args.journal).expanduser()
+    if not journal.exists():
+        print(f"Journal introuvable : {journal}", file=sys.stderr)
+        return 2
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    window = ReplayWindow(journal, max(0.0, args.speed), args.quit_at_end)
+    window.show()
+    window.start()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
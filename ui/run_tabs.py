@@ -1,194 +1,688 @@
 from __future__ import annotations
 
-from typing import Callable, Dict
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
 
-from PySide6.QtCore import QElapsedTimer, QTimer, Qt, Signal, QSize
-from PySide6.QtGui import QTextCursor
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QSize,
+    QSortFilterProxyModel,
+    Qt,
+    QTimer,
+    Signal,
+)
+from PySide6.QtGui import QBrush, QColor, QIcon
 from PySide6.QtWidgets import (
+    QAbstractItemView,
+    QComboBox,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
+    QLineEdit,
+    QProgressBar,
     QPushButton,
-    QSizePolicy,
+    QSplitter,
+    QStyle,
+    QTableView,
     QTabWidget,
-    QTextEdit,
     QVBoxLayout,
     QWidget,
-    QStyle,
 )
 
+from core.diagnostics import timed
+from core.log_parser import ParsedOutput, SpringBootLineParser
 from core.models import DatabaseTask, ExecutionStatus
+from core.process_sampler import TaskUsage
+from ui.log_file_viewer import LogFileViewerDialog
+from ui.log_view import DEFAULT_MAX_LOG_LINES, LogView
+
+# Tâches terminées dont les dernières lignes restent en mémoire : l'analyse de leur
+# sortie peut encore livrer des lignes après la fin du processus.
+KEEP_FINISHED_BUFFERS = 8
+# Octets lus au plus à la fin du journal d'une tâche terminée pour l'afficher.
+MAX_TAIL_BYTES = 8 * 1024 * 1024
+
+COLUMNS = ["Base", "Statut", "Temps écoulé", "Avancement", "Alertes", "Consommation"]
+_ELAPSED_COLUMN = 2
+_SORT_ROLE = Qt.UserRole
+
+_STATUS_TEXT = {
+    ExecutionStatus.PENDING: "A Traiter",
+    ExecutionStatus.RUNNING: "En cours de traitement",
+    ExecutionStatus.SUCCEEDED: "Terminé",
+    ExecutionStatus.FAILED: "Interrompu",
+    ExecutionStatus.STOPPED: "Interrompu",
+}
+# (fond, texte) de chaque statut.
+_STATUS_COLORS = {
+    ExecutionStatus.PENDING: ("#E0ECFF", "#0A4F8B"),
+    ExecutionStatus.RUNNING: ("#FFF4CC", "#8A6D3B"),
+    ExecutionStatus.SUCCEEDED: ("#DFF2BF", "#3C763D"),
+    ExecutionStatus.FAILED: ("#F2DEDE", "#A94442"),
+    ExecutionStatus.STOPPED: ("#F2DEDE", "#A94442"),
+}
+_STATUS_ICONS = {
+    ExecutionStatus.PENDING: QStyle.SP_BrowserReload,
+    ExecutionStatus.RUNNING: QStyle.SP_MediaPlay,
+    ExecutionStatus.SUCCEEDED: QStyle.SP_DialogApplyButton,
+    ExecutionStatus.FAILED: QStyle.SP_MessageBoxCritical,
+    ExecutionStatus.STOPPED: QStyle.SP_MessageBoxWarning,
+}
+_FINISHED = (ExecutionStatus.SUCCEEDED, ExecutionStatus.FAILED, ExecutionStatus.STOPPED)
+
+
+def _format_bytes(value: int) -> str:
+    megabytes = value / (1024 * 1024)
+    if megabytes >= 1024:
+        return f"{megabytes / 1024:.1f} Go".replace(".", ",")
+    return f"{megabytes:.0f} Mo"
+
+
+def _format_elapsed(seconds: float) -> str:
+    total_seconds = int(seconds)
+    hours = total_seconds // 3600
+    minutes = (total_seconds // 60) % 60
+    seconds = total_seconds % 60
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+
+@dataclass
+class TaskRecord:
+    """What the run view keeps about a task; a finished task is reduced to its counters."""
+
+    task: DatabaseTask
+    command: str
+    log_path: Optional[Path] = None
+    status: ExecutionStatus = ExecutionStatus.RUNNING
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    progress: Optional[Tuple[int, int]] = None
+    totals: Dict[str, int] = field(default_factory=dict)
+    exceptions: List[str] = field(default_factory=list)
+    usage: Optional[TaskUsage] = None
+    # Dernières lignes (texte, niveau, sortie d'erreur), libérées peu après la fin de la tâche.
+    lines: Optional[Deque[Tuple[str, Optional[str], bool]]] = None
+
+    def elapsed_seconds(self) -> float:
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    def progress_text(self) -> str:
+        if self.progress is None:
+            return ""
+        done, total = self.progress
+        percent = f"{done * 100 / total:.0f} %" if total > 0 else "?"
+        return f"{done} / {total} ({percent})"
+
+    def levels_text(self) -> str:
+        totals = self.totals
+        parts = [f"{level} : {totals[level]}" for level in ("ERROR", "WARN", "INFO") if totals.get(level)]
+        if totals.get("FATAL"):
+            parts.insert(0, f"FATAL : {totals['FATAL']}")
+        if self.exceptions:
+            parts.append(f"Exceptions : {len(self.exceptions)}")
+        return "  ·  ".join(parts)
+
+    def alerts_text(self) -> str:
+        errors = self.totals.get("ERROR", 0) + self.totals.get("FATAL", 0)
+        warnings = self.totals.get("WARN", 0)
+        if not errors and not warnings and not self.exceptions:
+            return ""
+        text = f"{errors} erreur(s), {warnings} avert."
+        if self.exceptions:
+            text += f", {len(self.exceptions)} exception(s)"
+        return text
+
+    def usage_text(self) -> str:
+        sample = self.usage.current if self.usage is not None else None
+        if sample is None:
+            return ""
+        return (
+            f"CPU : {sample.cpu_percent:.0f} % (pic {self.usage.peak_cpu_percent:.0f} %)"
+            f"  ·  Mémoire : {_format_bytes(sample.rss_bytes)} (pic {_format_bytes(self.usage.peak_rss_bytes)})"
+            f"  ·  Lu : {_format_bytes(sample.read_bytes)}  ·  Écrit : {_format_bytes(sample.write_bytes)}"
+        )
+
+
+def read_log_tail(path: Path, max_lines: int) -> List[str]:
+    """Last ``max_lines`` lines of a log file (at most ``MAX_TAIL_BYTES`` read)."""
+
+    try:
+        with path.open("rb") as handle:
+            size = handle.seek(0, 2)
+            start = max(0, size - MAX_TAIL_BYTES)
+            block = 64 * 1024
+            position = size
+            data = b""
+            while position > start and data.count(b"\n") <= max_lines:
+                read_from = max(start, position - block)
+                handle.seek(read_from)
+                data = handle.read(position - read_from) + data
+                position = read_from
+                block *= 2
+    except OSError:
+        return []
+    lines = data.decode("utf-8", errors="replace").splitlines()
+    if position > 0 and lines:
+        lines = lines[1:]  # Première ligne coupée.
+    return lines[-max_lines:]
+
+
+def _levels_of(lines: List[str]) -> List[Optional[str]]:
+    """Level of each line, continuation lines inheriting the one of their header."""
+
+    parser = SpringBootLineParser()
+    level: Optional[str] = None
+    levels: List[Optional[str]] = []
+    for line in lines:
+        record = parser.parse(line)
+        if record is not None:
+            level = record.level
+        levels.append(level)
+    return levels
+
+
+class TaskTableModel(QAbstractTableModel):
+    """One row per task of a lot, in start order."""
+
+    def __init__(self, icons: Dict[ExecutionStatus, QIcon], parent=None):
+        super().__init__(parent)
+        self._icons = icons
+        self._records: List[TaskRecord] = []
+        self._rows: Dict[str, int] = {}
+        self._running_rows: Set[int] = set()
+        self._failed_rows: Set[int] = set()
+        self._dirty_rows: Set[int] = set()
+
+    def record(self, row: int) -> TaskRecord:
+        return self._records[row]
+
+    def record_for(self, task: DatabaseTask) -> Optional[TaskRecord]:
+        row = self._rows.get(task.id())
+        return None if row is None else self._records[row]
+
+    def row_of(self, task: DatabaseTask) -> int:
+        return self._rows.get(task.id(), -1)
+
+    def running_count(self) -> int:
+        return len(self._running_rows)
+
+    def failed_count(self) -> int:
+        return len(self._failed_rows)
+
+    def add(self, record: TaskRecord) -> int:
+        row = self._rows.get(record.task.id())
+        if row is not None:
+            # Tâche relancée : la ligne existante reprend son état initial.
+            self._records[row] = record
+            self._running_rows.add(row)
+            self._failed_rows.discard(row)
+            self.row_changed(row)
+            return row
+        row = len(self._records)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._records.append(record)
+        self._rows[record.task.id()] = row
+        self._running_rows.add(row)
+        self.endInsertRows()
+        return row
+
+    def set_finished(self, row: int, status: ExecutionStatus) -> None:
+        self._records[row].status = status
+        self._running_rows.discard(row)
+        if status in (ExecutionStatus.FAILED, ExecutionStatus.STOPPED):
+            self._failed_rows.add(row)
+        else:
+            self._failed_rows.discard(row)
+        self.row_changed(row)
+
+    def mark_dirty(self, row: int) -> None:
+        self._dirty_rows.add(row)
+
+    def row_changed(self, row: int) -> None:
+        self._dirty_rows.discard(row)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def tick(self) -> None:
+        """Shared clock: elapsed time of the running tasks and rows changed since the last tick."""
+
+        for row in sorted(self._dirty_rows):
+            self.row_changed(row)
+        for row in sorted(self._running_rows):
+            index = self.index(row, _ELAPSED_COLUMN)
+            self.dataChanged.emit(index, index)
+
+    def rowCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(self._records)
+
+    def columnCount(self, parent=QModelIndex()) -> int:  # type: ignore[override]
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):  # type: ignore[override]
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return self._display(record, column)
+        if role == _SORT_ROLE:
+            if column == _ELAPSED_COLUMN:
+                return record.elapsed_seconds()
+            if column == 3:
+                done, total = record.progress or (0, 0)
+                return done / total if total else -1.0
+            if column == 4:
+                return record.totals.get("ERROR", 0) + record.totals.get("FATAL", 0) + len(record.exceptions)
+            return self._display(record, column)
+        if role == Qt.DecorationRole and column == 0:
+            return self._icons.get(record.status)
+        if role == Qt.ToolTipRole:
+            if column == 0:
+                return str(record.task.database)
+            if column == 4 and record.exceptions:
+                return "\n".join(record.exceptions)
+            return None
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole) and column == 1:
+            background, foreground = _STATUS_COLORS.get(record.status, ("", ""))
+            color = background if role == Qt.BackgroundRole else foreground
+            return QBrush(QColor(color)) if color else None
+        if role == Qt.ForegroundRole and column == 4:
+            if record.totals.get("ERROR") or record.totals.get("FATAL") or record.exceptions:
+                return QBrush(QColor("#A94442"))
+            if record.totals.get("WARN"):
+                return QBrush(QColor("#8A6D3B"))
+        return None
+
+    def _display(self, record: TaskRecord, column: int) -> str:
+        if column == 0:
+            return record.task.display_name()
+        if column == 1:
+            return _STATUS_TEXT.get(record.status, record.status.name)
+        if column == _ELAPSED_COLUMN:
+            return _format_elapsed(record.elapsed_seconds())
+        if column == 3:
+            return record.progress_text()
+        if column == 4:
+            return record.alerts_text()
+        sample = record.usage.current if record.usage is not None else None
+        if sample is None or record.status in _FINISHED:
+            return ""
+        return f"{sample.cpu_percent:.0f} % · {_format_bytes(sample.rss_bytes)}"
+
+
+class TaskFilterProxy(QSortFilterProxyModel):
+    """Filters the tasks by name and by status group."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._text = ""
+        self._status = "all"
+        self.setSortRole(_SORT_ROLE)
+
+    def set_text(self, text: str) -> None:
+        self._text = text.strip().casefold()
+        self.invalidateFilter()
+
+    def set_status(self, status: str) -> None:
+        self._status = status
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:  # type: ignore[override]
+        record = self.sourceModel().record(source_row)
+        if self._text and self._text not in record.task.display_name().casefold():
+            return False
+        if self._status == "running":
+            return record.status == ExecutionStatus.RUNNING
+        if self._status == "succeeded":
+            return record.status == ExecutionStatus.SUCCEEDED
+        if self._status == "failed":
+            return record.status in (ExecutionStatus.FAILED, ExecutionStatus.STOPPED)
+        return True
 
 
-class RunTab(QWidget):
-    def __init__(self, task: DatabaseTask, command: str, parent=None):
+class TaskDetailPane(QWidget):
+    """Détail de la tâche sélectionnée : une seule instance par lot, réaffectée à chaque sélection."""
+
+    def __init__(self, max_log_lines: int = DEFAULT_MAX_LOG_LINES, parent=None):
         super().__init__(parent)
-        self.task = task
-        self.command = command
+        self.record: Optional[TaskRecord] = None
+        self._max_log_lines = max_log_lines
+        self.command_label = QLabel()
+        self.command_label.setWordWrap(True)
+        self.command_label.setStyleSheet("font-family: monospace; color: #333;")
         self.status_label = QLabel()
         self.status_label.setAlignment(Qt.AlignCenter)
         self.status_label.setMargin(6)
-        self.timer_label = QLabel("Temps écoulé : 00:00")
-        self.log_view = QTextEdit()
-        self.log_view.setReadOnly(True)
+        self.timer_label = QLabel()
+        self.usage_label = QLabel()
+        self.usage_label.setStyleSheet("color: #555;")
+        self.levels_label = QLabel()
+        self.levels_label.setStyleSheet("color: #555;")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setVisible(False)
+        self.log_view = LogView(max_log_lines)
         self.log_view.setPlaceholderText("Les messages du process apparaîtront ici...")
         self.stop_button = QPushButton("Arrêter ce process")
         self.stop_button.setIcon(self.style().standardIcon(QStyle.SP_MediaStop))
         self.stop_button.setIconSize(QSize(20, 20))
         self.stop_button.setToolTip("Forcer l'arrêt de ce process en cours")
-        self._elapsed_timer = QElapsedTimer()
-        self._tick_timer = QTimer(self)
-        self._tick_timer.setInterval(1000)
-        self._tick_timer.timeout.connect(self._update_elapsed_time)
+        self.open_log_button = QPushButton("Ouvrir le journal complet")
+        self.open_log_button.setIcon(self.style().standardIcon(QStyle.SP_FileDialogContentsView))
+        self.open_log_button.clicked.connect(self._open_full_log)
+        self.set_max_log_lines(max_log_lines)
 
         layout = QVBoxLayout(self)
-        command_label = QLabel(f"Commande : {command}")
-        command_label.setWordWrap(True)
-        command_label.setStyleSheet("font-family: monospace; color: #333;")
-        layout.addWidget(command_label)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.command_label)
         status_layout = QHBoxLayout()
         status_layout.addWidget(QLabel("Statut :"))
         status_layout.addWidget(self.status_label)
         status_layout.addStretch()
+        status_layout.addWidget(self.usage_label)
         status_layout.addWidget(self.timer_label)
         layout.addLayout(status_layout)
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.progress_bar, stretch=1)
+        progress_layout.addWidget(self.levels_label)
+        layout.addLayout(progress_layout)
         layout.addWidget(self.log_view)
         controls_layout = QHBoxLayout()
+        controls_layout.addWidget(self.open_log_button)
         controls_layout.addStretch()
         controls_layout.addWidget(self.stop_button)
         layout.addLayout(controls_layout)
-        self.set_status(ExecutionStatus.PENDING)
 
-    def append_text(self, text: str, is_error: bool = False) -> None:
-        if is_error:
-            self.log_view.setTextColor(Qt.red)
-        else:
-            self.log_view.setTextColor(Qt.black)
-        self.log_view.append(text)
-        cursor = self.log_view.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.log_view.setTextCursor(cursor)
-
-    def set_status(self, status: ExecutionStatus) -> None:
-        text_mapping = {
-            ExecutionStatus.PENDING: "A Traiter",
-            ExecutionStatus.RUNNING: "En cours de traitement",
-            ExecutionStatus.SUCCEEDED: "Terminé",
-            ExecutionStatus.FAILED: "Interrompu",
-            ExecutionStatus.STOPPED: "Interrompu",
-        }
-        style_mapping = {
-            ExecutionStatus.PENDING: "background-color: #E0ECFF; color: #0A4F8B; border-radius: 10px;",
-            ExecutionStatus.RUNNING: "background-color: #FFF4CC; color: #8A6D3B; border-radius: 10px;",
-            ExecutionStatus.SUCCEEDED: "background-color: #DFF2BF; color: #3C763D; border-radius: 10px;",
-            ExecutionStatus.FAILED: "background-color: #F2DEDE; color: #A94442; border-radius: 10px;",
-            ExecutionStatus.STOPPED: "background-color: #F2DEDE; color: #A94442; border-radius: 10px;",
-        }
-        self.status_label.setText(text_mapping.get(status, status.name))
-        style = style_mapping.get(status)
-        if style:
-            self.status_label.setStyleSheet(style)
-        self.stop_button.setEnabled(status == ExecutionStatus.RUNNING)
-        if status == ExecutionStatus.RUNNING and not self._tick_timer.isActive():
-            self._start_elapsed_timer()
-        elif status in (ExecutionStatus.SUCCEEDED, ExecutionStatus.FAILED, ExecutionStatus.STOPPED):
-            self._stop_elapsed_timer()
-
-    def _start_elapsed_timer(self) -> None:
-        self._elapsed_timer.start()
-        self._update_elapsed_time()
-        self._tick_timer.start()
-
-    def _stop_elapsed_timer(self) -> None:
-        if self._tick_timer.isActive():
-            self._tick_timer.stop()
-        if self._elapsed_timer.isValid():
-            self._update_elapsed_time()
-
-    def _update_elapsed_time(self) -> None:
-        if not self._elapsed_timer.isValid():
+    def set_max_log_lines(self, max_lines: int) -> None:
+        self._max_log_lines = max_lines
+        self.log_view.set_max_lines(max_lines)
+        self.open_log_button.setToolTip(
+            f"Seules les {max_lines} dernières lignes sont affichées ici ; le journal complet est sur disque"
+        )
+
+    def show_record(self, record: TaskRecord) -> None:
+        self.record = record
+        self.command_label.setText(f"Commande : {record.command}")
+        self.open_log_button.setEnabled(record.log_path is not None)
+        self.log_view.clear()
+        if record.lines is not None:
+            self._append_buffered(list(record.lines))
+        elif record.log_path is not None:
+            # Tâche terminée : ses lignes ne sont plus en mémoire, relire la fin de son journal.
+            lines = read_log_tail(record.log_path, self._max_log_lines)
+            self.log_view.append_lines(lines, levels=_levels_of(lines))
+        self.refresh()
+
+    def _append_buffered(self, buffered: List[Tuple[str, Optional[str], bool]]) -> None:
+        # Une insertion par suite de lignes de même flux.
+        start = 0
+        for index in range(1, len(buffered) + 1):
+            if index < len(buffered) and buffered[index][2] == buffered[start][2]:
+                continue
+            chunk = buffered[start:index]
+            self.log_view.append_lines([line for line, _, _ in chunk], chunk[0][2], [level for _, level, _ in chunk])
+            start = index
+
+    def append_parsed(self, parsed: ParsedOutput) -> None:
+        self.log_view.append_lines(parsed.lines, parsed.is_error, parsed.levels)
+        self.refresh()
+
+    def refresh(self) -> None:
+        record = self.record
+        if record is None:
             return
-        elapsed_ms = self._elapsed_timer.elapsed()
-        hours = elapsed_ms // 3_600_000
-        minutes = (elapsed_ms // 60_000) % 60
-        seconds = (elapsed_ms // 1_000) % 60
-        if hours:
-            formatted = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        self.status_label.setText(_STATUS_TEXT.get(record.status, record.status.name))
+        background, foreground = _STATUS_COLORS.get(record.status, ("#FFFFFF", "#000000"))
+        self.status_label.setStyleSheet(f"background-color: {background}; color: {foreground}; border-radius: 10px;")
+        self.stop_button.setEnabled(record.status == ExecutionStatus.RUNNING)
+        self.usage_label.setText(record.usage_text() if record.status == ExecutionStatus.RUNNING else "")
+        if record.progress is not None:
+            done, total = record.progress
+            # Échelle fixe : les totaux peuvent dépasser les entiers 32 bits de QProgressBar.
+            self.progress_bar.setValue(min(1000, done * 1000 // total) if total > 0 else 0)
+            self.progress_bar.setFormat(record.progress_text())
+        self.progress_bar.setVisible(record.progress is not None)
+        self.levels_label.setText(record.levels_text())
+        self.levels_label.setToolTip("\n".join(record.exceptions))
+        if record.totals.get("ERROR") or record.totals.get("FATAL"):
+            self.levels_label.setStyleSheet("color: #A94442; font-weight: 600;")
+        elif record.totals.get("WARN"):
+            self.levels_label.setStyleSheet("color: #8A6D3B; font-weight: 600;")
         else:
-            formatted = f"{minutes:02d}:{seconds:02d}"
-        self.timer_label.setText(f"Temps écoulé : {formatted}")
+            self.levels_label.setStyleSheet("color: #555;")
+        self.update_elapsed()
+
+    def update_elapsed(self) -> None:
+        if self.record is not None:
+            self.timer_label.setText(f"Temps écoulé : {_format_elapsed(self.record.elapsed_seconds())}")
+
+    def _open_full_log(self) -> None:
+        if self.record is None or self.record.log_path is None:
+            return
+        dialog = LogFileViewerDialog(self.record.log_path, self)
+        dialog.show()
 
 
 class LotLogsTab(QWidget):
+    """Tâches d'un lot : tableau filtrable et détail de la tâche sélectionnée.
+
+    Le détail (journal, compteurs) n'est construit qu'à la première
+    sélection puis réaffecté ; seules les tâches en cours et les dernières
+    terminées gardent leurs lignes en mémoire, les autres se réduisent à
+    leurs compteurs et relisent leur journal sur disque à l'affichage.
+    """
+
     def __init__(self, lot_name: str, stop_callback: Callable[[DatabaseTask], None], parent=None):
         super().__init__(parent)
         self.lot_name = lot_name
         self._stop_callback = stop_callback
-        self._tabs: Dict[str, RunTab] = {}
+        self.max_log_lines = DEFAULT_MAX_LOG_LINES
+        self._recent_finished: Deque[TaskRecord] = deque()
+        self._detail: Optional[TaskDetailPane] = None
 
         layout = QVBoxLayout(self)
         layout.setContentsMargins(8, 8, 8, 8)
         header = QLabel(f"Logs du lot : {lot_name}")
         header.setAlignment(Qt.AlignLeft)
         header.setStyleSheet("font-weight: 600; color: #444;")
-        layout.addWidget(header)
-
-        self._tab_widget = QTabWidget()
-        self._tab_widget.setDocumentMode(True)
-        self._tab_widget.setMovable(True)
-        self._tab_widget.setTabPosition(QTabWidget.North)
-        self._tab_widget.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        layout.addWidget(self._tab_widget)
-
-    def start_task(self, task: DatabaseTask, command: str) -> None:
-        tab = RunTab(task, command)
-        tab.set_status(ExecutionStatus.RUNNING)
-        tab.stop_button.clicked.connect(lambda _=False, t=task: self._stop_callback(t))
-        self._tabs[task.id()] = tab
-        self._tab_widget.addTab(
-            tab,
-            self._icon_for_status(ExecutionStatus.RUNNING),
-            task.display_name(),
-        )
-        self._tab_widget.setCurrentWidget(tab)
 
-    def append_output(self, task: DatabaseTask, text: str, is_error: bool) -> None:
-        tab = self._tabs.get(task.id())
-        if tab:
-            tab.append_text(text, is_error)
+        self._filter_edit = QLineEdit()
+        self._filter_edit.setPlaceholderText("Filtrer les bases...")
+        self._filter_edit.setClearButtonEnabled(True)
+        self._status_combo = QComboBox()
+        self._status_combo.addItem("Toutes", "all")
+        self._status_combo.addItem("En cours", "running")
+        self._status_combo.addItem("Terminées", "succeeded")
+        self._status_combo.addItem("Interrompues", "failed")
+        self._counts_label = QLabel()
+        self._counts_label.setStyleSheet("color: #555;")
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(header)
+        filter_layout.addStretch()
+        filter_layout.addWidget(self._counts_label)
+        filter_layout.addWidget(self._filter_edit)
+        filter_layout.addWidget(self._status_combo)
+        layout.addLayout(filter_layout)
+
+        icons = {status: self.style().standardIcon(icon) for status, icon in _STATUS_ICONS.items()}
+        self._model = TaskTableModel(icons, self)
+        self._proxy = TaskFilterProxy(self)
+        self._proxy.setSourceModel(self._model)
+        self._filter_edit.textChanged.connect(self._proxy.set_text)
+        self._status_combo.currentIndexChanged.connect(lambda _index: self._proxy.set_status(self._status_combo.currentData()))
+
+        self._table = QTableView()
+        self._table.setModel(self._proxy)
+        self._table.setSortingEnabled(True)
+        self._table.sortByColumn(-1, Qt.AscendingOrder)
+        self._table.verticalHeader().setVisible(False)
+        self._table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self._table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self._table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self._table.setAlternatingRowColors(True)
+        self._table.setWordWrap(False)
+        header_view = self._table.horizontalHeader()
+        header_view.setSectionResizeMode(QHeaderView.Interactive)
+        header_view.setSectionResizeMode(0, QHeaderView.Stretch)
+        self._table.selectionModel().currentRowChanged.connect(self._on_current_changed)
+
+        self._detail_container = QWidget()
+        self._detail_layout = QVBoxLayout(self._detail_container)
+        self._detail_layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel("Sélectionnez une base pour afficher son journal.")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._placeholder.setStyleSheet("color: #777;")
+        self._detail_layout.addWidget(self._placeholder)
+
+        splitter = QSplitter(Qt.Vertical)
+        splitter.addWidget(self._table)
+        splitter.addWidget(self._detail_container)
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 2)
+        layout.addWidget(splitter, stretch=1)
+
+    def has_running_tasks(self) -> bool:
+        return self._model.running_count() > 0
+
+    def record_for(self, task: DatabaseTask) -> Optional[TaskRecord]:
+        return self._model.record_for(task)
+
+    def detail_pane(self) -> Optional[TaskDetailPane]:
+        return self._detail
+
+    def start_task(self, task: DatabaseTask, command: str, log_path: Optional[Path] = None) -> None:
+        record = TaskRecord(task, command, log_path, lines=deque(maxlen=self.max_log_lines))
+        row = self._model.add(record)
+        if not self._table.currentIndex().isValid():
+            self._select_source_row(row)
+        elif self._detail is not None and self._detail.record is not None and self._detail.record.task.id() == task.id():
+            self._detail.show_record(record)
+        self._update_counts()
+
+    def append_output(self, task: DatabaseTask, lines: List[str], is_error: bool) -> None:
+        self.append_parsed(ParsedOutput(task, lines, is_error, [None] * len(lines)))
+
+    def append_parsed(self, parsed: ParsedOutput) -> None:
+        row = self._model.row_of(parsed.task)
+        if row < 0:
+            return
+        record = self._model.record(row)
+        if record.lines is not None:
+            record.lines.extend(zip(parsed.lines, parsed.levels, [parsed.is_error] * len(parsed.lines)))
+        if parsed.progress is not None:
+            record.progress = parsed.progress
+        if parsed.exceptions:
+            record.exceptions.extend(parsed.exceptions)
+        if parsed.counts:
+            record.totals = parsed.totals
+        self._model.mark_dirty(row)
+        if self._detail is not None and self._detail.record is record:
+            self._detail.append_parsed(parsed)
+
+    def set_max_log_lines(self, max_lines: int) -> None:
+        self.max_log_lines = max_lines
+        if self._detail is not None:
+            self._detail.set_max_log_lines(max_lines)
+
+    def update_usage(self, usage: TaskUsage) -> None:
+        row = self._model.row_of(usage.task)
+        if row < 0:
+            return
+        record = self._model.record(row)
+        record.usage = usage
+        self._model.mark_dirty(row)
+        if self._detail is not None and self._detail.record is record:
+            self._detail.usage_label.setText(record.usage_text())
 
     def finish_task(self, task: DatabaseTask, status: ExecutionStatus) -> None:
-        tab = self._tabs.get(task.id())
-        if tab:
-            tab.set_status(status)
-            index = self._tab_widget.indexOf(tab)
-            if index != -1:
-                self._tab_widget.setTabIcon(index, self._icon_for_status(status))
-
-    def _icon_for_status(self, status: ExecutionStatus):
-        mapping = {
-            ExecutionStatus.PENDING: QStyle.SP_BrowserReload,
-            ExecutionStatus.RUNNING: QStyle.SP_MediaPlay,
-            ExecutionStatus.SUCCEEDED: QStyle.SP_DialogApplyButton,
-            ExecutionStatus.FAILED: QStyle.SP_MessageBoxCritical,
-            ExecutionStatus.STOPPED: QStyle.SP_MessageBoxWarning,
-        }
-        icon_type = mapping.get(status, QStyle.SP_FileDialogInfoView)
-        return self.style().standardIcon(icon_type)
+        row = self._model.row_of(task)
+        if row < 0:
+            return
+        record = self._model.record(row)
+        record.finished_at = time.monotonic()
+        self._model.set_finished(row, status)
+        self._recent_finished.append(record)
+        while len(self._recent_finished) > KEEP_FINISHED_BUFFERS:
+            self._recent_finished.popleft().lines = None
+        if self._detail is not None and self._detail.record is record:
+            self._detail.refresh()
+        self._update_counts()
+
+    def tick(self) -> None:
+        self._model.tick()
+        if self._detail is not None and self._detail.record is not None:
+            if self._detail.record.status == ExecutionStatus.RUNNING:
+                self._detail.update_elapsed()
+
+    def _select_source_row(self, row: int) -> None:
+        index = self._proxy.mapFromSource(self._model.index(row, 0))
+        if index.isValid():
+            self._table.setCurrentIndex(index)
+
+    def _on_current_changed(self, current: QModelIndex, _previous: QModelIndex) -> None:
+        if not current.isValid():
+            return
+        record = self._model.record(self._proxy.mapToSource(current).row())
+        if self._detail is None:
+            self._detail = TaskDetailPane(self.max_log_lines)
+            self._detail.stop_button.clicked.connect(self._stop_selected)
+            self._placeholder.hide()
+            self._detail_layout.addWidget(self._detail)
+        if self._detail.record is not record:
+            self._detail.show_record(record)
+
+    def _stop_selected(self) -> None:
+        if self._detail is not None and self._detail.record is not None:
+            self._stop_callback(self._detail.record.task)
+
+    def _update_counts(self) -> None:
+        total = self._model.rowCount()
+        parts = [f"{total} base(s)", f"{self._model.running_count()} en cours"]
+        failed = self._model.failed_count()
+        if failed:
+            parts.append(f"{failed} interrompue(s)")
+        self._counts_label.setText("  ·  ".join(parts))
 
 
 class RunTabsWidget(QTabWidget):
+    """Un onglet par lot ; une seule horloge met à jour les durées de toutes les tâches en cours."""
+
     stop_requested = Signal(DatabaseTask)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._lot_tabs: Dict[str, LotLogsTab] = {}
+        self._max_log_lines = DEFAULT_MAX_LOG_LINES
         self.setDocumentMode(True)
         self.setMovable(True)
+        self._clock = QTimer(self)
+        self._clock.setInterval(1000)
+        self._clock.timeout.connect(self._tick)
+
+    def set_max_log_lines(self, max_lines: int) -> None:
+        """Nombre de lignes conservées pour chaque tâche (les plus anciennes sont oubliées)."""
+        self._max_log_lines = max_lines
+        for tab in self._lot_tabs.values():
+            tab.set_max_log_lines(max_lines)
 
     def reset(self) -> None:
+        self._clock.stop()
         self._lot_tabs.clear()
         self.clear()
 
+    def lot_tab(self, lot_name: str) -> Optional[LotLogsTab]:
+        return self._lot_tabs.get(lot_name)
+
     def mark_lot_started(self, lot_name: str) -> None:
         tab = self._ensure_lot_tab(lot_name)
         index = self.indexOf(tab)
@@ -217,30 +711,52 @@ class RunTabsWidget(QTabWidget):
                 tooltip += f" : {reason}"
             self.setTabToolTip(index, tooltip)
 
-    def start_task(self, task: DatabaseTask, command: str) -> None:
+    def start_task(self, task: DatabaseTask, command: str, log_path: Optional[Path] = None) -> None:
         tab = self._ensure_lot_tab(task.lot.name)
-        tab.start_task(task, command)
-        index = self.indexOf(tab)
-        if index != -1:
-            self.setCurrentIndex(index)
+        tab.start_task(task, command, log_path)
+        if not self._clock.isActive():
+            self._clock.start()
 
-    def append_output(self, task: DatabaseTask, text: str, is_error: bool) -> None:
+    def append_output(self, task: DatabaseTask, lines: List[str], is_error: bool) -> None:
         tab = self._lot_tabs.get(task.lot.name)
         if tab:
-            tab.append_output(task, text, is_error)
+            tab.append_output(task, lines, is_error)
+
+    @timed
+    def append_parsed(self, parsed: ParsedOutput) -> None:
+        """Sortie analysée : lignes colorées selon leur niveau, avancement et compteurs."""
+        tab = self._lot_tabs.get(parsed.task.lot.name)
+        if tab:
+            tab.append_parsed(parsed)
+
+    def update_usage(self, usages: List[TaskUsage]) -> None:
+        for usage in usages:
+            tab = self._lot_tabs.get(usage.task.lot.name)
+            if tab:
+                tab.update_usage(usage)
 
     def finish_task(self, task: DatabaseTask, status: ExecutionStatus) -> None:
         tab = self._lot_tabs.get(task.lot.name)
         if tab:
             tab.finish_task(task, status)
 
+    def _tick(self) -> None:
+        running = False
+        for tab in self._lot_tabs.values():
+            # Un dernier passage après la fin des tâches : lignes modifiées depuis le tick précédent.
+            tab.tick()
+            running = running or tab.has_running_tasks()
+        if not running:
+            self._clock.stop()
+
     def _ensure_lot_tab(self, lot_name: str) -> LotLogsTab:
         tab = self._lot_tabs.get(lot_name)
         if tab:
             return tab
         tab = LotLogsTab(lot_name, self.stop_requested.emit)
+        tab.max_log_lines = self._max_log_lines
         self._lot_tabs[lot_name] = tab
         icon = self.style().standardIcon(QStyle.SP_FileDialogInfoView)
         self.addTab(tab, icon, lot_name)
-        self.setTabToolTip(self.indexOf(tab), f"Onglets de bases pour le lot {lot_name}")
+        self.setTabToolTip(self.indexOf(tab), f"Bases du lot {lot_name}")
         return tab